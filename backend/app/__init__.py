@@ -5,7 +5,7 @@ Creates and configures the Flask application instance.
 import os
 import logging
 from logging.handlers import RotatingFileHandler
-from flask import Flask
+from flask import Flask, Request, current_app
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
@@ -19,6 +19,14 @@ migrate = Migrate()
 jwt = JWTManager()
 
 
+class DriveRequest(Request):
+    """Request class whose multipart part limit comes from MAX_FORM_PARTS."""
+
+    @property
+    def max_form_parts(self):
+        return current_app.config['MAX_FORM_PARTS']
+
+
 def setup_logging(app):
     """
     Configure application logging.
@@ -80,10 +88,15 @@ def create_app(config_name=None):
         config_name = os.getenv('FLASK_ENV', 'development')
 
     app = Flask(__name__)
+    app.request_class = DriveRequest
 
     # Load configuration
     app.config.from_object(config.get(config_name, config['development']))
 
+    # JSON encoder used by jsonify
+    from app.utils.serializers import create_json_provider
+    app.json = create_json_provider(app)
+
     # Setup logging
     setup_logging(app)
 
@@ -110,7 +123,28 @@ def create_app(config_name=None):
     app.logger.info(f"CORS origins: {app.config['CORS_ORIGINS']}")
 
     # Import models so Flask-Migrate can detect all tables
-    from app.models import user, file, setting  # noqa: F401
+    from app.models import (  # noqa: F401
+        user, file, setting, job, change, search_term, content_posting)
+
+    # Publish change notifications once journal writes commit
+    from app.services.event_service import EventService
+    EventService.init_app(app)
+
+    # Folder-listing cache
+    from app.services.cache_service import CacheService
+    CacheService.init_app(app)
+
+    # Small-file content cache for downloads
+    from app.services.file_cache_service import FileCacheService
+    FileCacheService.init_app(app)
+
+    # Download offload settings
+    from app.controllers.file_controller import FileController
+    FileController.init_app(app)
+
+    # Response compression and MessagePack negotiation
+    from app.middleware import negotiation_middleware
+    negotiation_middleware.init_app(app)
 
     # Register blueprints
     from app.routes.auth_routes import auth_bp
@@ -122,9 +156,13 @@ def create_app(config_name=None):
     app.register_blueprint(admin_bp, url_prefix='/api/admin')
 
     # Register CLI commands
-    from app.cli import create_admin_command, cleanup_trash_command
+    from app.cli import (create_admin_command, cleanup_trash_command, compact_changes_command,
+                         reindex_search_command, reindex_content_command)
     app.cli.add_command(create_admin_command)
     app.cli.add_command(cleanup_trash_command)
+    app.cli.add_command(compact_changes_command)
+    app.cli.add_command(reindex_search_command)
+    app.cli.add_command(reindex_content_command)
 
     # Error handlers
     @app.errorhandler(404)
@@ -107,3 +107,53 @@ def cleanup_trash_command(days):
     except Exception as e:
         click.echo(click.style(f'Error: {str(e)}', fg='red', bold=True))
         raise SystemExit(1)
+
+
+@click.command('compact-changes')
+@click.option('--days', default=None, type=int,
+              help='Drop journal entries older than N days (default: CHANGE_RETENTION_DAYS)')
+@with_appcontext
+def compact_changes_command(days):
+    """Compact the change journal used by sync clients. Usage: flask compact-changes"""
+    from app.services.change_service import ChangeService
+
+    days = days if days is not None else current_app.config['CHANGE_RETENTION_DAYS']
+    click.echo(f'Compacting change journal entries older than {days} days...')
+    try:
+        count = ChangeService.compact(days=days)
+        click.echo(click.style(f'Done — {count} entry(ies) removed.', fg='green'))
+    except Exception as e:
+        click.echo(click.style(f'Error: {str(e)}', fg='red', bold=True))
+        raise SystemExit(1)
+
+
+@click.command('reindex-search')
+@click.option('--user', 'user_uuid', default=None, help='Only rebuild this user\'s index')
+@with_appcontext
+def reindex_search_command(user_uuid):
+    """Rebuild the filename search index. Usage: flask reindex-search"""
+    from app.services.search_service import SearchService
+
+    click.echo('Rebuilding filename search index...')
+    try:
+        count = SearchService.rebuild(user_uuid=user_uuid)
+        click.echo(click.style(f'Done — {count} item(s) indexed.', fg='green'))
+    except Exception as e:
+        click.echo(click.style(f'Error: {str(e)}', fg='red', bold=True))
+        raise SystemExit(1)
+
+
+@click.command('reindex-content')
+@click.option('--user', 'user_uuid', default=None, help='Only rebuild this user\'s index')
+@with_appcontext
+def reindex_content_command(user_uuid):
+    """Rebuild the full-text index of text documents. Usage: flask reindex-content"""
+    from app.services.content_index_service import ContentIndexService
+
+    click.echo('Rebuilding content index...')
+    try:
+        count = ContentIndexService.rebuild(user_uuid=user_uuid)
+        click.echo(click.style(f'Done — {count} document(s) indexed.', fg='green'))
+    except Exception as e:
+        click.echo(click.style(f'Error: {str(e)}', fg='red', bold=True))
+        raise SystemExit(1)
@@ -39,6 +39,12 @@ class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-change-this')
     DEBUG = os.getenv('FLASK_ENV') == 'development'
 
+    # Signed transfer URLs: HMAC key (defaults to SECRET_KEY; share it with a
+    # front proxy verifying the URLs), default and longest lifetime in seconds
+    TRANSFER_URL_SECRET = os.getenv('TRANSFER_URL_SECRET')
+    TRANSFER_URL_TTL = int(os.getenv('TRANSFER_URL_TTL', 300))
+    TRANSFER_URL_MAX_TTL = int(os.getenv('TRANSFER_URL_MAX_TTL', 86400))
+
     # File Upload Configuration
     MAX_FILE_SIZE = int(os.getenv('MAX_FILE_SIZE', 2684354560))  # 2.5GB
     MAX_CONTENT_LENGTH = MAX_FILE_SIZE  # Flask built-in request body limiter
@@ -47,6 +53,124 @@ class Config:
     ALLOWED_EXTENSIONS = set(os.getenv('ALLOWED_EXTENSIONS',
                                        'pdf,doc,docx,txt,png,jpg,jpeg,gif,zip,rar,mp4,mp3').split(','))
 
+    # Download offload: 'none' streams files from Python; 'x-accel-redirect'
+    # (nginx) or 'x-sendfile' (Apache mod_xsendfile, lighttpd) only
+    # authorizes the request and lets the front server send the bytes. For
+    # nginx, DOWNLOAD_OFFLOAD_PREFIX must be an internal location aliased to
+    # UPLOAD_FOLDER.
+    DOWNLOAD_OFFLOAD = os.getenv('DOWNLOAD_OFFLOAD', 'none')
+    DOWNLOAD_OFFLOAD_PREFIX = os.getenv('DOWNLOAD_OFFLOAD_PREFIX', '/protected-files')
+
+    # Read size when streaming downloads from Python without a server
+    # wsgi.file_wrapper
+    DOWNLOAD_BLOCK_SIZE = int(os.getenv('DOWNLOAD_BLOCK_SIZE', 1048576))  # 1MB
+
+    # Page-cache hygiene: uploads, downloads and ZIP sources of at least
+    # IO_DROP_CACHE_THRESHOLD bytes are dropped from the page cache once
+    # streamed (0 disables it); uploads are preallocated with fallocate
+    IO_DROP_CACHE_THRESHOLD = int(os.getenv('IO_DROP_CACHE_THRESHOLD', 67108864))  # 64MB
+    IO_PREALLOCATE = os.getenv('IO_PREALLOCATE', 'true').lower() == 'true'
+
+    # Stored ZIP downloads checksum files uploaded before CRC-32s were
+    # recorded inline up to this many bytes, and in a background job above
+    STORED_ZIP_INLINE_CRC_SIZE = int(os.getenv('STORED_ZIP_INLINE_CRC_SIZE', 134217728))  # 128MB
+
+    # Generated ZIP archives are cached under UPLOAD_FOLDER/.zip-cache, least
+    # recently used evicted beyond ZIP_CACHE_MAX_BYTES; selections larger
+    # than ZIP_CACHE_MAX_ARCHIVE_SIZE are streamed without being cached.
+    # Archives stay at least ZIP_CACHE_GRACE_SECONDS after their last use,
+    # as offloaded responses may still be reading them.
+    ZIP_CACHE_MAX_BYTES = int(os.getenv('ZIP_CACHE_MAX_BYTES', 10737418240))  # 10GB
+    ZIP_CACHE_MAX_ARCHIVE_SIZE = int(os.getenv('ZIP_CACHE_MAX_ARCHIVE_SIZE', 2147483648))  # 2GB
+    ZIP_CACHE_GRACE_SECONDS = int(os.getenv('ZIP_CACHE_GRACE_SECONDS', 3600))
+
+    # Contents of files up to FILE_CACHE_MAX_FILE_SIZE are kept in memory
+    # for downloads: 'memory://' (per-process LRU of FILE_CACHE_MAX_BYTES),
+    # 'none://', or 'shm://[directory]' shared by the workers of the host
+    FILE_CACHE_URL = os.getenv('FILE_CACHE_URL', 'memory://')
+    FILE_CACHE_MAX_BYTES = int(os.getenv('FILE_CACHE_MAX_BYTES', 67108864))  # 64MB
+    FILE_CACHE_MAX_FILE_SIZE = int(os.getenv('FILE_CACHE_MAX_FILE_SIZE', 262144))  # 256KB
+
+    # Compressed downloads: files of these MIME types ('type/*' matches a
+    # family) between the two sizes go to clients accepting it as a gzip or
+    # br variant, compressed on first download and kept under
+    # UPLOAD_FOLDER/.variants
+    DOWNLOAD_COMPRESSION_MIMETYPES = os.getenv(
+        'DOWNLOAD_COMPRESSION_MIMETYPES',
+        'text/*,application/json,application/xml,application/x-ndjson,image/svg+xml'
+    )
+    DOWNLOAD_COMPRESSION_MIN_SIZE = int(os.getenv('DOWNLOAD_COMPRESSION_MIN_SIZE', 1024))
+    DOWNLOAD_COMPRESSION_MAX_SIZE = int(os.getenv('DOWNLOAD_COMPRESSION_MAX_SIZE', 67108864))  # 64MB
+
+    # Multipart parts accepted per request (werkzeug defaults to 1000),
+    # raised so folder-tree uploads can carry thousands of files
+    MAX_FORM_PARTS = int(os.getenv('MAX_FORM_PARTS', 50000))
+
+    # Threads used to write the files of a multi-file upload
+    UPLOAD_WORKERS = int(os.getenv('UPLOAD_WORKERS', 4))
+
+    # Maximum number of items accepted by the batch endpoint
+    BATCH_MAX_OPERATIONS = int(os.getenv('BATCH_MAX_OPERATIONS', 1000))
+
+    # Background jobs (0 runs jobs inline, inside the request). Jobs run in
+    # the worker's own thread pool, so a queued or running job not updated
+    # for JOB_STALE_SECONDS is taken to have died with its worker.
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', 2))
+    JOB_STALE_SECONDS = int(os.getenv('JOB_STALE_SECONDS', 1800))
+
+    # Archive extraction limits (decompression-bomb protection)
+    ARCHIVE_MAX_MEMBERS = int(os.getenv('ARCHIVE_MAX_MEMBERS', 20000))
+    ARCHIVE_MAX_TOTAL_SIZE = int(os.getenv('ARCHIVE_MAX_TOTAL_SIZE', 10737418240))  # 10GB
+    ARCHIVE_MAX_RATIO = int(os.getenv('ARCHIVE_MAX_RATIO', 100))
+
+    # Change journal: entries kept for delta sync and page size limit
+    CHANGE_RETENTION_DAYS = int(os.getenv('CHANGE_RETENTION_DAYS', 30))
+    CHANGES_MAX_PAGE_SIZE = int(os.getenv('CHANGES_MAX_PAGE_SIZE', 1000))
+
+    # Most UUIDs resolved by one POST /api/files/lookup
+    LOOKUP_MAX_IDS = int(os.getenv('LOOKUP_MAX_IDS', 500))
+
+    # Change notifications (SSE): 'memory://' for a single worker, or a
+    # redis://, rediss:// or unix:// URL shared by every worker
+    EVENT_BUS_URL = os.getenv('EVENT_BUS_URL', 'memory://')
+    # An open stream holds a worker for up to EVENTS_STREAM_TIMEOUT seconds,
+    # which only scales with async or threaded workers (gunicorn -k gevent,
+    # -k gthread). With the default sync workers keep it at 0: each request
+    # sends the pending changes and ends, and the EventSource reconnects
+    # (polls) every EVENTS_POLL_SECONDS.
+    EVENTS_HEARTBEAT_SECONDS = int(os.getenv('EVENTS_HEARTBEAT_SECONDS', 15))
+    EVENTS_STREAM_TIMEOUT = int(os.getenv('EVENTS_STREAM_TIMEOUT', 0))
+    EVENTS_POLL_SECONDS = int(os.getenv('EVENTS_POLL_SECONDS', 10))
+
+    # Folder-listing cache: 'memory://' (per-process LRU of
+    # LISTING_CACHE_SIZE pages), 'none://', or a shared redis:// URL
+    LISTING_CACHE_URL = os.getenv('LISTING_CACHE_URL', 'memory://')
+    LISTING_CACHE_SIZE = int(os.getenv('LISTING_CACHE_SIZE', 2048))
+    LISTING_CACHE_TTL = int(os.getenv('LISTING_CACHE_TTL', 3600))
+
+    # JSON encoder of API responses: 'auto' (orjson when installed),
+    # 'orjson' or 'json' (standard library)
+    JSON_SERIALIZER = os.getenv('JSON_SERIALIZER', 'auto')
+
+    # Response compression (br when the brotli package is installed, else
+    # gzip) for these MIME types; buffered bodies below the minimum size are
+    # sent as is. Event streams are left out so proxies never buffer them.
+    COMPRESSION_MIMETYPES = os.getenv(
+        'COMPRESSION_MIMETYPES',
+        'application/json,application/x-ndjson,application/msgpack,text/plain,text/csv'
+    )
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+    GZIP_LEVEL = int(os.getenv('GZIP_LEVEL', 6))
+    BROTLI_QUALITY = int(os.getenv('BROTLI_QUALITY', 4))
+
+    # Serve application/msgpack to clients preferring it (needs msgpack)
+    MSGPACK_ENABLED = os.getenv('MSGPACK_ENABLED', 'true').lower() == 'true'
+
+    # Full-text indexing of text documents (0 workers indexes inline)
+    CONTENT_INDEX_WORKERS = int(os.getenv('CONTENT_INDEX_WORKERS', 1))
+    CONTENT_INDEX_MAX_SIZE = int(os.getenv('CONTENT_INDEX_MAX_SIZE', 10485760))  # 10MB
+    CONTENT_INDEX_MAX_TOKENS = int(os.getenv('CONTENT_INDEX_MAX_TOKENS', 20000))
+
     # Storage Configuration
     DEFAULT_STORAGE_QUOTA = int(os.getenv('DEFAULT_STORAGE_QUOTA', 5368709120))  # 5GB
 
@@ -5,6 +5,8 @@ Handles HTTP requests for administration operations.
 from flask import request, jsonify
 from app.middleware.auth_middleware import admin_required
 from app.services.admin_service import AdminService
+from app.services.cache_service import CacheService
+from app.services.file_cache_service import FileCacheService
 
 
 class AdminController:
@@ -74,3 +76,23 @@ class AdminController:
             return jsonify(response_data), status_code
         except Exception as e:
             return jsonify({'error': 'Failed to toggle user status', 'details': str(e)}), 500
+
+    @staticmethod
+    @admin_required
+    def get_cache_stats(admin):
+        """
+        Get folder-listing and file cache metrics (hits, misses, hit rate,
+        evictions).
+
+        Requires: JWT token with ADMIN role
+
+        Returns:
+            JSON response with cache statistics
+        """
+        try:
+            success, response_data, status_code = CacheService.get_stats()
+            if success:
+                response_data['file_cache'] = FileCacheService.get_stats()
+            return jsonify(response_data), status_code
+        except Exception as e:
+            return jsonify({'error': 'Failed to get cache statistics', 'details': str(e)}), 500
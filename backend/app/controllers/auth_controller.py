@@ -5,6 +5,8 @@ Handles HTTP requests for authentication operations.
 from flask import request, jsonify
 from app.services.auth_service import AuthService
 from app.middleware.auth_middleware import jwt_required_custom
+from app.models.user import PROFILE_FIELDS
+from app.utils.validators import parse_fields
 
 
 class AuthController:
@@ -92,12 +94,19 @@ class AuthController:
         Get current user profile.
 
         Requires: JWT token in Authorization header
+        Query parameters:
+            - fields: (optional) Comma-separated profile fields
 
         Returns:
             JSON response with user data
         """
         try:
-            success, response_data, status_code = AuthService.get_user_profile(user.uuid)
+            fields, error = parse_fields(request.args.get('fields'), PROFILE_FIELDS)
+            if error:
+                return jsonify({'error': error}), 400
+
+            success, response_data, status_code = AuthService.get_user_profile(
+                user.uuid, fields=fields)
             return jsonify(response_data), status_code
 
         except Exception as e:
@@ -3,17 +3,42 @@ File controller module.
 Handles HTTP requests for file operations.
 """
 import os
-from flask import request, jsonify, send_file, current_app
+import json
+import time
+from flask import request, jsonify, send_file, current_app, Response, stream_with_context
 from datetime import datetime
-from werkzeug.utils import safe_join
-from app.services.file_service import FileService
-from app.services.storage_service import StorageService
+from urllib.parse import quote
+from werkzeug.utils import safe_join, send_file as werkzeug_send_file
+from app.services.file_service import FileService, LISTING_FIELDS, FILE_INFO_FIELDS
+from app.services.storage_service import StorageService, VARIANT_ENCODINGS
+from app.services.job_service import JobService
+from app.services.change_service import ChangeService
+from app.services.event_service import EventService
+from app.services.cache_service import CacheService
+from app.services.search_service import SearchService
+from app.services.content_index_service import ContentIndexService
+from app.services.transfer_service import TransferService
+from app.services.file_cache_service import FileCacheService
 from app.middleware.auth_middleware import jwt_required_custom
+from app.utils.validators import parse_fields
+from app.utils.file_stream import send_cached_file, send_stored_file
+
+
+# Accepted values of DOWNLOAD_OFFLOAD
+DOWNLOAD_OFFLOAD_MODES = ('none', 'x-accel-redirect', 'x-sendfile')
 
 
 class FileController:
     """Controller for file management endpoints."""
 
+    @staticmethod
+    def init_app(app):
+        """Check the download settings, so a misconfiguration fails at startup."""
+        mode = app.config['DOWNLOAD_OFFLOAD']
+        if mode not in DOWNLOAD_OFFLOAD_MODES:
+            raise ValueError(f"Unsupported DOWNLOAD_OFFLOAD: {mode} "
+                             f"(expected one of: {', '.join(DOWNLOAD_OFFLOAD_MODES)})")
+
     @staticmethod
     @jwt_required_custom
     def upload_file(user):
@@ -54,6 +79,87 @@ class FileController:
             current_app.logger.error(f"Upload endpoint error: {str(e)}")
             return jsonify({'error': 'Upload failed', 'details': str(e)}), 500
 
+    @staticmethod
+    @jwt_required_custom
+    def upload_files(user):
+        """
+        Handle a multi-file upload request.
+
+        Requires: JWT token in Authorization header
+        Expected form data:
+            - file: File object (repeated once per file)
+            - parent_folder_id: (optional) Parent folder UUID
+
+        Returns:
+            JSON response with one result per file
+        """
+        try:
+            files = [file for file in request.files.getlist('file') if file.filename]
+
+            if not files:
+                return jsonify({'error': 'No file provided'}), 400
+
+            success, response_data, status_code = FileService.upload_files(
+                user=user,
+                file_objects=files,
+                parent_folder_uuid=request.form.get('parent_folder_id')
+            )
+
+            return jsonify(response_data), status_code
+
+        except Exception as e:
+            current_app.logger.error(f"Multi-file upload endpoint error: {str(e)}")
+            return jsonify({'error': 'Upload failed', 'details': str(e)}), 500
+
+    @staticmethod
+    @jwt_required_custom
+    def upload_tree(user):
+        """
+        Upload a folder tree in a single request.
+
+        Requires: JWT token in Authorization header
+        Expected form data:
+            - file: File object (repeated once per file)
+            - paths: (optional) Relative path of each file, in the same order
+              as the file parts (defaults to each part's filename)
+            - manifest: (optional) JSON object
+              {"files": ["a/b/c.txt", ...], "folders": ["a/empty", ...]}
+              used instead of "paths"
+            - parent_folder_id: (optional) Parent folder UUID
+
+        Returns:
+            JSON response with one result per file
+        """
+        try:
+            files = request.files.getlist('file')
+            relative_paths = request.form.getlist('paths') or [file.filename for file in files]
+            folder_paths = []
+
+            if request.form.get('manifest'):
+                try:
+                    manifest = json.loads(request.form['manifest'])
+                    relative_paths = manifest.get('files', relative_paths)
+                    folder_paths = manifest.get('folders', [])
+                except (ValueError, AttributeError):
+                    return jsonify({'error': 'Invalid manifest'}), 400
+
+                if not isinstance(relative_paths, list) or not isinstance(folder_paths, list):
+                    return jsonify({'error': 'Invalid manifest'}), 400
+
+            success, response_data, status_code = FileService.upload_tree(
+                user=user,
+                file_objects=files,
+                relative_paths=relative_paths,
+                folder_paths=folder_paths,
+                parent_folder_uuid=request.form.get('parent_folder_id')
+            )
+
+            return jsonify(response_data), status_code
+
+        except Exception as e:
+            current_app.logger.error(f"Tree upload endpoint error: {str(e)}")
+            return jsonify({'error': 'Upload failed', 'details': str(e)}), 500
+
     @staticmethod
     @jwt_required_custom
     def get_files(user):
@@ -65,14 +171,33 @@ class FileController:
             - folder_id: (optional) Parent folder UUID
             - page: (optional) Page number (default: 1)
             - per_page: (optional) Items per page (default: 50)
+            - sort: (optional) name, size, updated_at or type (default: name)
+            - order: (optional) asc or desc (default: asc)
+            - type: (optional) File family, e.g. image, video, document
+            - min_size / max_size: (optional) Size range in bytes
+            - modified_after / modified_before: (optional) ISO 8601 dates
+            - fields: (optional) Comma-separated fields of each entry
 
         Returns:
             JSON response with files list and pagination
         """
         try:
+            fields, error = parse_fields(request.args.get('fields'), LISTING_FIELDS)
+            if error:
+                return jsonify({'error': error}), 400
+
             folder_uuid = request.args.get('folder_id')
             page = request.args.get('page', 1, type=int)
             per_page = request.args.get('per_page', 50, type=int)
+            filters = {
+                'sort': request.args.get('sort', 'name'),
+                'order': request.args.get('order', 'asc'),
+                'mime_family': request.args.get('type'),
+                'min_size': request.args.get('min_size', type=int),
+                'max_size': request.args.get('max_size', type=int),
+                'modified_after': request.args.get('modified_after'),
+                'modified_before': request.args.get('modified_before')
+            }
 
             # Validate pagination
             if page < 1:
@@ -80,19 +205,239 @@ class FileController:
             if per_page < 1 or per_page > 100:
                 per_page = 50
 
-            success, response_data, status_code = FileService.get_files(
+            # Nothing changed since the client's copy: skip the listing queries
+            etag = FileService.listing_etag(user, folder_uuid, page, per_page,
+                                            *filters.values(), sorted(fields or ()))
+            if request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=304)
+                response.set_etag(etag, weak=True)
+                return response
+
+            cache_key = CacheService.listing_key(user, etag)
+            body = CacheService.get(cache_key)
+            if body is not None:
+                response = current_app.response_class(body, mimetype='application/json')
+                status_code = 200
+            else:
+                success, response_data, status_code = FileService.get_files(
+                    user=user,
+                    parent_folder_uuid=folder_uuid,
+                    page=page,
+                    per_page=per_page,
+                    fields=fields,
+                    **filters
+                )
+
+                response = jsonify(response_data)
+                if not success:
+                    return response, status_code
+                CacheService.set(cache_key, response.get_data())
+
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response, status_code
+
+        except Exception as e:
+            current_app.logger.error(f"Get files endpoint error: {str(e)}")
+            return jsonify({'error': 'Failed to retrieve files', 'details': str(e)}), 500
+
+    @staticmethod
+    @jwt_required_custom
+    def get_changes(user):
+        """
+        Get the journal of changes made after a sync cursor.
+
+        Requires: JWT token in Authorization header
+        Query parameters:
+            - cursor: (optional) Last sequence number seen; omit to get the
+              current cursor only
+            - limit: (optional) Maximum number of changes (default: 500)
+
+        Returns:
+            JSON response with changes, next cursor and has_more flag
+            (410 with resync_required when the cursor has expired)
+        """
+        try:
+            cursor = request.args.get('cursor')
+            if cursor is not None:
+                try:
+                    cursor = int(cursor)
+                except ValueError:
+                    return jsonify({'error': 'Invalid cursor'}), 400
+
+            max_limit = current_app.config['CHANGES_MAX_PAGE_SIZE']
+            limit = request.args.get('limit', 500, type=int)
+            if limit < 1 or limit > max_limit:
+                limit = min(500, max_limit)
+
+            success, response_data, status_code = ChangeService.get_changes(
                 user=user,
-                parent_folder_uuid=folder_uuid,
-                page=page,
-                per_page=per_page
+                cursor=cursor,
+                limit=limit
             )
 
             return jsonify(response_data), status_code
 
         except Exception as e:
-            current_app.logger.error(f"Get files endpoint error: {str(e)}")
+            current_app.logger.error(f"Get changes endpoint error: {str(e)}")
+            return jsonify({'error': 'Failed to retrieve changes', 'details': str(e)}), 500
+
+    @staticmethod
+    @jwt_required_custom
+    def search_files(user):
+        """
+        Search files and folders by name, or text documents by content.
+
+        Requires: JWT token in Authorization header
+        Query parameters:
+            - q: Text to look for in names (case-insensitive)
+            - content: Words to look for inside text documents (instead of q)
+            - limit: (optional) Results per page (default: 50, max: 100)
+            - cursor: (optional) next_cursor of the previous page
+
+        Returns:
+            JSON response with ranked files and next_cursor; content results
+            also carry a score and a snippet
+        """
+        try:
+            limit = request.args.get('limit', 50, type=int)
+            if limit < 1 or limit > 100:
+                limit = 50
+
+            if 'content' in request.args:
+                if 'q' in request.args:
+                    return jsonify({'error': 'Use either q or content'}), 400
+                search = ContentIndexService.search
+                query = request.args.get('content', '')
+            else:
+                search = SearchService.search
+                query = request.args.get('q', '')
+
+            success, response_data, status_code = search(
+                user=user,
+                query=query,
+                limit=limit,
+                cursor=request.args.get('cursor')
+            )
+
+            return jsonify(response_data), status_code
+
+        except Exception as e:
+            current_app.logger.error(f"Search endpoint error: {str(e)}")
+            return jsonify({'error': 'Search failed', 'details': str(e)}), 500
+
+    @staticmethod
+    @jwt_required_custom
+    def get_recent_files(user):
+        """
+        Get the most recently modified files of the whole drive.
+
+        Requires: JWT token in Authorization header
+        Query parameters:
+            - limit: (optional) Results per page (default: 50, max: 100)
+            - cursor: (optional) next_cursor of the previous page
+
+        Returns:
+            JSON response with files and next_cursor
+        """
+        return FileController._drive_view(user, FileService.get_recent_files)
+
+    @staticmethod
+    @jwt_required_custom
+    def get_largest_files(user):
+        """
+        Get the largest files of the whole drive.
+
+        Requires: JWT token in Authorization header
+        Query parameters:
+            - limit: (optional) Results per page (default: 50, max: 100)
+            - cursor: (optional) next_cursor of the previous page
+
+        Returns:
+            JSON response with files and next_cursor
+        """
+        return FileController._drive_view(user, FileService.get_largest_files)
+
+    @staticmethod
+    def _drive_view(user, view):
+        """Run a drive-wide view with the request's paging parameters."""
+        try:
+            limit = request.args.get('limit', 50, type=int)
+            if limit < 1 or limit > 100:
+                limit = 50
+
+            success, response_data, status_code = view(
+                user=user,
+                limit=limit,
+                cursor=request.args.get('cursor')
+            )
+
+            return jsonify(response_data), status_code
+
+        except Exception as e:
+            current_app.logger.error(f"Drive view endpoint error: {str(e)}")
             return jsonify({'error': 'Failed to retrieve files', 'details': str(e)}), 500
 
+    @staticmethod
+    @jwt_required_custom
+    def get_events(user):
+        """
+        Push drive changes as Server-Sent Events.
+
+        Requires: JWT token in Authorization header
+        Headers / query parameters:
+            - Last-Event-ID or cursor: (optional) Resume after this sequence
+              number; without it only changes made from now on are sent
+
+        Returns:
+            text/event-stream of ``change`` and ``resync`` events
+        """
+        try:
+            cursor = request.headers.get('Last-Event-ID') or request.args.get('cursor')
+            if cursor is not None:
+                try:
+                    cursor = int(cursor)
+                except ValueError:
+                    return jsonify({'error': 'Invalid cursor'}), 400
+                if cursor < 0:
+                    return jsonify({'error': 'Invalid cursor'}), 400
+
+            response = Response(
+                stream_with_context(EventService.stream(user.uuid, cursor)),
+                mimetype='text/event-stream'
+            )
+            response.headers['Cache-Control'] = 'no-cache'
+            # Keep nginx from buffering the stream
+            response.headers['X-Accel-Buffering'] = 'no'
+            return response
+
+        except Exception as e:
+            current_app.logger.error(f"Events endpoint error: {str(e)}")
+            return jsonify({'error': 'Failed to open event stream', 'details': str(e)}), 500
+
+    @staticmethod
+    @jwt_required_custom
+    def get_manifest(user):
+        """
+        Stream the whole drive for client bootstrap.
+
+        Requires: JWT token in Authorization header
+
+        Returns:
+            NDJSON stream: a {"cursor": N} line for GET /api/files/changes,
+            then one {"id", "parent_id", "name", "size", "mtime", "is_folder"}
+            line per live file or folder
+        """
+        try:
+            return Response(
+                stream_with_context(FileService.iter_manifest(user)),
+                mimetype='application/x-ndjson'
+            )
+
+        except Exception as e:
+            current_app.logger.error(f"Manifest endpoint error: {str(e)}")
+            return jsonify({'error': 'Failed to build manifest', 'details': str(e)}), 500
+
     @staticmethod
     @jwt_required_custom
     def download_file(user, file_uuid):
@@ -123,21 +468,189 @@ class FileController:
             full_path = StorageService.get_full_path(user.uuid, file_obj.file_path)
 
             # Check if file exists
-            if not os.path.exists(full_path):
+            try:
+                stat = os.stat(full_path)
+            except FileNotFoundError:
                 return jsonify({'error': 'File not found on storage'}), 404
 
             # Send file
-            return send_file(
+            return FileController._send_stored_file(
                 full_path,
-                as_attachment=True,
                 download_name=file_obj.file_name,
-                mimetype=file_obj.mime_type
+                mimetype=file_obj.mime_type,
+                stat=stat
             )
 
         except Exception as e:
             current_app.logger.error(f"Download endpoint error: {str(e)}")
             return jsonify({'error': 'Download failed', 'details': str(e)}), 500
 
+    @staticmethod
+    def _is_compressible(mimetype, stat):
+        """Whether a download may be sent as a compressed variant."""
+        config = current_app.config
+        if stat is None or not mimetype:
+            return False
+        if not (config['DOWNLOAD_COMPRESSION_MIN_SIZE'] <= stat.st_size
+                <= config['DOWNLOAD_COMPRESSION_MAX_SIZE']):
+            return False
+        for pattern in config['DOWNLOAD_COMPRESSION_MIMETYPES'].split(','):
+            pattern = pattern.strip()
+            if pattern == mimetype or (pattern.endswith('/*') and mimetype.startswith(pattern[:-1])):
+                return True
+        return False
+
+    @staticmethod
+    def _send_local_file(full_path, stat, download_name, mimetype, as_attachment):
+        """Send a file from the file cache, or stream it from disk."""
+        content = FileCacheService.read(full_path, stat) if stat is not None else None
+        if content is not None:
+            return send_cached_file(
+                full_path, content, stat, request.environ, current_app.response_class,
+                mimetype=mimetype, as_attachment=as_attachment, download_name=download_name,
+                max_age=current_app.get_send_file_max_age
+            )
+        return send_stored_file(
+            full_path, request.environ, current_app.config['DOWNLOAD_BLOCK_SIZE'],
+            current_app.response_class,
+            drop_cache_threshold=current_app.config['IO_DROP_CACHE_THRESHOLD'],
+            mimetype=mimetype, as_attachment=as_attachment, download_name=download_name,
+            max_age=current_app.get_send_file_max_age
+        )
+
+    @staticmethod
+    @jwt_required_custom
+    def create_transfer_url(user, file_uuid):
+        """
+        Issue a signed, short-lived download URL.
+
+        Requires: JWT token in Authorization header
+        Expected JSON body (optional):
+            {
+                "disposition": "attachment" or "inline",
+                "expires_in": seconds
+            }
+
+        Returns:
+            JSON response with the url and its expires_at Unix time
+        """
+        try:
+            data = request.get_json(silent=True) or {}
+            expires_in = data.get('expires_in')
+            if expires_in is not None and not isinstance(expires_in, int):
+                return jsonify({'error': 'expires_in must be an integer'}), 400
+
+            success, response_data, status_code = TransferService.create_download_url(
+                user=user,
+                file_uuid=file_uuid,
+                disposition=data.get('disposition', 'attachment'),
+                expires_in=expires_in
+            )
+
+            return jsonify(response_data), status_code
+
+        except Exception as e:
+            current_app.logger.error(f"Transfer URL endpoint error: {str(e)}")
+            return jsonify({'error': 'Failed to create transfer URL', 'details': str(e)}), 500
+
+    @staticmethod
+    def download_signed(file_uuid):
+        """
+        Download a file through a signed URL.
+
+        No Authorization header: the signature alone grants access and the
+        file is served without a database query. Range requests are supported.
+
+        Returns:
+            File stream with appropriate headers
+        """
+        try:
+            success, data, status_code = TransferService.verify_download(file_uuid, request.args)
+            if not success:
+                return jsonify(data), status_code
+
+            response = FileController._send_stored_file(
+                data['full_path'],
+                download_name=data['file_name'],
+                mimetype=data['mime_type'],
+                as_attachment=data['as_attachment']
+            )
+            max_age = max(0, data['expires_at'] - int(time.time()))
+            response.headers['Cache-Control'] = f'private, max-age={max_age}'
+            return response
+
+        except Exception as e:
+            current_app.logger.error(f"Signed download endpoint error: {str(e)}")
+            return jsonify({'error': 'Download failed', 'details': str(e)}), 500
+
+    @staticmethod
+    def _send_stored_file(full_path, download_name, mimetype, as_attachment=True, stat=None):
+        """
+        Send a file stored below UPLOAD_FOLDER.
+
+        By default the body is streamed by send_stored_file (zero-copy when
+        the WSGI server offers it). With DOWNLOAD_OFFLOAD set, the response
+        carries no body: an X-Accel-Redirect or X-Sendfile header tells the
+        front server which file to send (handling Range and conditional
+        requests itself), while the filename and MIME type headers are set
+        here as usual. When ``stat`` is given, small files are served from
+        the file cache, and compressible ones as a gzip or br variant to
+        clients accepting it (see StorageService.get_compressed_variant).
+
+        Args:
+            full_path (str): Absolute path of the file
+            download_name (str): File name presented to the client
+            mimetype (str): MIME type of the file
+            as_attachment (bool): Attachment rather than inline disposition
+            stat (os.stat_result, optional): Stat of the file, enabling the
+                file cache and compressed variants
+
+        Returns:
+            Response: File response
+        """
+        mode = current_app.config['DOWNLOAD_OFFLOAD']
+        if mode == 'none':
+            if not FileController._is_compressible(mimetype, stat):
+                return FileController._send_local_file(
+                    full_path, stat, download_name, mimetype, as_attachment)
+
+            # Ranges address the identity encoding: never serve them compressed
+            encoding = None
+            if 'Range' not in request.headers:
+                encoding = request.accept_encodings.best_match(VARIANT_ENCODINGS)
+            variant_path = None
+            if encoding:
+                variant_path, variant_stat = StorageService.get_compressed_variant(
+                    full_path, stat, encoding)
+            if variant_path and variant_stat.st_size < stat.st_size:
+                response = FileController._send_local_file(
+                    variant_path, variant_stat, download_name, mimetype, as_attachment)
+                if response.status_code == 200:
+                    response.headers['Content-Encoding'] = encoding
+                    response.headers['Accept-Ranges'] = 'none'
+            else:
+                response = FileController._send_local_file(
+                    full_path, stat, download_name, mimetype, as_attachment)
+            response.vary.add('Accept-Encoding')
+            return response
+
+        response = werkzeug_send_file(
+            full_path, request.environ, mimetype=mimetype, as_attachment=as_attachment,
+            download_name=download_name, conditional=False, etag=False,
+            use_x_sendfile=True, response_class=current_app.response_class
+        )
+        response.headers.pop('Content-Length', None)
+        if mode == 'x-accel-redirect':
+            relative_path = os.path.relpath(response.headers.pop('X-Sendfile'),
+                                            current_app.config['UPLOAD_FOLDER'])
+            response.headers['X-Accel-Redirect'] = (
+                current_app.config['DOWNLOAD_OFFLOAD_PREFIX'].rstrip('/') + '/'
+                + quote(relative_path.replace(os.sep, '/'))
+            )
+        elif mode != 'x-sendfile':
+            raise ValueError(f'Unsupported DOWNLOAD_OFFLOAD: {mode}')
+        return response
+
     @staticmethod
     @jwt_required_custom
     def delete_file(user, file_uuid):
@@ -243,6 +756,233 @@ class FileController:
             current_app.logger.error(f"Rename endpoint error: {str(e)}")
             return jsonify({'error': 'Rename failed', 'details': str(e)}), 500
 
+    @staticmethod
+    @jwt_required_custom
+    def move_files(user):
+        """
+        Move files and folders into another folder.
+
+        Requires: JWT token in Authorization header
+        Expected JSON body:
+            {
+                "file_ids": ["uuid1", "uuid2", ...],
+                "target_folder_id": (optional) "uuid-string"
+            }
+
+        Returns:
+            JSON response with moved items and per-item failures
+        """
+        try:
+            file_uuids, target_folder_uuid, error = FileController._get_transfer_args()
+            if error:
+                return jsonify(error), 400
+
+            success, response_data, status_code = FileService.move_files(
+                user=user,
+                file_uuids=file_uuids,
+                target_folder_uuid=target_folder_uuid
+            )
+
+            return jsonify(response_data), status_code
+
+        except Exception as e:
+            current_app.logger.error(f"Move endpoint error: {str(e)}")
+            return jsonify({'error': 'Move failed', 'details': str(e)}), 500
+
+    @staticmethod
+    @jwt_required_custom
+    def copy_files(user):
+        """
+        Copy files and folders into another folder.
+
+        Requires: JWT token in Authorization header
+        Expected JSON body:
+            {
+                "file_ids": ["uuid1", "uuid2", ...],
+                "target_folder_id": (optional) "uuid-string"
+            }
+
+        Returns:
+            JSON response with the new top-level items and per-item failures
+        """
+        try:
+            file_uuids, target_folder_uuid, error = FileController._get_transfer_args()
+            if error:
+                return jsonify(error), 400
+
+            success, response_data, status_code = FileService.copy_files(
+                user=user,
+                file_uuids=file_uuids,
+                target_folder_uuid=target_folder_uuid
+            )
+
+            return jsonify(response_data), status_code
+
+        except Exception as e:
+            current_app.logger.error(f"Copy endpoint error: {str(e)}")
+            return jsonify({'error': 'Copy failed', 'details': str(e)}), 500
+
+    @staticmethod
+    @jwt_required_custom
+    def batch_operations(user):
+        """
+        Apply many file operations in a single transaction.
+
+        Requires: JWT token in Authorization header
+        Expected JSON body:
+            {
+                "operations": [
+                    {"op": "delete", "id": "uuid1"},
+                    {"op": "restore", "id": "uuid2"},
+                    {"op": "rename", "id": "uuid3", "new_name": "b.txt"},
+                    {"op": "permanent_delete", "id": "uuid4"}
+                ]
+            }
+
+        Returns:
+            JSON response with one result per operation
+        """
+        try:
+            data = request.get_json(silent=True)
+
+            if not data or not isinstance(data.get('operations'), list):
+                return jsonify({'error': 'operations must be a list'}), 400
+
+            success, response_data, status_code = FileService.batch_operations(
+                user=user,
+                operations=data['operations']
+            )
+
+            return jsonify(response_data), status_code
+
+        except Exception as e:
+            current_app.logger.error(f"Batch endpoint error: {str(e)}")
+            return jsonify({'error': 'Batch failed', 'details': str(e)}), 500
+
+    @staticmethod
+    @jwt_required_custom
+    def lookup_files(user):
+        """
+        Get the metadata of several files and folders at once.
+
+        Requires: JWT token in Authorization header
+        Expected JSON body:
+            {
+                "file_ids": ["uuid1", "uuid2", ...],
+                "breadcrumbs": (optional) true to add each item's breadcrumb,
+                "fields": (optional) ["id", "file_name", ...]
+            }
+
+        Returns:
+            JSON response with files (in request order) and missing UUIDs
+        """
+        try:
+            data = request.get_json(silent=True) or {}
+            file_uuids = data.get('file_ids')
+
+            if not isinstance(file_uuids, list) or len(file_uuids) == 0:
+                return jsonify({'error': 'file_ids must be a non-empty list'}), 400
+            if not all(isinstance(file_uuid, str) for file_uuid in file_uuids):
+                return jsonify({'error': 'file_ids must contain UUID strings'}), 400
+
+            max_ids = current_app.config['LOOKUP_MAX_IDS']
+            if len(file_uuids) > max_ids:
+                return jsonify({'error': f'At most {max_ids} file IDs per lookup'}), 400
+
+            fields = data.get('fields')
+            if fields is not None:
+                if not isinstance(fields, list):
+                    return jsonify({'error': 'fields must be a list'}), 400
+                fields, error = parse_fields(','.join(map(str, fields)), LISTING_FIELDS)
+                if error:
+                    return jsonify({'error': error}), 400
+
+            success, response_data, status_code = FileService.lookup_files(
+                user=user,
+                file_uuids=file_uuids,
+                fields=fields,
+                include_breadcrumbs=bool(data.get('breadcrumbs'))
+            )
+
+            return jsonify(response_data), status_code
+
+        except Exception as e:
+            current_app.logger.error(f"Lookup endpoint error: {str(e)}")
+            return jsonify({'error': 'Lookup failed', 'details': str(e)}), 500
+
+    @staticmethod
+    def _get_transfer_args():
+        """
+        Parse the JSON body shared by the move and copy endpoints.
+
+        Returns:
+            tuple: (file_uuids: list, target_folder_uuid: str|None, error: dict|None)
+        """
+        data = request.get_json(silent=True)
+
+        if not data or not data.get('file_ids'):
+            return None, None, {'error': 'No file IDs provided'}
+
+        file_uuids = data['file_ids']
+
+        if not isinstance(file_uuids, list) or len(file_uuids) == 0:
+            return None, None, {'error': 'file_ids must be a non-empty list'}
+
+        return file_uuids, data.get('target_folder_id'), None
+
+    @staticmethod
+    @jwt_required_custom
+    def extract_archive(user, file_uuid):
+        """
+        Extract a ZIP or tar archive into the drive as a background job.
+
+        Requires: JWT token in Authorization header
+        URL parameter:
+            - file_uuid: Archive UUID
+        Expected JSON body (optional):
+            {
+                "target_folder_id": "uuid-string"
+            }
+
+        Returns:
+            JSON response with the started job (202)
+        """
+        try:
+            data = request.get_json(silent=True) or {}
+
+            success, response_data, status_code = FileService.extract_archive(
+                user=user,
+                file_uuid=file_uuid,
+                target_folder_uuid=data.get('target_folder_id')
+            )
+
+            return jsonify(response_data), status_code
+
+        except Exception as e:
+            current_app.logger.error(f"Extract endpoint error: {str(e)}")
+            return jsonify({'error': 'Extraction failed', 'details': str(e)}), 500
+
+    @staticmethod
+    @jwt_required_custom
+    def get_job(user, job_uuid):
+        """
+        Get the state of a background job.
+
+        Requires: JWT token in Authorization header
+        URL parameter:
+            - job_uuid: Job UUID
+
+        Returns:
+            JSON response with job data
+        """
+        try:
+            success, response_data, status_code = JobService.get_job(user, job_uuid)
+            return jsonify(response_data), status_code
+
+        except Exception as e:
+            current_app.logger.error(f"Get job endpoint error: {str(e)}")
+            return jsonify({'error': 'Failed to retrieve job', 'details': str(e)}), 500
+
     @staticmethod
     @jwt_required_custom
     def download_zip(user):
@@ -276,17 +1016,73 @@ class FileController:
 
             zip_name = f"mdrive-{datetime.now().strftime('%Y%m%d-%H%M%S')}.zip"
 
-            return send_file(
+            if not isinstance(result, str):
+                # Too large to cache: stream the temporary file, closed
+                # (and so deleted) with the response
+                return send_file(
+                    result,
+                    mimetype='application/zip',
+                    as_attachment=True,
+                    download_name=zip_name
+                )
+
+            return FileController._send_stored_file(
                 result,
-                mimetype='application/zip',
-                as_attachment=True,
-                download_name=zip_name
+                download_name=zip_name,
+                mimetype='application/zip'
             )
 
         except Exception as e:
             current_app.logger.error(f"Download ZIP endpoint error: {str(e)}")
             return jsonify({'error': 'ZIP download failed', 'details': str(e)}), 500
 
+    @staticmethod
+    @jwt_required_custom
+    def download_stored_zip(user):
+        """
+        Download an uncompressed, resumable ZIP archive of files/folders.
+
+        The same selection of an unchanged drive always gives the same
+        archive, sent with its exact Content-Length and a strong ETag, so
+        download managers can resume it and fetch ranges in parallel
+        (Range, If-Range, If-None-Match and HEAD are supported).
+
+        Requires: JWT token in Authorization header
+        Query parameters:
+            - file_ids: Comma-separated file/folder UUIDs
+
+        Returns:
+            ZIP file stream
+        """
+        try:
+            file_uuids = [value for value in request.args.get('file_ids', '').split(',') if value]
+            if not file_uuids:
+                return jsonify({'error': 'No file IDs provided'}), 400
+
+            success, result, status_code = FileService.get_stored_zip(user, file_uuids)
+
+            if not success:
+                response = jsonify(result)
+                if 'retry_after' in result:
+                    response.headers['Retry-After'] = str(result['retry_after'])
+                return response, status_code
+
+            response = current_app.response_class(
+                result.open(current_app.config['DOWNLOAD_BLOCK_SIZE']),
+                mimetype='application/zip', direct_passthrough=True
+            )
+            response.content_length = result.size
+            response.accept_ranges = 'bytes'
+            response.set_etag(result.etag)
+            response.headers.set('Content-Disposition', 'attachment',
+                                 filename=f'mdrive-{result.etag[:16]}.zip')
+            return response.make_conditional(request, accept_ranges=True,
+                                             complete_length=result.size)
+
+        except Exception as e:
+            current_app.logger.error(f"Download stored ZIP endpoint error: {str(e)}")
+            return jsonify({'error': 'ZIP download failed', 'details': str(e)}), 500
+
     @staticmethod
     @jwt_required_custom
     def get_file_info(user, file_uuid):
@@ -296,23 +1092,22 @@ class FileController:
         Requires: JWT token in Authorization header
         URL parameter:
             - file_uuid: File UUID
+        Query parameters:
+            - fields: (optional) Comma-separated fields of the file; include
+              'breadcrumb' to get the breadcrumb as well
 
         Returns:
             JSON response with file data
         """
         try:
-            success, file_data, status_code = FileService.get_file_by_uuid(user, file_uuid)
-
-            if not success:
-                return jsonify(file_data), status_code
+            fields, error = parse_fields(request.args.get('fields'), FILE_INFO_FIELDS)
+            if error:
+                return jsonify({'error': error}), 400
 
-            file_obj = file_data
-            response = {
-                'file': file_obj.to_dict(),
-                'breadcrumb': file_obj.get_breadcrumb()
-            }
+            success, response_data, status_code = FileService.get_file_info(
+                user, file_uuid, fields=fields)
 
-            return jsonify(response), 200
+            return jsonify(response_data), status_code
 
         except Exception as e:
             current_app.logger.error(f"Get file info endpoint error: {str(e)}")
@@ -324,6 +1119,10 @@ class FileController:
     @jwt_required_custom
     def get_trash(user):
         try:
+            fields, error = parse_fields(request.args.get('fields'), LISTING_FIELDS)
+            if error:
+                return jsonify({'error': error}), 400
+
             page = request.args.get('page', 1, type=int)
             per_page = request.args.get('per_page', 50, type=int)
             if page < 1:
@@ -331,7 +1130,7 @@ class FileController:
             if per_page < 1 or per_page > 100:
                 per_page = 50
             success, response_data, status_code = FileService.get_trash(
-                user=user, page=page, per_page=per_page)
+                user=user, page=page, per_page=per_page, fields=fields)
             return jsonify(response_data), status_code
         except Exception as e:
             current_app.logger.error(f"Get trash endpoint error: {str(e)}")
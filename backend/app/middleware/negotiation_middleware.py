@@ -0,0 +1,133 @@
+"""
+Content negotiation middleware module.
+Compresses responses and serves MessagePack to clients that ask for it.
+"""
+import json
+import zlib
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional, gzip is always available
+    brotli = None
+
+try:
+    import msgpack
+except ImportError:  # optional, enables application/msgpack responses
+    msgpack = None
+
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+
+class _GzipEncoder:
+    """Incremental gzip encoder."""
+
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data):
+        """Compress ``data`` and flush it so it can be sent right away."""
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class _BrotliEncoder:
+    """Incremental brotli encoder."""
+
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def chunk(self, data):
+        """Compress ``data`` and flush it so it can be sent right away."""
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+def init_app(app):
+    """Negotiate the format and encoding of every response of ``app``."""
+    compressible = {mimetype.strip() for mimetype
+                    in app.config['COMPRESSION_MIMETYPES'].split(',') if mimetype.strip()}
+
+    @app.after_request
+    def negotiate(response):
+        if msgpack is not None and app.config['MSGPACK_ENABLED']:
+            _to_msgpack(response)
+        if response.mimetype in compressible:
+            _compress(response, app.config)
+        return response
+
+
+def _to_msgpack(response):
+    """Re-encode a JSON body as MessagePack when the client prefers it."""
+    if response.mimetype != 'application/json':
+        return
+    response.vary.add('Accept')
+    if response.is_streamed or response.direct_passthrough:
+        return
+    if request.accept_mimetypes.best_match(
+            ['application/json', MSGPACK_MIMETYPE]) != MSGPACK_MIMETYPE:
+        return
+
+    response.set_data(msgpack.packb(json.loads(response.get_data()), use_bin_type=True))
+    response.mimetype = MSGPACK_MIMETYPE
+
+
+def _compress(response, config):
+    """
+    Encode the body with the best of br/gzip the client accepts.
+
+    Buffered bodies smaller than COMPRESSION_MIN_SIZE are left alone.
+    Streamed bodies are compressed chunk by chunk, each chunk flushed so
+    NDJSON streams still reach the client as they are produced.
+    """
+    response.vary.add('Accept-Encoding')
+    if (response.direct_passthrough or 'Content-Encoding' in response.headers
+            or response.status_code in (204, 206, 304) or response.status_code < 200
+            or request.method == 'HEAD'):
+        return
+
+    offers = ['br', 'gzip'] if brotli is not None else ['gzip']
+    encoding = request.accept_encodings.best_match(offers)
+    if not encoding:
+        return
+
+    def encoder():
+        if encoding == 'br':
+            return _BrotliEncoder(config['BROTLI_QUALITY'])
+        return _GzipEncoder(config['GZIP_LEVEL'])
+
+    if response.is_streamed:
+        body = response.response
+
+        def generate():
+            stream = encoder()
+            try:
+                for data in body:
+                    if isinstance(data, str):
+                        data = data.encode('utf-8')
+                    compressed = stream.chunk(data)
+                    if compressed:
+                        yield compressed
+                yield stream.finish()
+            finally:
+                if hasattr(body, 'close'):
+                    body.close()
+
+        response.response = generate()
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < config['COMPRESSION_MIN_SIZE']:
+            return
+        stream = encoder()
+        response.set_data(stream.chunk(data) + stream.finish())
+
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        # A strong validator must change with the bytes on the wire
+        response.set_etag(f'{etag}-{encoding}')
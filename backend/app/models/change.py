@@ -0,0 +1,70 @@
+"""
+Change model module.
+Defines the per-user change journal read by sync clients.
+"""
+import enum
+from datetime import datetime
+from app import db
+
+
+class ChangeAction(enum.Enum):
+    """Enumeration of journaled file operations."""
+    CREATE = 'CREATE'
+    RENAME = 'RENAME'
+    MOVE = 'MOVE'
+    DELETE = 'DELETE'
+    RESTORE = 'RESTORE'
+    PURGE = 'PURGE'
+
+
+class Change(db.Model):
+    """
+    One entry of a user's append-only change journal.
+
+    ``seq`` numbers are allocated from ``User.change_seq`` without gaps, so a
+    client holding cursor N has seen every change up to and including N.
+    Operations on a folder are journaled once for the folder itself and
+    apply to its whole subtree (descendants keep their UUIDs); only
+    creations list every new row.
+    """
+
+    __tablename__ = 'changes'
+
+    id = db.Column(db.BigInteger().with_variant(db.Integer, 'sqlite'), primary_key=True,
+                   autoincrement=True)
+    user_uuid = db.Column(db.String(36), db.ForeignKey('users.uuid', ondelete='CASCADE'),
+                          nullable=False)
+    seq = db.Column(db.BigInteger, nullable=False)
+    action = db.Column(db.Enum(ChangeAction), nullable=False)
+    file_uuid = db.Column(db.String(36), nullable=False)
+    parent_folder_uuid = db.Column(db.String(36), nullable=True)
+    file_name = db.Column(db.String(255), nullable=False)
+    file_path = db.Column(db.String(500), nullable=False)
+    is_folder = db.Column(db.Boolean, nullable=False, default=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint('user_uuid', 'seq', name='uq_changes_user_seq'),
+        db.Index('idx_changes_created', 'created_at'),
+    )
+
+    def to_dict(self) -> dict:
+        """
+        Convert change object to dictionary.
+
+        Returns:
+            dict: Change data dictionary
+        """
+        return {
+            'seq': self.seq,
+            'action': self.action.value,
+            'id': self.file_uuid,
+            'parent_folder_id': self.parent_folder_uuid,
+            'file_name': self.file_name,
+            'file_path': self.file_path,
+            'is_folder': self.is_folder,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+    def __repr__(self):
+        return f'<Change {self.seq} {self.action.value} {self.file_path}>'
@@ -0,0 +1,30 @@
+"""
+Content posting model module.
+Defines the inverted index used by full-text content search.
+"""
+from sqlalchemy.dialects import mysql
+from app import db
+
+
+class ContentPosting(db.Model):
+    """
+    Occurrences of one token in one text file.
+
+    ``offset`` is the byte position of the first occurrence, so a snippet
+    can be cut with a ranged read instead of loading the whole file.
+    Tokens are stored without accents and case-folded, and compared
+    byte-wise on MySQL, so the collation never merges two distinct tokens.
+    """
+
+    __tablename__ = 'content_postings'
+
+    user_uuid = db.Column(db.String(36), primary_key=True)
+    token = db.Column(db.String(64).with_variant(mysql.VARCHAR(64, collation='utf8mb4_bin'), 'mysql'),
+                      primary_key=True)
+    file_uuid = db.Column(db.String(36), db.ForeignKey('files.uuid', ondelete='CASCADE'),
+                          primary_key=True, index=True)
+    occurrences = db.Column(db.Integer, nullable=False, default=1)
+    offset = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<ContentPosting {self.token!r} {self.file_uuid}>'
@@ -19,6 +19,7 @@ class File(db.Model):
     file_path = db.Column(db.String(500), nullable=False)  # Relative path from userdata
     file_size = db.Column(db.BigInteger, default=0)
     mime_type = db.Column(db.String(100))
+    crc32 = db.Column(db.BigInteger, nullable=True)  # CRC-32 of the contents, for stored ZIPs
     is_folder = db.Column(db.Boolean, default=False)
     is_deleted = db.Column(db.Boolean, default=False, nullable=False)
     deleted_at = db.Column(db.DateTime, nullable=True)
@@ -36,10 +37,24 @@ class File(db.Model):
     __table_args__ = (
         db.Index('idx_user_parent', 'user_uuid', 'parent_folder_uuid'),
         db.Index('idx_user_folder', 'user_uuid', 'is_folder'),
+        # Sorted folder listings (one per FileService.get_files sort key)
+        db.Index('idx_list_name', 'user_uuid', 'parent_folder_uuid', 'is_deleted',
+                 'is_folder', 'file_name'),
+        db.Index('idx_list_size', 'user_uuid', 'parent_folder_uuid', 'is_deleted',
+                 'is_folder', 'file_size', 'file_name'),
+        db.Index('idx_list_updated_at', 'user_uuid', 'parent_folder_uuid', 'is_deleted',
+                 'is_folder', 'updated_at', 'file_name'),
+        db.Index('idx_list_type', 'user_uuid', 'parent_folder_uuid', 'is_deleted',
+                 'is_folder', 'mime_type', 'file_name'),
+        # Drive-wide "recent" and "largest" views
+        db.Index('idx_user_deleted_updated_at', 'user_uuid', 'is_deleted', 'updated_at',
+                 'uuid'),
+        db.Index('idx_user_deleted_file_size', 'user_uuid', 'is_deleted', 'file_size',
+                 'uuid'),
     )
 
     def __init__(self, user_uuid, file_name, file_path, is_folder=False,
-                 parent_folder_uuid=None, file_size=0, mime_type=None):
+                 parent_folder_uuid=None, file_size=0, mime_type=None, crc32=None):
         """
         Initialize a new file or folder entry.
 
@@ -51,6 +66,7 @@ class File(db.Model):
             parent_folder_uuid (str, optional): Parent folder UUID
             file_size (int): Size in bytes (0 for folders)
             mime_type (str, optional): MIME type of the file
+            crc32 (int, optional): CRC-32 of the file contents
         """
         self.user_uuid = user_uuid
         self.file_name = file_name
@@ -59,6 +75,7 @@ class File(db.Model):
         self.parent_folder_uuid = parent_folder_uuid
         self.file_size = file_size
         self.mime_type = mime_type
+        self.crc32 = crc32
 
     def to_dict(self, include_children=False):
         """
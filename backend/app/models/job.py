@@ -0,0 +1,72 @@
+"""
+Job model module.
+Defines the Job database model tracking background operations.
+"""
+import enum
+import json
+import uuid as uuid_lib
+from datetime import datetime
+from app import db
+
+
+class JobStatus(enum.Enum):
+    """Enumeration of background job states."""
+    PENDING = 'PENDING'
+    RUNNING = 'RUNNING'
+    COMPLETED = 'COMPLETED'
+    FAILED = 'FAILED'
+
+
+class Job(db.Model):
+    """Background job started on behalf of a user (e.g. archive extraction)."""
+
+    __tablename__ = 'jobs'
+
+    uuid = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid_lib.uuid4()))
+    user_uuid = db.Column(db.String(36), db.ForeignKey('users.uuid', ondelete='CASCADE'),
+                          nullable=False, index=True)
+    kind = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.Enum(JobStatus), nullable=False, default=JobStatus.PENDING)
+    progress = db.Column(db.Integer, nullable=False, default=0)
+    # JSON arguments of the job body, so a job's scope can be inspected
+    params = db.Column(db.Text)
+    result = db.Column(db.Text)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __init__(self, user_uuid: str, kind: str, params: dict = None):
+        """
+        Initialize a new pending job.
+
+        Args:
+            user_uuid (str): UUID of the user the job runs for
+            kind (str): Job type identifier (e.g. 'extract')
+            params (dict, optional): Arguments of the job body
+        """
+        self.user_uuid = user_uuid
+        self.kind = kind
+        self.params = json.dumps(params) if params is not None else None
+        self.status = JobStatus.PENDING
+        self.progress = 0
+
+    def to_dict(self) -> dict:
+        """
+        Convert job object to dictionary.
+
+        Returns:
+            dict: Job data dictionary
+        """
+        return {
+            'id': self.uuid,
+            'kind': self.kind,
+            'status': self.status.value,
+            'progress': self.progress,
+            'result': json.loads(self.result) if self.result else None,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+    def __repr__(self):
+        return f'<Job {self.kind} {self.status.value}>'
@@ -0,0 +1,25 @@
+"""
+Search term model module.
+Defines the n-gram index used by filename search.
+"""
+from app import db
+
+
+class SearchTerm(db.Model):
+    """
+    One indexed term of a file name.
+
+    Every lowercased name contributes all of its trigrams plus the one- and
+    two-character prefixes of each word, so queries of any length resolve
+    through the primary key instead of scanning ``files``.
+    """
+
+    __tablename__ = 'search_terms'
+
+    user_uuid = db.Column(db.String(36), primary_key=True)
+    term = db.Column(db.String(3), primary_key=True)
+    file_uuid = db.Column(db.String(36), db.ForeignKey('files.uuid', ondelete='CASCADE'),
+                          primary_key=True, index=True)
+
+    def __repr__(self):
+        return f'<SearchTerm {self.term!r} {self.file_uuid}>'
@@ -16,6 +16,11 @@ class UserRole(enum.Enum):
     LIMITED_SUBSCRIBER = 'LIMITED_SUBSCRIBER'
 
 
+# Keys of User.to_dict with storage information
+PROFILE_FIELDS = ('id', 'email', 'full_name', 'role', 'is_active', 'created_at',
+                  'storage_quota', 'storage_used', 'storage_available')
+
+
 class User(db.Model):
     """User model for authentication and file ownership."""
 
@@ -28,6 +33,8 @@ class User(db.Model):
     role = db.Column(db.Enum(UserRole), nullable=False, default=UserRole.LIMITED_SUBSCRIBER)
     is_active = db.Column(db.Boolean, nullable=False, default=True)
     storage_used = db.Column(db.BigInteger, default=0)
+    # Last sequence number handed out by the change journal
+    change_seq = db.Column(db.BigInteger, nullable=False, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -98,12 +105,14 @@ class User(db.Model):
         """
         return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
 
-    def to_dict(self, include_storage: bool = True) -> dict:
+    def to_dict(self, include_storage: bool = True, fields: set = None) -> dict:
         """
         Convert user object to dictionary.
 
         Args:
             include_storage (bool): Whether to include storage information
+            fields (set, optional): Keys to return (default: all); the quota
+                is only looked up when a key depending on it is requested
 
         Returns:
             dict: User data dictionary
@@ -118,12 +127,16 @@ class User(db.Model):
         }
 
         if include_storage:
-            quota = self.storage_quota
-            data.update({
-                'storage_quota': quota,
-                'storage_used': self.storage_used,
-                'storage_available': quota - self.storage_used
-            })
+            data['storage_used'] = self.storage_used
+            if fields is None or not fields.isdisjoint(('storage_quota', 'storage_available')):
+                quota = self.storage_quota
+                data.update({
+                    'storage_quota': quota,
+                    'storage_available': quota - self.storage_used
+                })
+
+        if fields is not None:
+            data = {key: value for key, value in data.items() if key in fields}
 
         return data
 
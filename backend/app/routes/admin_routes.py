@@ -37,3 +37,9 @@ def get_settings():
 def update_settings():
     """PUT /api/admin/settings - Update application settings"""
     return SettingsController.update_settings()
+
+
+@admin_bp.route('/cache-stats', methods=['GET'])
+def get_cache_stats():
+    """GET /api/admin/cache-stats - Folder-listing and file cache metrics"""
+    return AdminController.get_cache_stats()
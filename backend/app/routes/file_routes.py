@@ -16,12 +16,60 @@ def upload_file():
     return FileController.upload_file()
 
 
+@file_bp.route('/upload-multiple', methods=['POST'])
+def upload_files():
+    """POST /api/files/upload-multiple - Upload many files in one request"""
+    return FileController.upload_files()
+
+
+@file_bp.route('/upload-tree', methods=['POST'])
+def upload_tree():
+    """POST /api/files/upload-tree - Upload a folder tree in one request"""
+    return FileController.upload_tree()
+
+
 @file_bp.route('', methods=['GET'])
 def get_files():
     """GET /api/files - Get list of files and folders"""
     return FileController.get_files()
 
 
+@file_bp.route('/search', methods=['GET'])
+def search_files():
+    """GET /api/files/search - Search files and folders by name"""
+    return FileController.search_files()
+
+
+@file_bp.route('/recent', methods=['GET'])
+def get_recent_files():
+    """GET /api/files/recent - Get the most recently modified files"""
+    return FileController.get_recent_files()
+
+
+@file_bp.route('/largest', methods=['GET'])
+def get_largest_files():
+    """GET /api/files/largest - Get the largest files"""
+    return FileController.get_largest_files()
+
+
+@file_bp.route('/changes', methods=['GET'])
+def get_changes():
+    """GET /api/files/changes - Get changes made after a sync cursor"""
+    return FileController.get_changes()
+
+
+@file_bp.route('/events', methods=['GET'])
+def get_events():
+    """GET /api/files/events - Server-Sent Events stream of drive changes"""
+    return FileController.get_events()
+
+
+@file_bp.route('/manifest', methods=['GET'])
+def get_manifest():
+    """GET /api/files/manifest - Stream every live entry as NDJSON"""
+    return FileController.get_manifest()
+
+
 @file_bp.route('/<string:file_uuid>', methods=['GET'])
 def get_file_info(file_uuid):
     """GET /api/files/<file_uuid> - Get file information"""
@@ -34,12 +82,54 @@ def download_file(file_uuid):
     return FileController.download_file(file_uuid)
 
 
+@file_bp.route('/<string:file_uuid>/transfer-url', methods=['POST'])
+def create_transfer_url(file_uuid):
+    """POST /api/files/<file_uuid>/transfer-url - Issue a signed download URL"""
+    return FileController.create_transfer_url(file_uuid)
+
+
+@file_bp.route('/transfer/<string:file_uuid>', methods=['GET'])
+def download_signed(file_uuid):
+    """GET /api/files/transfer/<file_uuid> - Download a file through a signed URL"""
+    return FileController.download_signed(file_uuid)
+
+
 @file_bp.route('/download-zip', methods=['POST'])
 def download_zip():
     """POST /api/files/download-zip - Download multiple files/folders as a ZIP"""
     return FileController.download_zip()
 
 
+@file_bp.route('/download-zip', methods=['GET'])
+def download_stored_zip():
+    """GET /api/files/download-zip - Download files/folders as a resumable, uncompressed ZIP"""
+    return FileController.download_stored_zip()
+
+
+@file_bp.route('/lookup', methods=['POST'])
+def lookup_files():
+    """POST /api/files/lookup - Get metadata of several files at once"""
+    return FileController.lookup_files()
+
+
+@file_bp.route('/move', methods=['POST'])
+def move_files():
+    """POST /api/files/move - Move files/folders into another folder"""
+    return FileController.move_files()
+
+
+@file_bp.route('/copy', methods=['POST'])
+def copy_files():
+    """POST /api/files/copy - Copy files/folders into another folder"""
+    return FileController.copy_files()
+
+
+@file_bp.route('/batch', methods=['POST'])
+def batch_operations():
+    """POST /api/files/batch - Apply many operations in one transaction"""
+    return FileController.batch_operations()
+
+
 @file_bp.route('/<string:file_uuid>', methods=['DELETE'])
 def delete_file(file_uuid):
     """DELETE /api/files/<file_uuid> - Delete a file or folder"""
@@ -58,6 +148,18 @@ def rename_file(file_uuid):
     return FileController.rename_file(file_uuid)
 
 
+@file_bp.route('/<string:file_uuid>/extract', methods=['POST'])
+def extract_archive(file_uuid):
+    """POST /api/files/<file_uuid>/extract - Extract an archive in the background"""
+    return FileController.extract_archive(file_uuid)
+
+
+@file_bp.route('/jobs/<string:job_uuid>', methods=['GET'])
+def get_job(job_uuid):
+    """GET /api/files/jobs/<job_uuid> - Get background job status"""
+    return FileController.get_job(job_uuid)
+
+
 # ── Recycle Bin routes ──────────────────────────────────
 
 @file_bp.route('/trash', methods=['GET'])
@@ -0,0 +1,170 @@
+"""
+Archive service module.
+Reads ZIP and tar archives for server-side extraction.
+"""
+import os
+import stat
+import tarfile
+import zipfile
+import zlib
+from collections import namedtuple
+from flask import current_app
+
+# One entry of an archive. ``compressed_size`` is None when the format
+# doesn't record it per member (tar); ``ref`` is the ZipInfo/TarInfo.
+ArchiveMember = namedtuple('ArchiveMember', 'name size compressed_size is_dir ref')
+
+# Buffer size used when streaming a member to disk
+EXTRACT_BUFFER_SIZE = 1024 * 1024
+
+# Members smaller than this are exempt from the per-member ratio check:
+# tiny, highly repetitive files legitimately compress extremely well
+RATIO_CHECK_MIN_SIZE = 1024 * 1024
+
+TAR_SUFFIXES = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+
+
+class ArchiveError(Exception):
+    """Raised when an archive is unsupported, malformed or unsafe to extract."""
+
+
+class ArchiveService:
+    """Service class for reading archives."""
+
+    @staticmethod
+    def detect_format(file_name):
+        """
+        Get the archive format from a file name.
+
+        Args:
+            file_name (str): Archive file name
+
+        Returns:
+            str|None: 'zip', 'tar' or None when unsupported
+        """
+        lowered = file_name.lower()
+        if lowered.endswith('.zip'):
+            return 'zip'
+        if lowered.endswith(TAR_SUFFIXES):
+            return 'tar'
+        return None
+
+    @staticmethod
+    def open_archive(full_path, archive_format):
+        """
+        Open an archive for reading.
+
+        Returns:
+            zipfile.ZipFile|tarfile.TarFile: Archive handle (a context manager)
+        """
+        try:
+            if archive_format == 'zip':
+                return zipfile.ZipFile(full_path)
+            return tarfile.open(full_path, 'r:*')
+        except (zipfile.BadZipFile, tarfile.TarError, OSError) as e:
+            raise ArchiveError(f'Unreadable archive: {str(e)}')
+
+    @staticmethod
+    def list_members(archive):
+        """
+        List regular files and directories of an archive.
+
+        ZIP archives are listed from the central directory alone. Links,
+        devices and other special entries are returned separately so they
+        can be reported as skipped.
+
+        Returns:
+            tuple: (members: list[ArchiveMember], skipped: list[str])
+        """
+        members = []
+        skipped = []
+
+        if isinstance(archive, zipfile.ZipFile):
+            for info in archive.infolist():
+                # Unix file type bits, when the archiver recorded them
+                file_type = stat.S_IFMT(info.external_attr >> 16)
+                if file_type and file_type not in (stat.S_IFREG, stat.S_IFDIR):
+                    skipped.append(info.filename)
+                    continue
+                members.append(ArchiveMember(
+                    info.filename, info.file_size, info.compress_size, info.is_dir(), info))
+            return members, skipped
+
+        for info in archive.getmembers():
+            if info.isfile() or info.isdir():
+                members.append(ArchiveMember(info.name, info.size, None, info.isdir(), info))
+            else:
+                skipped.append(info.name)
+        return members, skipped
+
+    @staticmethod
+    def check_limits(members, archive_size):
+        """
+        Reject archives that look like decompression bombs.
+
+        Checks the member count, the declared uncompressed total and the
+        compression ratio, both per ZIP member and for the whole archive.
+
+        Raises:
+            ArchiveError: When a limit is exceeded
+        """
+        config = current_app.config
+        max_ratio = config['ARCHIVE_MAX_RATIO']
+
+        if len(members) > config['ARCHIVE_MAX_MEMBERS']:
+            raise ArchiveError(f"Archive has more than {config['ARCHIVE_MAX_MEMBERS']} entries")
+
+        total = sum(member.size for member in members if not member.is_dir)
+        if total > config['ARCHIVE_MAX_TOTAL_SIZE']:
+            raise ArchiveError('Archive expands beyond the maximum extraction size')
+
+        if total > RATIO_CHECK_MIN_SIZE and total > max_ratio * max(archive_size, 1):
+            raise ArchiveError('Archive compression ratio is suspiciously high')
+
+        for member in members:
+            if (member.compressed_size is not None
+                    and member.size > RATIO_CHECK_MIN_SIZE
+                    and member.size > max_ratio * max(member.compressed_size, 1)):
+                raise ArchiveError(f'Compression ratio of {member.name} is suspiciously high')
+
+    @staticmethod
+    def extract_member(archive, member, destination):
+        """
+        Stream one member to ``destination``.
+
+        At most ``member.size`` bytes are accepted, so a header that lies
+        about the uncompressed size can't be used to fill the disk.
+
+        Returns:
+            tuple: (bytes_written: int, crc32: int)
+
+        Raises:
+            ArchiveError: When the member holds more data than declared
+        """
+        if isinstance(archive, zipfile.ZipFile):
+            source = archive.open(member.ref)
+        else:
+            source = archive.extractfile(member.ref)
+
+        written = 0
+        crc32 = 0
+        with source:
+            target = open(destination, 'xb')
+            try:
+                with target:
+                    while True:
+                        chunk = source.read(EXTRACT_BUFFER_SIZE)
+                        if not chunk:
+                            break
+                        written += len(chunk)
+                        if written > member.size:
+                            raise ArchiveError(f'{member.name} is larger than declared')
+                        crc32 = zlib.crc32(chunk, crc32)
+                        target.write(chunk)
+            except BaseException:
+                # Never leave a partial file behind (bad CRC, read or disk
+                # errors too): the caller only tracks complete members
+                os.remove(destination)
+                raise
+
+        return written, crc32
@@ -113,12 +113,13 @@ class AuthService:
             return False, {'error': 'Login failed', 'details': str(e)}, 500
 
     @staticmethod
-    def get_user_profile(user_uuid):
+    def get_user_profile(user_uuid, fields=None):
         """
         Get user profile information.
 
         Args:
             user_uuid (str): User UUID
+            fields (set, optional): Keys of the profile to return (default: all)
 
         Returns:
             tuple: (success: bool, data: dict, status_code: int)
@@ -128,7 +129,7 @@ class AuthService:
         if not user:
             return False, {'error': 'User not found'}, 404
 
-        return True, {'user': user.to_dict()}, 200
+        return True, {'user': user.to_dict(fields=fields)}, 200
 
     @staticmethod
     def update_user_profile(user_uuid, full_name=None):
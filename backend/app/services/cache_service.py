@@ -0,0 +1,196 @@
+"""
+Cache service module.
+Caches serialized folder-listing pages.
+"""
+import threading
+from collections import OrderedDict
+from flask import current_app
+
+try:
+    import redis
+except ImportError:  # optional, only needed for multi-worker deployments
+    redis = None
+
+# Prefix of listing keys on a shared cache
+KEY_PREFIX = 'mdrive:listing:'
+
+
+class LocalListingCache:
+    """Bounded in-process LRU cache."""
+
+    def __init__(self, max_entries):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._max_entries = max_entries
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key):
+        """Return the cached value, or None."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key, value):
+        """Store a value, evicting the least recently used entries when full."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def stats(self):
+        """Counters since the process started."""
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'entries': len(self._entries),
+                'max_entries': self._max_entries,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions
+            }
+
+
+class RedisListingCache:
+    """
+    Cache shared by every worker, on any server speaking the Redis protocol.
+
+    Entries expire after ``ttl`` seconds; bounding and LRU eviction are left
+    to the server (``maxmemory`` with an ``allkeys-lru`` policy).
+    """
+
+    def __init__(self, url, ttl):
+        if redis is None:
+            raise RuntimeError('The redis package is required for LISTING_CACHE_URL=' + url)
+        self._client = redis.Redis.from_url(url)
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key):
+        value = self._client.get(KEY_PREFIX + key)
+        with self._lock:
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return value
+
+    def set(self, key, value):
+        self._client.set(KEY_PREFIX + key, value, ex=self._ttl)
+
+    def stats(self):
+        """
+        Hit counters of this worker; entries and evictions as seen by the server.
+
+        Entries are the listing keys only, counted with SCAN, as the server
+        may hold other data (such as the event bus); evictions are the
+        server's total.
+        """
+        entries = sum(1 for _ in self._client.scan_iter(match=KEY_PREFIX + '*', count=1000))
+        info = self._client.info('stats')
+        with self._lock:
+            return {
+                'backend': 'redis',
+                'entries': entries,
+                'max_entries': None,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': info.get('evicted_keys', 0)
+            }
+
+
+def create_cache(url, max_entries, ttl):
+    """
+    Build the listing cache described by LISTING_CACHE_URL.
+
+    Args:
+        url (str): ``memory://`` for an in-process LRU, ``none://`` to
+            disable caching, or a ``redis://``, ``rediss://`` or ``unix://`` URL
+        max_entries (int): Capacity of the in-process LRU
+        ttl (int): Lifetime of shared entries, in seconds
+
+    Returns:
+        LocalListingCache|RedisListingCache|None: The cache
+    """
+    if url.startswith('none://'):
+        return None
+    if url.startswith('memory://'):
+        return LocalListingCache(max_entries)
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisListingCache(url, ttl)
+    raise ValueError(f'Unsupported LISTING_CACHE_URL: {url}')
+
+
+class CacheService:
+    """Service class for the folder-listing cache."""
+
+    @staticmethod
+    def init_app(app):
+        """Create the application's listing cache."""
+        app.extensions['listing_cache'] = create_cache(
+            app.config['LISTING_CACHE_URL'],
+            app.config['LISTING_CACHE_SIZE'],
+            app.config['LISTING_CACHE_TTL']
+        )
+
+    @staticmethod
+    def listing_key(user, etag):
+        """
+        Cache key of a listing page.
+
+        ``etag`` comes from FileService.listing_etag and already combines
+        the user's generation (the journal head, bumped in the transaction
+        of every write) with the listing parameters, so a write makes every
+        older entry of that user unreachable; stale entries then age out.
+        """
+        return f'{user.uuid}:{etag}'
+
+    @staticmethod
+    def get(key):
+        """Return the cached serialized page, or None."""
+        cache = current_app.extensions.get('listing_cache')
+        if cache is None:
+            return None
+        try:
+            return cache.get(key)
+        except Exception as e:
+            current_app.logger.error(f"Listing cache read error: {str(e)}")
+            return None
+
+    @staticmethod
+    def set(key, value):
+        """Store a serialized page; failures only cost a future miss."""
+        cache = current_app.extensions.get('listing_cache')
+        if cache is None:
+            return
+        try:
+            cache.set(key, value)
+        except Exception as e:
+            current_app.logger.error(f"Listing cache write error: {str(e)}")
+
+    @staticmethod
+    def get_stats():
+        """
+        Get listing cache metrics.
+
+        Returns:
+            tuple: (success: bool, data: dict, status_code: int)
+        """
+        cache = current_app.extensions.get('listing_cache')
+        if cache is None:
+            return True, {'cache': {'backend': 'none'}}, 200
+
+        stats = cache.stats()
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else None
+        return True, {'cache': stats}, 200
@@ -0,0 +1,147 @@
+"""
+Change service module.
+Writes and reads the per-user change journal used for delta sync.
+"""
+from datetime import datetime, timedelta
+from app import db
+from app.models.change import Change
+from app.models.user import User
+
+
+class ChangeService:
+    """Service class for the change journal."""
+
+    @staticmethod
+    def record(user_uuid, action, files):
+        """
+        Append one journal entry per file, without committing.
+
+        Call it from inside the transaction that performs the change: the
+        sequence range is taken with an UPDATE on the user row, which also
+        serializes concurrent writers of the same journal so entries become
+        visible in sequence order.
+
+        Args:
+            user_uuid (str): Owner of the files
+            action (ChangeAction): Operation applied to the files
+            files (list[File]): Affected rows, in their new state
+        """
+        files = list(files)
+        if not files:
+            return
+
+        # Picked up by EventService once the transaction commits
+        db.session.info.setdefault('changed_users', set()).add(user_uuid)
+
+        db.session.flush()
+        User.query.filter_by(uuid=user_uuid).update(
+            {'change_seq': User.change_seq + len(files)},
+            synchronize_session=False
+        )
+        last_seq = db.session.query(User.change_seq).filter_by(uuid=user_uuid).scalar()
+
+        now = datetime.utcnow()
+        first_seq = last_seq - len(files) + 1
+        db.session.bulk_insert_mappings(Change, [
+            {
+                'user_uuid': user_uuid,
+                'seq': first_seq + offset,
+                'action': action,
+                'file_uuid': file.uuid,
+                'parent_folder_uuid': file.parent_folder_uuid,
+                'file_name': file.file_name,
+                'file_path': file.file_path,
+                'is_folder': bool(file.is_folder),
+                'created_at': now
+            }
+            for offset, file in enumerate(files)
+        ])
+
+    @staticmethod
+    def latest_seq(user_uuid):
+        """Committed head of a user's journal (0 when nothing was journaled)."""
+        return db.session.query(User.change_seq).filter_by(uuid=user_uuid).scalar() or 0
+
+    @staticmethod
+    def get_changes(user, cursor=None, limit=500):
+        """
+        Get the changes made after ``cursor``.
+
+        Without a cursor only the current head is returned, so a client can
+        take a cursor before its initial full listing. When entries after
+        the cursor were compacted away the client must list the drive again,
+        starting from the returned cursor.
+
+        Args:
+            user (User): User object
+            cursor (int, optional): Last sequence number the client has seen
+            limit (int): Maximum number of changes to return
+
+        Returns:
+            tuple: (success: bool, data: dict, status_code: int)
+        """
+        if cursor is not None and cursor < 0:
+            return False, {'error': 'Invalid cursor'}, 400
+
+        changes, latest = ChangeService.changes_after(user.uuid, cursor, limit + 1)
+
+        if cursor is None:
+            return True, {'changes': [], 'cursor': latest, 'has_more': False}, 200
+
+        if changes is None:
+            return False, {
+                'error': 'Cursor is too old, a full resync is required',
+                'resync_required': True,
+                'cursor': latest
+            }, 410
+
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+
+        return True, {
+            'changes': [change.to_dict() for change in changes],
+            'cursor': changes[-1].seq if changes else cursor,
+            'has_more': has_more
+        }, 200
+
+    @staticmethod
+    def changes_after(user_uuid, cursor, limit):
+        """
+        Read up to ``limit`` journal entries following ``cursor``.
+
+        Returns:
+            tuple: (changes: list[Change]|None, latest: int) where ``changes``
+            is None when the journal no longer reaches back to the cursor,
+            and empty when no cursor is given
+        """
+        latest = ChangeService.latest_seq(user_uuid)
+        if cursor is None:
+            return [], latest
+
+        changes = Change.query.filter(
+            Change.user_uuid == user_uuid,
+            Change.seq > cursor
+        ).order_by(Change.seq).limit(limit).all()
+
+        # Sequence numbers have no gaps, so anything but cursor + 1 as the
+        # first entry means the journal no longer covers the cursor
+        if cursor > latest or (cursor < latest and (not changes or changes[0].seq != cursor + 1)):
+            return None, latest
+
+        return changes, latest
+
+    @staticmethod
+    def compact(days=30):
+        """
+        Drop journal entries older than ``days`` days.
+
+        Clients whose cursor falls before the remaining entries are told to
+        resync by get_changes.
+
+        Returns:
+            int: Number of entries removed
+        """
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        count = Change.query.filter(Change.created_at < cutoff).delete(synchronize_session=False)
+        db.session.commit()
+        return count
@@ -0,0 +1,326 @@
+"""
+Content index service module.
+Indexes the text of uploaded documents in the background and searches it.
+"""
+import base64
+import json
+import re
+import threading
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from sqlalchemy import and_, func, or_, select
+from app import db
+from app.models.content_posting import ContentPosting
+from app.models.file import File
+from app.services.storage_service import StorageService
+from app.utils.helpers import get_file_icon
+
+# Non-text MIME types whose content is still plain text
+TEXT_MIME_TYPES = ('application/json', 'application/xml', 'application/javascript',
+                   'application/x-sh', 'application/sql')
+
+TOKEN_RE = re.compile(r'\w{2,64}')
+
+# Longest token stored (the width of content_postings.token)
+MAX_TOKEN_LENGTH = 64
+
+# Longest line read at once while tokenizing
+READ_LINE_LIMIT = 64 * 1024
+
+# Bytes read before and after the first match to build a snippet
+SNIPPET_BEFORE = 80
+SNIPPET_AFTER = 160
+
+# Most tokens accepted in one content query
+MAX_QUERY_TOKENS = 10
+
+# Files read per round trip by rebuild()
+REINDEX_BATCH_SIZE = 500
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _normalize_token(word):
+    """
+    Fold a word to its index form: no accents, case-folded, truncated.
+
+    "Résumé", "resume" and "RESUME" share one posting, as do "straße" and
+    "STRASSE"; this also keeps tokens that only differ by accent or case
+    from colliding in the primary key under a case/accent-insensitive
+    collation.
+    """
+    if word.isascii():
+        return word.lower()[:MAX_TOKEN_LENGTH]
+    decomposed = unicodedata.normalize('NFKD', word)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return stripped.casefold()[:MAX_TOKEN_LENGTH]
+
+
+def _get_executor(workers):
+    """Return the process-wide indexing executor, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='mdrive-index')
+        return _executor
+
+
+class ContentIndexService:
+    """Service class for full-text content search."""
+
+    @staticmethod
+    def is_indexable(file):
+        """Whether ``file`` is a text document small enough to index."""
+        if file.is_folder or not file.mime_type:
+            return False
+        if not (file.mime_type.startswith('text/') or file.mime_type in TEXT_MIME_TYPES):
+            return False
+        return (file.file_size or 0) <= current_app.config['CONTENT_INDEX_MAX_SIZE']
+
+    @staticmethod
+    def submit(user_uuid, files):
+        """
+        Queue committed files for (re)indexing.
+
+        Indexing runs on a small thread pool so uploads never wait for it;
+        with CONTENT_INDEX_WORKERS = 0 it runs inline instead.
+
+        Args:
+            user_uuid (str): Owner of the files
+            files (list[File]): Rows whose content was written or replaced
+        """
+        file_uuids = [file.uuid for file in files if ContentIndexService.is_indexable(file)]
+        if not file_uuids:
+            return
+
+        workers = current_app.config['CONTENT_INDEX_WORKERS']
+        if workers <= 0:
+            ContentIndexService._index_files(user_uuid, file_uuids)
+            return
+
+        app = current_app._get_current_object()
+
+        def run():
+            with app.app_context():
+                ContentIndexService._index_files(user_uuid, file_uuids)
+
+        _get_executor(workers).submit(run)
+
+    @staticmethod
+    def _index_files(user_uuid, file_uuids):
+        """Index files one by one; a failure only affects its own file."""
+        for file_uuid in file_uuids:
+            try:
+                ContentIndexService.index_file(user_uuid, file_uuid)
+            except Exception as e:
+                db.session.rollback()
+                current_app.logger.error(f"Content index error for {file_uuid}: {str(e)}")
+
+    @staticmethod
+    def index_file(user_uuid, file_uuid):
+        """
+        Replace the postings of one file with freshly extracted ones and commit.
+
+        Returns:
+            bool: False when the file is gone or not indexable
+        """
+        file = File.query.filter_by(uuid=file_uuid, user_uuid=user_uuid).first()
+        if not file or not ContentIndexService.is_indexable(file):
+            return False
+
+        full_path = StorageService.get_full_path(user_uuid, file.file_path)
+        postings = ContentIndexService.tokenize(
+            full_path, current_app.config['CONTENT_INDEX_MAX_TOKENS'])
+
+        ContentPosting.query.filter_by(file_uuid=file_uuid).delete(synchronize_session=False)
+        if postings:
+            db.session.bulk_insert_mappings(ContentPosting, [
+                {'user_uuid': user_uuid, 'token': token, 'file_uuid': file_uuid,
+                 'occurrences': occurrences, 'offset': offset}
+                for token, (occurrences, offset) in postings.items()
+            ])
+        db.session.commit()
+        return True
+
+    @staticmethod
+    def tokenize(full_path, max_tokens):
+        """
+        Stream a text file and collect its tokens.
+
+        Args:
+            full_path (str): File to read
+            max_tokens (int): Distinct tokens kept per file
+
+        Returns:
+            dict: token -> [occurrences, byte offset of the first occurrence]
+        """
+        tokens = {}
+        offset = 0
+        with open(full_path, 'rb') as source:
+            while True:
+                line = source.readline(READ_LINE_LIMIT)
+                if not line:
+                    break
+
+                text = line.decode('utf-8', errors='replace')
+                for match in TOKEN_RE.finditer(text):
+                    token = _normalize_token(match.group())
+                    entry = tokens.get(token)
+                    if entry:
+                        entry[0] += 1
+                    elif len(tokens) < max_tokens:
+                        position = len(text[:match.start()].encode('utf-8', errors='replace'))
+                        tokens[token] = [1, offset + position]
+
+                offset += len(line)
+
+        return tokens
+
+    @staticmethod
+    def remove(condition):
+        """
+        Drop the postings of every file matching ``condition``, without committing.
+
+        Call it before the rows themselves are deleted.
+
+        Args:
+            condition: WHERE clause on ``File`` selecting the files
+        """
+        ContentPosting.query.filter(
+            ContentPosting.file_uuid.in_(select(File.uuid).where(condition))
+        ).delete(synchronize_session=False)
+
+    @staticmethod
+    def rebuild(user_uuid=None):
+        """
+        Index every indexable live file, for all users or one of them.
+
+        Returns:
+            int: Number of files indexed
+        """
+        count = 0
+        last_uuid = ''
+        while True:
+            statement = select(
+                File.uuid, File.user_uuid, File.mime_type, File.file_size, File.is_folder
+            ).where(
+                File.is_folder == False,
+                File.is_deleted == False,
+                File.uuid > last_uuid
+            ).order_by(File.uuid).limit(REINDEX_BATCH_SIZE)
+            if user_uuid:
+                statement = statement.where(File.user_uuid == user_uuid)
+
+            rows = db.session.execute(statement).all()
+            if not rows:
+                return count
+
+            for row in rows:
+                if ContentIndexService.is_indexable(row):
+                    count += ContentIndexService.index_file(row.user_uuid, row.uuid)
+            last_uuid = rows[-1].uuid
+
+    @staticmethod
+    def search(user, query, limit=50, cursor=None):
+        """
+        Search the text of the user's live documents.
+
+        Files must contain every token of the query; they are ranked by the
+        total number of occurrences. Each result carries a snippet read
+        around the first match with a single ranged read.
+
+        Args:
+            user (User): User object
+            query (str): Words to look for (case- and accent-insensitive)
+            limit (int): Page size
+            cursor (str, optional): ``next_cursor`` of the previous page
+
+        Returns:
+            tuple: (success: bool, data: dict, status_code: int)
+        """
+        tokens = list(dict.fromkeys(
+            _normalize_token(word) for word in TOKEN_RE.findall(query or '')))
+        if not tokens:
+            return False, {'error': 'Search query is required'}, 400
+        if len(tokens) > MAX_QUERY_TOKENS:
+            return False, {'error': f'At most {MAX_QUERY_TOKENS} words per search'}, 400
+
+        after = None
+        if cursor:
+            try:
+                after = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+                score_after, uuid_after = after
+            except (ValueError, TypeError):
+                return False, {'error': 'Invalid cursor'}, 400
+
+        matches = select(
+            ContentPosting.file_uuid,
+            func.sum(ContentPosting.occurrences).label('score'),
+            func.min(ContentPosting.offset).label('offset')
+        ).where(
+            ContentPosting.user_uuid == user.uuid,
+            ContentPosting.token.in_(tokens)
+        ).group_by(ContentPosting.file_uuid).having(func.count() == len(tokens)).subquery()
+
+        statement = select(File, matches.c.score, matches.c.offset).select_from(matches).join(
+            File, File.uuid == matches.c.file_uuid
+        ).where(
+            File.user_uuid == user.uuid,
+            File.is_deleted == False
+        )
+        if after:
+            statement = statement.where(or_(
+                matches.c.score < score_after,
+                and_(matches.c.score == score_after, File.uuid > uuid_after)
+            ))
+        statement = statement.order_by(matches.c.score.desc(), File.uuid).limit(limit + 1)
+
+        rows = db.session.execute(statement).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        next_cursor = None
+        if has_more:
+            file, score, _ = rows[-1]
+            next_cursor = base64.urlsafe_b64encode(
+                json.dumps([int(score), file.uuid]).encode('utf-8')).decode('ascii')
+
+        return True, {
+            'files': [
+                {
+                    **file.to_dict(),
+                    'icon': get_file_icon(file.mime_type, file.is_folder),
+                    'score': int(score),
+                    'snippet': ContentIndexService.snippet(user.uuid, file, offset)
+                }
+                for file, score, offset in rows
+            ],
+            'next_cursor': next_cursor
+        }, 200
+
+    @staticmethod
+    def snippet(user_uuid, file, offset):
+        """
+        Text surrounding byte ``offset`` of a file, read with one seek.
+
+        Returns:
+            str|None: Whitespace-normalized excerpt, or None if unreadable
+        """
+        start = max(0, offset - SNIPPET_BEFORE)
+        try:
+            with open(StorageService.get_full_path(user_uuid, file.file_path), 'rb') as source:
+                source.seek(start)
+                data = source.read(offset - start + SNIPPET_AFTER)
+        except OSError:
+            return None
+
+        text = data.decode('utf-8', errors='ignore')
+        words = text.split()
+        # Drop words cut in half by the window edges
+        if start > 0 and words and not text[:1].isspace():
+            words = words[1:]
+        if len(data) == offset - start + SNIPPET_AFTER and words and not text[-1:].isspace():
+            words = words[:-1]
+        return ' '.join(words)
@@ -0,0 +1,230 @@
+"""
+Event service module.
+Pushes change notifications to clients over Server-Sent Events.
+"""
+import json
+import queue
+import threading
+import time
+from collections import defaultdict
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app import db
+from app.services.change_service import ChangeService
+
+try:
+    import redis
+except ImportError:  # optional, only needed for multi-worker deployments
+    redis = None
+
+# Prefix of the pub/sub channel of each user on a shared bus
+CHANNEL_PREFIX = 'mdrive:changes:'
+
+# Delay browsers wait before reconnecting, sent as the SSE ``retry`` field
+RECONNECT_DELAY_MS = 3000
+
+
+class LocalEventBus:
+    """
+    Fan-out bus living inside one process.
+
+    Only suitable when every request of a user is served by the same
+    process (a single worker, possibly with many threads).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def publish(self, channel, message):
+        """Deliver ``message`` to every current subscriber of ``channel``."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscriber in subscribers:
+            subscriber.put_nowait(message)
+
+    def subscribe(self, channel):
+        """Return a subscription receiving the messages published from now on."""
+        return _LocalSubscription(self, channel)
+
+    def _add(self, channel, messages):
+        with self._lock:
+            self._subscribers[channel].add(messages)
+
+    def _remove(self, channel, messages):
+        with self._lock:
+            self._subscribers[channel].discard(messages)
+            if not self._subscribers[channel]:
+                del self._subscribers[channel]
+
+
+class _LocalSubscription:
+    """Subscription handed out by LocalEventBus."""
+
+    def __init__(self, bus, channel):
+        self._bus = bus
+        self._channel = channel
+        self._messages = queue.SimpleQueue()
+        bus._add(channel, self._messages)
+
+    def get(self, timeout):
+        """Wait up to ``timeout`` seconds for a message; None on timeout."""
+        try:
+            return self._messages.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self._bus._remove(self._channel, self._messages)
+
+
+class RedisEventBus:
+    """
+    Fan-out bus on Redis pub/sub, shared by every worker and host.
+
+    Works with any server speaking the Redis protocol (Redis, Valkey,
+    KeyDB, ...), over TCP or a local ``unix://`` socket.
+    """
+
+    def __init__(self, url):
+        if redis is None:
+            raise RuntimeError('The redis package is required for EVENT_BUS_URL=' + url)
+        self._client = redis.Redis.from_url(url)
+
+    def publish(self, channel, message):
+        self._client.publish(CHANNEL_PREFIX + channel, message)
+
+    def subscribe(self, channel):
+        return _RedisSubscription(self._client, CHANNEL_PREFIX + channel)
+
+
+class _RedisSubscription:
+    """Subscription handed out by RedisEventBus."""
+
+    def __init__(self, client, channel):
+        self._pubsub = client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(channel)
+
+    def get(self, timeout):
+        """Wait up to ``timeout`` seconds for a message; None on timeout."""
+        message = self._pubsub.get_message(timeout=timeout)
+        return message['data'] if message else None
+
+    def close(self):
+        self._pubsub.close()
+
+
+def create_bus(url):
+    """
+    Build the event bus described by EVENT_BUS_URL.
+
+    Args:
+        url (str): ``memory://`` for the in-process bus, or a
+            ``redis://``, ``rediss://`` or ``unix://`` URL
+
+    Returns:
+        LocalEventBus|RedisEventBus: The bus
+    """
+    if url.startswith('memory://'):
+        return LocalEventBus()
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisEventBus(url)
+    raise ValueError(f'Unsupported EVENT_BUS_URL: {url}')
+
+
+def _publish_committed(session):
+    """Notify the users whose journal grew in the transaction just committed."""
+    users = session.info.pop('changed_users', None)
+    if not users:
+        return
+
+    try:
+        bus = current_app.extensions['event_bus']
+        for user_uuid in users:
+            bus.publish(user_uuid, 'changed')
+    except Exception as e:
+        # Subscribers also poll the journal on every heartbeat
+        current_app.logger.error(f"Event publish error: {str(e)}")
+
+
+def _discard_pending(session, previous_transaction=None):
+    """Forget notifications of a transaction that was rolled back."""
+    session.info.pop('changed_users', None)
+
+
+class EventService:
+    """Service class for the change notification stream."""
+
+    @staticmethod
+    def init_app(app):
+        """Create the application's event bus and hook publication on commit."""
+        app.extensions['event_bus'] = create_bus(app.config['EVENT_BUS_URL'])
+
+        if not event.contains(Session, 'after_commit', _publish_committed):
+            event.listen(Session, 'after_commit', _publish_committed)
+            event.listen(Session, 'after_rollback', _discard_pending)
+
+    @staticmethod
+    def stream(user_uuid, cursor=None):
+        """
+        Stream the journal entries of a user as Server-Sent Events.
+
+        Each change is sent as a ``change`` event whose id is its sequence
+        number, so a reconnecting EventSource resumes through Last-Event-ID.
+        The journal is read whenever the bus signals a commit and on every
+        heartbeat. A ``resync`` event is sent when the cursor is too old.
+        The stream ends after EVENTS_STREAM_TIMEOUT seconds so long-lived
+        connections don't pin a worker forever; clients simply reconnect.
+        With a timeout of 0 (sync workers) only the pending changes are sent
+        and the client is told to reconnect after EVENTS_POLL_SECONDS.
+
+        Args:
+            user_uuid (str): User UUID
+            cursor (int, optional): Last sequence number the client has seen
+                (None to start from the current head)
+
+        Yields:
+            str: SSE frames
+        """
+        config = current_app.config
+        heartbeat = config['EVENTS_HEARTBEAT_SECONDS']
+        page_size = config['CHANGES_MAX_PAGE_SIZE']
+        deadline = time.monotonic() + config['EVENTS_STREAM_TIMEOUT']
+        polling = config['EVENTS_STREAM_TIMEOUT'] <= 0
+
+        # Subscribe before the first read so no commit slips in between
+        subscription = None
+        if not polling:
+            subscription = current_app.extensions['event_bus'].subscribe(user_uuid)
+        try:
+            delay = config['EVENTS_POLL_SECONDS'] * 1000 if polling else RECONNECT_DELAY_MS
+            yield f'retry: {delay}\n\n'
+
+            while True:
+                changes, latest = ChangeService.changes_after(user_uuid, cursor, page_size)
+                if changes is None:
+                    changes = []
+                    yield (f'id: {latest}\nevent: resync\n'
+                           f'data: {json.dumps({"cursor": latest})}\n\n')
+                    cursor = latest
+                elif cursor is None:
+                    cursor = latest
+
+                for change in changes:
+                    cursor = change.seq
+                    yield (f'id: {change.seq}\nevent: change\n'
+                           f'data: {json.dumps(change.to_dict())}\n\n')
+
+                # Give the connection back to the pool while idle
+                db.session.close()
+
+                if len(changes) == page_size:
+                    continue
+                if polling or time.monotonic() >= deadline:
+                    break
+                if subscription.get(timeout=heartbeat) is None:
+                    yield ': heartbeat\n\n'
+        finally:
+            if subscription is not None:
+                subscription.close()
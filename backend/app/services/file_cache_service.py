@@ -0,0 +1,281 @@
+"""
+File cache service module.
+Keeps the contents of small, frequently downloaded files in memory.
+"""
+import hashlib
+import os
+import threading
+import time
+import uuid as uuid_lib
+from collections import OrderedDict
+from flask import current_app
+
+# Directory of a ``shm://`` cache given without a path
+DEFAULT_SHM_DIRECTORY = '/dev/shm/mdrive-file-cache'
+
+# A full shared cache is evicted down to this fraction of its budget, so
+# the directory is only scanned once every many inserts
+SHARED_CACHE_LOW_WATER = 0.9
+
+# Temporary files older than this (seconds) were left by a crashed worker
+SHARED_CACHE_TEMP_MAX_AGE = 300
+
+
+class LocalFileCache:
+    """In-process LRU of file contents, bounded by their total size."""
+
+    def __init__(self, max_bytes):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key):
+        """Return the cached contents, or None."""
+        with self._lock:
+            content = self._entries.get(key)
+            if content is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return content
+
+    def set(self, key, content):
+        """Store contents, evicting the least recently used files when full."""
+        if len(content) > self._max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = content
+            self._bytes += len(content)
+            while self._bytes > self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self._evictions += 1
+
+    def stats(self):
+        """Counters since the process started."""
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self._max_bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions
+            }
+
+
+class SharedFileCache:
+    """
+    Cache shared by the workers of one host, kept on a tmpfs (/dev/shm).
+
+    Each entry is one file named after the hash of its key, written to a
+    temporary name and renamed into place, so readers never see a partial
+    entry. Hits refresh the entry's mtime.
+
+    Each worker keeps an approximate size of the directory: the total
+    found by its last scan plus its own inserts since. Once that exceeds
+    ``max_bytes`` the directory is scanned and the entries with the oldest
+    mtime are evicted down to SHARED_CACHE_LOW_WATER of the budget, and
+    temporary files abandoned by crashed workers are removed. Inserts of
+    the other workers are only seen by the next scan, so the directory can
+    briefly overshoot the budget by up to the low-water slack per worker.
+    """
+
+    def __init__(self, directory, max_bytes):
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._bytes = sum(size for _, size, _ in self._entries())
+
+    def _path(self, key):
+        return os.path.join(self._directory, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as file:
+                content = file.read()
+            os.utime(path)
+        except FileNotFoundError:
+            content = None
+        with self._lock:
+            if content is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return content
+
+    def set(self, key, content):
+        if len(content) > self._max_bytes:
+            return
+        path = self._path(key)
+        temp_path = f'{path}.{uuid_lib.uuid4().hex}.tmp'
+        with open(temp_path, 'wb') as file:
+            file.write(content)
+        try:
+            # Re-setting a key replaces its entry: only count the difference
+            previous = os.stat(path).st_size
+        except FileNotFoundError:
+            previous = 0
+        os.replace(temp_path, path)
+        with self._lock:
+            self._bytes += len(content) - previous
+            full = self._bytes > self._max_bytes
+        if full:
+            self._evict()
+
+    def _entries(self, remove_stale_temps=False):
+        """(mtime, size, path) of every complete entry."""
+        entries = []
+        stale_before = time.time_ns() - SHARED_CACHE_TEMP_MAX_AGE * 1_000_000_000
+        with os.scandir(self._directory) as scan:
+            for entry in scan:
+                try:
+                    stat = entry.stat()
+                    if not entry.name.endswith('.tmp'):
+                        entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                    elif remove_stale_temps and stat.st_mtime_ns < stale_before:
+                        os.remove(entry.path)
+                except FileNotFoundError:
+                    continue
+        return entries
+
+    def _evict(self):
+        entries = self._entries(remove_stale_temps=True)
+        total = sum(size for _, size, _ in entries)
+        if total > self._max_bytes:
+            low_water = int(self._max_bytes * SHARED_CACHE_LOW_WATER)
+            for _, size, path in sorted(entries):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                else:
+                    with self._lock:
+                        self._evictions += 1
+                total -= size
+                if total <= low_water:
+                    break
+        with self._lock:
+            self._bytes = total
+
+    def stats(self):
+        """Hit counters of this worker; entries and size of the shared directory."""
+        entries = self._entries()
+        with self._lock:
+            return {
+                'backend': 'shm',
+                'entries': len(entries),
+                'bytes': sum(size for _, size, _ in entries),
+                'max_bytes': self._max_bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions
+            }
+
+
+def create_file_cache(url, max_bytes):
+    """
+    Build the file cache described by FILE_CACHE_URL.
+
+    Args:
+        url (str): ``memory://`` for an in-process LRU, ``none://`` to
+            disable caching, or ``shm://[directory]`` for a cache shared by
+            the workers of the host (default directory /dev/shm/mdrive-file-cache)
+        max_bytes (int): Total size of the cached contents
+
+    Returns:
+        LocalFileCache|SharedFileCache|None: The cache
+    """
+    if url.startswith('none://'):
+        return None
+    if url.startswith('memory://'):
+        return LocalFileCache(max_bytes)
+    if url.startswith('shm://'):
+        return SharedFileCache(url[len('shm://'):] or DEFAULT_SHM_DIRECTORY, max_bytes)
+    raise ValueError(f'Unsupported FILE_CACHE_URL: {url}')
+
+
+class FileCacheService:
+    """Service class for the small-file content cache."""
+
+    @staticmethod
+    def init_app(app):
+        """Create the application's file cache."""
+        app.extensions['file_cache'] = create_file_cache(
+            app.config['FILE_CACHE_URL'],
+            app.config['FILE_CACHE_MAX_BYTES']
+        )
+
+    @staticmethod
+    def read(full_path, stat):
+        """
+        Get the contents of a small file, from the cache when possible.
+
+        Entries are keyed by path, mtime and size, so a file rewritten in
+        place gets a new key and its old contents are never served; they
+        simply age out of the LRU.
+
+        Args:
+            full_path (str): Absolute path of the file
+            stat (os.stat_result): Its stat, taken by the caller
+
+        Returns:
+            bytes|None: The contents, or None when the cache is disabled or
+            the file is larger than FILE_CACHE_MAX_FILE_SIZE
+        """
+        cache = current_app.extensions.get('file_cache')
+        if cache is None or stat.st_size > current_app.config['FILE_CACHE_MAX_FILE_SIZE']:
+            return None
+
+        key = f'{full_path}:{stat.st_mtime_ns}:{stat.st_size}'
+        try:
+            content = cache.get(key)
+        except Exception as e:
+            current_app.logger.error(f"File cache read error: {str(e)}")
+            content = None
+        if content is not None:
+            return content
+
+        with open(full_path, 'rb') as file:
+            content = file.read()
+            current = os.fstat(file.fileno())
+        if (current.st_mtime_ns, current.st_size) != (stat.st_mtime_ns, stat.st_size):
+            # Rewritten since the caller's stat: let the caller stream it
+            return None
+
+        try:
+            cache.set(key, content)
+        except Exception as e:
+            current_app.logger.error(f"File cache write error: {str(e)}")
+        return content
+
+    @staticmethod
+    def get_stats():
+        """
+        Get file cache metrics.
+
+        Returns:
+            dict: Counters and hit rate of the cache
+        """
+        cache = current_app.extensions.get('file_cache')
+        if cache is None:
+            return {'backend': 'none'}
+
+        stats = cache.stats()
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else None
+        return stats
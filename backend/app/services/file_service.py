@@ -4,16 +4,87 @@ Handles file and folder operations with database persistence.
 """
 import os
 import io
+import base64
+import hashlib
+import json
+import tempfile
+import time
+import uuid as uuid_lib
 import zipfile
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
+from itertools import groupby
 from flask import current_app
+from sqlalchemy import and_, func, literal, or_, select, tuple_, update
 from werkzeug.utils import secure_filename
 from app import db
+from app.models.change import ChangeAction
 from app.models.file import File
+from app.models.job import Job, JobStatus
 from app.models.user import User
+from app.services.change_service import ChangeService
 from app.services.storage_service import StorageService
+from app.services.archive_service import ArchiveService, ArchiveError
+from app.services.job_service import JobService
+from app.services.search_service import SearchService
+from app.services.content_index_service import ContentIndexService
 from app.utils.validators import validate_filename, validate_file_size
-from app.utils.helpers import get_mime_type, get_file_icon
+from app.utils.zip_stream import StoredZip, ZipMember
+from app.utils.helpers import (get_mime_type, get_file_icon, get_mime_patterns,
+                               ensure_directory_exists)
+
+# Operations accepted by FileService.batch_operations
+BATCH_OPERATIONS = ('delete', 'restore', 'rename', 'permanent_delete')
+
+# Paths per IN (...) list when checking which paths are already taken
+EXISTENCE_CHUNK_SIZE = 500
+
+# Extracted members between two job progress updates
+EXTRACT_PROGRESS_INTERVAL = 100
+
+# Checksum throughput (bytes/s) assumed for the Retry-After of a stored ZIP
+# waiting on legacy CRC-32s
+CRC32_BACKFILL_RATE = 200 * 1024 * 1024
+
+# Rows fetched per round trip (and written per chunk) by the manifest stream
+MANIFEST_BATCH_SIZE = 1000
+
+# Listing sort keys and the File column each one orders by; every key has a
+# matching idx_list_<key> index (see File.__table_args__)
+LISTING_SORTS = {
+    'name': 'file_name',
+    'size': 'file_size',
+    'updated_at': 'updated_at',
+    'type': 'mime_type'
+}
+
+# Fields of File.to_dict and the column each one is read from; listings
+# select them as plain rows instead of ORM objects (see FileService._file_rows)
+FILE_FIELDS = {
+    'id': File.uuid,
+    'user_id': File.user_uuid,
+    'parent_folder_id': File.parent_folder_uuid,
+    'file_name': File.file_name,
+    'file_path': File.file_path,
+    'file_size': File.file_size,
+    'mime_type': File.mime_type,
+    'is_folder': File.is_folder,
+    'is_deleted': File.is_deleted,
+    'deleted_at': File.deleted_at,
+    'created_at': File.created_at,
+    'updated_at': File.updated_at
+}
+
+# Computed fields and the stored fields they are derived from
+DERIVED_FILE_FIELDS = {
+    'icon': ('mime_type', 'is_folder'),
+    'item_count': ('id', 'is_folder')
+}
+
+# Every field a listing row can carry (its default fieldset)
+LISTING_FIELDS = frozenset(FILE_FIELDS) | frozenset(DERIVED_FILE_FIELDS)
+
+# Fields accepted by FileService.get_file_info
+FILE_INFO_FIELDS = LISTING_FIELDS | {'breadcrumb'}
 
 
 class FileService:
@@ -32,22 +103,9 @@ class FileService:
         Returns:
             tuple: (success: bool, data: dict, status_code: int)
         """
-        # Validate filename
-        is_valid, sanitized_filename, error_msg = validate_filename(
-            file_object.filename,
-            current_app.config['ALLOWED_EXTENSIONS']
-        )
-
-        if not is_valid:
-            return False, {'error': error_msg}, 400
-
-        # Check file size (get approximate size from stream)
-        file_object.seek(0, os.SEEK_END)
-        file_size = file_object.tell()
-        file_object.seek(0)
+        sanitized_filename, file_size, error_msg = FileService._validate_upload(file_object)
 
-        is_valid, error_msg = validate_file_size(file_size, current_app.config['MAX_FILE_SIZE'])
-        if not is_valid:
+        if error_msg:
             return False, {'error': error_msg}, 400
 
         # Check storage quota
@@ -82,7 +140,7 @@ class FileService:
 
         try:
             # Save file to storage
-            success, message, actual_size = StorageService.save_file(
+            success, message, actual_size, crc32 = StorageService.save_file(
                 user.uuid,
                 file_object,
                 relative_path
@@ -102,7 +160,8 @@ class FileService:
                 file_size=actual_size,
                 mime_type=mime_type,
                 is_folder=False,
-                parent_folder_uuid=parent_folder_uuid
+                parent_folder_uuid=parent_folder_uuid,
+                crc32=crc32
             )
 
             db.session.add(file_entry)
@@ -110,8 +169,12 @@ class FileService:
             # Update user storage
             user.storage_used += actual_size
 
+            ChangeService.record(user.uuid, ChangeAction.CREATE, [file_entry])
+            SearchService.index_files(user.uuid, [file_entry])
             db.session.commit()
 
+            ContentIndexService.submit(user.uuid, [file_entry])
+
             return True, {
                 'message': 'File uploaded successfully',
                 'file': file_entry.to_dict()
@@ -125,56 +188,505 @@ class FileService:
             return False, {'error': 'Upload failed', 'details': str(e)}, 500
 
     @staticmethod
-    def get_files(user, parent_folder_uuid=None, page=1, per_page=50):
+    def upload_files(user, file_objects, parent_folder_uuid=None):
+        """
+        Upload many files into one folder with a single commit.
+
+        Every file is validated before anything is written; the accepted
+        ones are then written concurrently, inserted with one bulk INSERT
+        and charged to the quota with one UPDATE.
+
+        Args:
+            user (User): User object
+            file_objects (list): File objects from request
+            parent_folder_uuid (str, optional): Parent folder UUID
+
+        Returns:
+            tuple: (success: bool, data: dict, status_code: int)
+        """
+        if not file_objects:
+            return False, {'error': 'No file provided'}, 400
+
+        parent_folder, error = FileService._get_target_folder(user, parent_folder_uuid)
+        if error:
+            return False, {'error': 'Parent folder not found'}, 404
+
+        parent_uuid = parent_folder.uuid if parent_folder else None
+        results = []
+        accepted = []
+        for index, file_object in enumerate(file_objects):
+            result = {'index': index, 'file_name': file_object.filename}
+            results.append(result)
+
+            sanitized_filename, file_size, error_msg = FileService._validate_upload(file_object)
+            if error_msg:
+                result.update(success=False, status=400, error=error_msg)
+                continue
+
+            relative_path = FileService._join_path(parent_folder, sanitized_filename)
+            accepted.append((result, file_object, sanitized_filename, relative_path,
+                             parent_uuid, file_size))
+
+        # One existence query for the whole selection
+        existing = FileService._existing_paths(user, [item[3] for item in accepted])
+        pending = FileService._admit_uploads(user, accepted, existing)
+
+        error, rows = FileService._store_uploads(user, pending)
+        if error:
+            return False, error, 500
+
+        return True, {
+            'message': f'{len(rows)} of {len(results)} file(s) uploaded',
+            'results': results
+        }, 200
+
+    @staticmethod
+    def upload_tree(user, file_objects, relative_paths, folder_paths=None,
+                    parent_folder_uuid=None):
+        """
+        Upload a directory tree, creating missing folders with ``mkdir -p``
+        semantics.
+
+        All folder and file paths are checked against the database with one
+        prefetch; missing folders are resolved in memory and inserted in bulk
+        together with the files, in a single commit.
+
+        Args:
+            user (User): User object
+            file_objects (list): File objects from request
+            relative_paths (list): Path of each file relative to the parent
+                folder, e.g. ``a/b/c/file.txt``
+            folder_paths (list, optional): Extra (possibly empty) folders to create
+            parent_folder_uuid (str, optional): Folder the tree is uploaded into
+
+        Returns:
+            tuple: (success: bool, data: dict, status_code: int)
+        """
+        if not file_objects and not folder_paths:
+            return False, {'error': 'No file provided'}, 400
+
+        if len(relative_paths) != len(file_objects):
+            return False, {'error': 'Expected one path per file'}, 400
+
+        parent_folder, error = FileService._get_target_folder(user, parent_folder_uuid)
+        if error:
+            return False, {'error': 'Parent folder not found'}, 404
+
+        # Validate every path up front
+        results = []
+        entries = []
+        wanted_folders = set()
+        for index, (file_object, path) in enumerate(zip(file_objects, relative_paths)):
+            result = {'index': index, 'path': path}
+            results.append(result)
+
+            parts, error_msg = FileService._split_tree_path(path)
+            if not error_msg:
+                file_object.filename = parts[-1]
+                sanitized_filename, file_size, error_msg = FileService._validate_upload(file_object)
+            if error_msg:
+                result.update(success=False, status=400, error=error_msg)
+                continue
+
+            folders = ['/'.join(parts[:depth]) for depth in range(1, len(parts))]
+            wanted_folders.update(folders)
+            entries.append((result, file_object, sanitized_filename,
+                            folders[-1] if folders else '', file_size))
+
+        folder_errors = []
+        for path in folder_paths or []:
+            parts, error_msg = FileService._split_tree_path(path, is_folder=True)
+            if error_msg:
+                folder_errors.append({'path': path, 'error': error_msg})
+                continue
+            wanted_folders.update('/'.join(parts[:depth]) for depth in range(1, len(parts) + 1))
+
+        base = parent_folder.file_path if parent_folder else ''
+        full_file_paths = [os.path.join(base, entry[3], entry[2]) for entry in entries]
+        folder_uuids, blocked, new_folders, existing = FileService._plan_folders(
+            user, parent_folder, wanted_folders, full_file_paths)
+
+        accepted = []
+        for entry, full_path in zip(entries, full_file_paths):
+            result, file_object, sanitized_filename, folder, file_size = entry
+            if folder in blocked:
+                result.update(success=False, status=409,
+                              error='Folder path conflicts with an existing item')
+                continue
+            accepted.append((result, file_object, sanitized_filename, full_path,
+                             folder_uuids[folder], file_size))
+
+        pending = FileService._admit_uploads(user, accepted, existing)
+
+        FileService._make_folders(user, new_folders)
+        error, rows = FileService._store_uploads(user, pending, new_folders)
+        if error:
+            return False, error, 500
+
+        return True, {
+            'message': f'{len(rows)} of {len(results)} file(s) uploaded',
+            'folders_created': len(new_folders),
+            'results': results,
+            'folder_errors': folder_errors
+        }, 200
+
+    @staticmethod
+    def _plan_folders(user, parent_folder, wanted_folders, file_paths=()):
+        """
+        Resolve the folders of an uploaded tree against the database with a
+        single prefetch.
+
+        Args:
+            user (User): User object
+            parent_folder (File|None): Folder the tree is placed into
+            wanted_folders (set): Folder paths relative to ``parent_folder``,
+                including every ancestor
+            file_paths (list): Full storage paths of the files, prefetched
+                together with the folders
+
+        Returns:
+            tuple: (folder_uuids: dict, blocked: set, new_folders: list[File],
+            existing: dict) where ``folder_uuids`` maps each usable relative
+            folder path to its UUID and ``blocked`` holds the paths taken by a
+            file or a trashed item
+        """
+        base = parent_folder.file_path if parent_folder else ''
+        full_folder_paths = {folder: os.path.join(base, folder) for folder in wanted_folders}
+        existing = FileService._existing_paths(
+            user, list(full_folder_paths.values()) + list(file_paths))
+
+        # Resolve every folder in memory, shallowest first
+        folder_uuids = {'': parent_folder.uuid if parent_folder else None}
+        blocked = set()
+        new_folders = []
+        now = datetime.utcnow()
+        for folder in sorted(wanted_folders, key=lambda path: path.count('/')):
+            parent = os.path.dirname(folder)
+            full_path = full_folder_paths[folder]
+            row = existing.get(full_path)
+
+            if parent in blocked or (row and (not row.is_folder or row.is_deleted)):
+                blocked.add(folder)
+            elif row:
+                folder_uuids[folder] = row.uuid
+            else:
+                entry = File(
+                    user_uuid=user.uuid,
+                    file_name=os.path.basename(folder),
+                    file_path=full_path,
+                    is_folder=True,
+                    parent_folder_uuid=folder_uuids[parent]
+                )
+                entry.uuid = str(uuid_lib.uuid4())
+                entry.is_deleted = False
+                entry.created_at = now
+                entry.updated_at = now
+                folder_uuids[folder] = entry.uuid
+                new_folders.append(entry)
+
+        return folder_uuids, blocked, new_folders, existing
+
+    @staticmethod
+    def _make_folders(user, new_folders):
+        """Create planned folders on disk; ``mkdir -p`` of the leaves covers the rest."""
+        parents = {os.path.dirname(folder.file_path) for folder in new_folders}
+        for folder in new_folders:
+            if folder.file_path not in parents:
+                ensure_directory_exists(StorageService.get_full_path(user.uuid, folder.file_path))
+
+    @staticmethod
+    def _split_tree_path(path, is_folder=False):
+        """
+        Split and validate a relative upload path.
+
+        Returns:
+            tuple: (parts: list, error_message: str|None)
+        """
+        if not isinstance(path, str):
+            return None, 'Invalid path'
+
+        parts = [part for part in path.replace('\\', '/').split('/') if part and part != '.']
+        if not parts:
+            return None, 'Invalid path'
+
+        sanitized = []
+        for index, part in enumerate(parts):
+            if is_folder or index < len(parts) - 1:
+                is_valid, name, error_msg = validate_filename(part)
+                if not is_valid:
+                    return None, error_msg
+                part = name
+            sanitized.append(part)
+
+        return sanitized, None
+
+    @staticmethod
+    def _existing_paths(user, paths):
+        """
+        Look up which storage paths are already taken, in chunked IN queries.
+
+        Returns:
+            dict: file_path -> row with uuid, is_folder and is_deleted
+        """
+        existing = {}
+        paths = list(set(paths))
+        for start in range(0, len(paths), EXISTENCE_CHUNK_SIZE):
+            for row in db.session.query(
+                File.file_path, File.uuid, File.is_folder, File.is_deleted
+            ).filter(
+                File.user_uuid == user.uuid,
+                File.file_path.in_(paths[start:start + EXISTENCE_CHUNK_SIZE])
+            ).all():
+                existing[row.file_path] = row
+        return existing
+
+    @staticmethod
+    def _admit_uploads(user, accepted, existing):
+        """
+        Reject uploads whose path is taken or that don't fit in the quota.
+
+        Args:
+            accepted (list): (result, file_object, file_name, relative_path,
+                parent_folder_uuid, file_size) tuples
+            existing (dict): Output of _existing_paths
+
+        Returns:
+            list: Admitted items, without the size
+        """
+        available = user.storage_quota - user.storage_used
+        pending = []
+        paths = set()
+        for result, file_object, file_name, relative_path, parent_uuid, file_size in accepted:
+            if relative_path in existing or relative_path in paths:
+                result.update(success=False, status=409, error='File already exists')
+            elif file_size > available:
+                result.update(success=False, status=403, error='Storage quota exceeded')
+            else:
+                available -= file_size
+                paths.add(relative_path)
+                pending.append((result, file_object, file_name, relative_path, parent_uuid))
+        return pending
+
+    @staticmethod
+    def _store_uploads(user, pending, new_folders=()):
+        """
+        Write admitted uploads concurrently, then insert their rows (and any
+        new folder rows) in bulk and charge the quota with one UPDATE.
+
+        Returns:
+            tuple: (error: dict|None, rows: list[File])
+        """
+        saved = StorageService.save_files(
+            user.uuid, [(item[1], item[3]) for item in pending])
+
+        rows = []
+        for (result, _, file_name, relative_path, parent_uuid), \
+                (success, message, actual_size, crc32) in zip(pending, saved):
+            if not success:
+                result.update(success=False, status=500, error=message)
+                continue
+
+            file_entry = FileService._new_file_row(
+                user, file_name, relative_path, actual_size, parent_uuid, crc32)
+            rows.append(file_entry)
+            result.update(success=True, status=201, file=file_entry)
+
+        try:
+            FileService._insert_tree(user, new_folders, rows)
+
+        except Exception as e:
+            db.session.rollback()
+            for row in rows:
+                StorageService.delete_file(user.uuid, row.file_path)
+            for folder in new_folders:
+                StorageService.delete_file(user.uuid, folder.file_path)
+            current_app.logger.error(f"Multi-file upload error: {str(e)}")
+            return {'error': 'Upload failed', 'details': str(e)}, []
+
+        for item in pending:
+            result = item[0]
+            if 'file' in result:
+                result['file'] = result['file'].to_dict()
+
+        return None, rows
+
+    @staticmethod
+    def _new_file_row(user, file_name, relative_path, file_size, parent_uuid, crc32=None):
+        """Build a fully populated File row ready for bulk insertion."""
+        now = datetime.utcnow()
+        file_entry = File(
+            user_uuid=user.uuid,
+            file_name=file_name,
+            file_path=relative_path,
+            file_size=file_size,
+            mime_type=get_mime_type(file_name),
+            is_folder=False,
+            parent_folder_uuid=parent_uuid,
+            crc32=crc32
+        )
+        file_entry.uuid = str(uuid_lib.uuid4())
+        file_entry.is_deleted = False
+        file_entry.created_at = now
+        file_entry.updated_at = now
+        return file_entry
+
+    @staticmethod
+    def _insert_tree(user, new_folders, rows):
+        """
+        Insert new folder and file rows in bulk, charge their size to the
+        quota with one UPDATE and commit.
+        """
+        if not rows and not new_folders:
+            return
+
+        db.session.bulk_save_objects(list(new_folders) + list(rows))
+        User.query.filter_by(uuid=user.uuid).update({
+            'storage_used': User.storage_used + sum(row.file_size for row in rows)
+        })
+        ChangeService.record(user.uuid, ChangeAction.CREATE, list(new_folders) + list(rows))
+        SearchService.index_files(user.uuid, list(new_folders) + list(rows))
+        db.session.commit()
+
+        ContentIndexService.submit(user.uuid, rows)
+
+    @staticmethod
+    def _validate_upload(file_object):
+        """
+        Validate the name and size of an uploaded file.
+
+        Returns:
+            tuple: (sanitized_filename: str, file_size: int, error_message: str|None)
+        """
+        # Validate filename
+        is_valid, sanitized_filename, error_msg = validate_filename(
+            file_object.filename,
+            current_app.config['ALLOWED_EXTENSIONS']
+        )
+
+        if not is_valid:
+            return None, 0, error_msg
+
+        # Check file size (get approximate size from stream)
+        file_object.seek(0, os.SEEK_END)
+        file_size = file_object.tell()
+        file_object.seek(0)
+
+        is_valid, error_msg = validate_file_size(file_size, current_app.config['MAX_FILE_SIZE'])
+        if not is_valid:
+            return None, 0, error_msg
+
+        return sanitized_filename, file_size, None
+
+    @staticmethod
+    def listing_etag(user, *params):
+        """
+        Weak ETag of a listing of the user's drive.
+
+        Derived from the journal head (``User.change_seq``), which every
+        mutation bumps, and the parameters shaping the listing, so checking
+        it costs no query beyond loading the user.
+
+        Args:
+            user (User): User object
+            *params: Query parameters of the listing
+
+        Returns:
+            str: ETag value (without the W/ prefix and quotes)
+        """
+        key = '\x1f'.join([user.uuid] + [str(param) for param in params])
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        return f'{user.change_seq or 0}-{digest}'
+
+    @staticmethod
+    def get_files(user, parent_folder_uuid=None, page=1, per_page=50, sort='name',
+                  order='asc', mime_family=None, min_size=None, max_size=None,
+                  modified_after=None, modified_before=None, fields=None):
         """
         Get files and folders for a user.
 
+        Folders come first, then files, each sorted on the requested column
+        with the file name as tie-breaker. The two groups are paged with
+        separate queries so each one is a range scan of an
+        ``idx_list_<sort>`` index, in either direction.
+
         Args:
             user (User): User object
             parent_folder_uuid (str, optional): Parent folder UUID (None for root)
             page (int): Page number
             per_page (int): Items per page
+            sort (str): 'name', 'size', 'updated_at' or 'type'
+            order (str): 'asc' or 'desc'
+            mime_family (str, optional): Only files of this family (e.g. 'image')
+            min_size (int, optional): Minimum file size in bytes
+            max_size (int, optional): Maximum file size in bytes
+            modified_after (str, optional): ISO date/datetime lower bound
+            modified_before (str, optional): ISO date/datetime upper bound
+            fields (set, optional): Fields of each entry (default: LISTING_FIELDS)
 
         Returns:
             tuple: (success: bool, data: dict, status_code: int)
         """
+        if sort not in LISTING_SORTS:
+            return False, {'error': f"sort must be one of: {', '.join(LISTING_SORTS)}"}, 400
+        if order not in ('asc', 'desc'):
+            return False, {'error': 'order must be asc or desc'}, 400
+
+        filters, files_only, error = FileService._listing_filters(
+            mime_family, min_size, max_size, modified_after, modified_before)
+        if error:
+            return False, {'error': error}, 400
+
         try:
-            query = File.query.filter_by(
-                user_uuid=user.uuid,
-                parent_folder_uuid=parent_folder_uuid
-            ).filter(
-                File.is_deleted == False
-            ).order_by(File.is_folder.desc(), File.file_name)
+            conditions = (
+                File.user_uuid == user.uuid,
+                File.parent_folder_uuid.is_(None) if parent_folder_uuid is None
+                else File.parent_folder_uuid == parent_folder_uuid,
+                File.is_deleted == False,
+                *filters
+            )
+
+            column = getattr(File, LISTING_SORTS[sort])
+            if order == 'desc':
+                ordering = (column.desc(), File.file_name.desc())
+            else:
+                ordering = (column, File.file_name)
 
-            pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+            def count(is_folder):
+                return db.session.execute(select(func.count()).select_from(File).where(
+                    *conditions, File.is_folder == is_folder)).scalar()
 
-            files = []
-            for file in pagination.items:
-                file_data = {
-                    **file.to_dict(),
-                    'icon': get_file_icon(file.mime_type, file.is_folder)
-                }
-                if file.is_folder:
-                    file_data['item_count'] = file.children.filter(
-                        File.is_deleted == False
-                    ).count()
-                files.append(file_data)
+            def segment(is_folder, offset, limit):
+                return db.session.execute(select(*columns).where(
+                    *conditions, File.is_folder == is_folder
+                ).order_by(*ordering).offset(offset).limit(limit)).all()
+
+            fields = fields or LISTING_FIELDS
+            columns = FileService._file_columns(fields)
+            folder_count = 0 if files_only else count(True)
+            total = folder_count + count(False)
+
+            start = (page - 1) * per_page
+            rows = []
+            if start < folder_count:
+                rows = segment(True, start, per_page)
+            if len(rows) < per_page:
+                rows += segment(False, max(0, start - folder_count), per_page - len(rows))
+
+            files = FileService._file_rows(user, rows, fields, live_children=True)
 
             # Get breadcrumb if in a folder
             breadcrumb = []
             if parent_folder_uuid:
-                folder = File.query.get(parent_folder_uuid)
-                if folder:
-                    breadcrumb = folder.get_breadcrumb()
+                breadcrumb = FileService._breadcrumbs(user, [parent_folder_uuid])[parent_folder_uuid]
 
             return True, {
                 'files': files,
                 'breadcrumb': breadcrumb,
                 'pagination': {
-                    'page': pagination.page,
-                    'per_page': pagination.per_page,
-                    'total': pagination.total,
-                    'pages': pagination.pages
+                    'page': page,
+                    'per_page': per_page,
+                    'total': total,
+                    'pages': -(-total // per_page)
                 }
             }, 200
 
@@ -182,6 +694,253 @@ class FileService:
             current_app.logger.error(f"Get files error: {str(e)}")
             return False, {'error': 'Failed to retrieve files', 'details': str(e)}, 500
 
+    @staticmethod
+    def _listing_filters(mime_family, min_size, max_size, modified_after, modified_before):
+        """
+        Build the WHERE clauses of listing filters.
+
+        Type and size filters only make sense for files, so they leave
+        folders out of the listing.
+
+        Returns:
+            tuple: (clauses: list, files_only: bool, error: str|None)
+        """
+        clauses = []
+        files_only = False
+
+        if mime_family:
+            patterns = get_mime_patterns(mime_family)
+            if not patterns:
+                return [], False, f'Unknown file type: {mime_family}'
+            clauses.append(or_(*[File.mime_type.like(pattern + '%') for pattern in patterns]))
+            files_only = True
+
+        if min_size is not None or max_size is not None:
+            if (min_size or 0) < 0 or (max_size is not None and max_size < (min_size or 0)):
+                return [], False, 'Invalid size range'
+            if min_size is not None:
+                clauses.append(File.file_size >= min_size)
+            if max_size is not None:
+                clauses.append(File.file_size <= max_size)
+            files_only = True
+
+        for value, is_upper in ((modified_after, False), (modified_before, True)):
+            if not value:
+                continue
+            try:
+                moment = datetime.fromisoformat(value)
+            except ValueError:
+                return [], False, f'Invalid date: {value}'
+            if moment.tzinfo is not None:
+                # updated_at is stored as naive UTC
+                moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+            if not is_upper:
+                clauses.append(File.updated_at >= moment)
+            elif FileService._is_date_only(value):
+                # A bare date includes that whole day
+                clauses.append(File.updated_at < moment + timedelta(days=1))
+            else:
+                clauses.append(File.updated_at <= moment)
+
+        return clauses, files_only, None
+
+    @staticmethod
+    def _is_date_only(value):
+        """Whether an ISO 8601 string is a date without a time."""
+        try:
+            date.fromisoformat(value)
+        except ValueError:
+            return False
+        return True
+
+    @staticmethod
+    def get_recent_files(user, limit=50, cursor=None):
+        """
+        Get the user's most recently modified files across all folders.
+
+        Args:
+            user (User): User object
+            limit (int): Page size
+            cursor (str, optional): ``next_cursor`` of the previous page
+
+        Returns:
+            tuple: (success: bool, data: dict, status_code: int)
+        """
+        return FileService._drive_view(user, File.updated_at, limit, cursor)
+
+    @staticmethod
+    def get_largest_files(user, limit=50, cursor=None):
+        """
+        Get the user's largest files across all folders.
+
+        Args:
+            user (User): User object
+            limit (int): Page size
+            cursor (str, optional): ``next_cursor`` of the previous page
+
+        Returns:
+            tuple: (success: bool, data: dict, status_code: int)
+        """
+        return FileService._drive_view(user, File.file_size, limit, cursor)
+
+    @staticmethod
+    def _drive_view(user, column, limit, cursor):
+        """
+        Page live files by ``column`` descending, then uuid descending.
+
+        The walk is a backward range scan of idx_user_deleted_<column>, whose
+        trailing uuid makes the tie-break part of the index order; pages
+        resume from a keyset cursor, so deep pages cost the same as the
+        first one and no folder tree is walked.
+        """
+        is_date = column is File.updated_at
+        after = None
+        if cursor:
+            try:
+                value, uuid_after = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+                after = (datetime.fromisoformat(value) if is_date else int(value), uuid_after)
+            except (ValueError, TypeError):
+                return False, {'error': 'Invalid cursor'}, 400
+
+        try:
+            statement = select(*FileService._file_columns(LISTING_FIELDS)).where(
+                File.user_uuid == user.uuid,
+                File.is_deleted == False,
+                File.is_folder == False
+            )
+            if after:
+                statement = statement.where(tuple_(column, File.uuid) < tuple_(*after))
+            rows = db.session.execute(
+                statement.order_by(column.desc(), File.uuid.desc()).limit(limit + 1)
+            ).all()
+
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+
+            next_cursor = None
+            if has_more:
+                last = rows[-1]
+                value = last.updated_at.isoformat() if is_date else last.file_size
+                next_cursor = base64.urlsafe_b64encode(
+                    json.dumps([value, last.id]).encode('utf-8')).decode('ascii')
+
+            return True, {
+                'files': FileService._file_rows(user, rows, LISTING_FIELDS),
+                'next_cursor': next_cursor
+            }, 200
+
+        except Exception as e:
+            current_app.logger.error(f"Drive view error: {str(e)}")
+            return False, {'error': 'Failed to retrieve files', 'details': str(e)}, 500
+
+    @staticmethod
+    def _file_columns(fields):
+        """
+        Columns to select for a fieldset, labelled with their field names.
+
+        Args:
+            fields (set): Requested fields (see FILE_FIELDS and DERIVED_FILE_FIELDS)
+
+        Returns:
+            list: Labelled columns, including those derived fields depend on
+        """
+        needed = set(fields)
+        for name in fields & DERIVED_FILE_FIELDS.keys():
+            needed.update(DERIVED_FILE_FIELDS[name])
+        return [column.label(name) for name, column in FILE_FIELDS.items() if name in needed]
+
+    @staticmethod
+    def _file_rows(user, rows, fields, live_children=True):
+        """
+        Serialize rows selected with _file_columns the way File.to_dict does.
+
+        Folders get an ``item_count`` when requested; children of every
+        folder on the page are counted with one grouped query rather than
+        one query per folder.
+
+        Args:
+            user (User): Owner of the rows
+            rows (list): Rows selected with ``_file_columns(fields)``
+            fields (set): Requested fields
+            live_children (bool): Count only children that are not in the trash
+
+        Returns:
+            list: One dict per row, holding exactly the requested fields
+        """
+        files = []
+        for row in rows:
+            data = row._asdict()
+            for name in ('deleted_at', 'created_at', 'updated_at'):
+                if data.get(name):
+                    data[name] = data[name].isoformat()
+            if 'icon' in fields:
+                data['icon'] = get_file_icon(data['mime_type'], data['is_folder'])
+            files.append(data)
+
+        folder_uuids = [file['id'] for file in files if file.get('is_folder')]
+        if 'item_count' in fields and folder_uuids:
+            statement = select(File.parent_folder_uuid, func.count()).where(
+                File.user_uuid == user.uuid,
+                File.parent_folder_uuid.in_(folder_uuids)
+            ).group_by(File.parent_folder_uuid)
+            if live_children:
+                statement = statement.where(File.is_deleted == False)
+            counts = dict(db.session.execute(statement).all())
+            for file in files:
+                if file['is_folder']:
+                    file['item_count'] = counts.get(file['id'], 0)
+
+        # Drop the columns only selected to derive other fields
+        hidden = set(rows[0]._fields).difference(fields) if rows else ()
+        for file in files:
+            for name in hidden:
+                del file[name]
+        return files
+
+    @staticmethod
+    def iter_manifest(user):
+        """
+        Stream every live entry of the drive as NDJSON.
+
+        The first line holds the change-journal cursor the listing is
+        consistent with; every following line is one entry, in no particular
+        order. Rows come from a single server-side cursor as plain tuples,
+        so memory use does not depend on the size of the drive.
+
+        Args:
+            user (User): User object
+
+        Yields:
+            str: Chunks of newline-terminated JSON lines
+        """
+        yield json.dumps({'cursor': ChangeService.latest_seq(user.uuid)}) + '\n'
+
+        statement = select(
+            File.uuid, File.parent_folder_uuid, File.file_name,
+            File.file_size, File.updated_at, File.is_folder
+        ).where(
+            File.user_uuid == user.uuid,
+            File.is_deleted == False
+        ).execution_options(yield_per=MANIFEST_BATCH_SIZE)
+
+        result = db.session.execute(statement)
+        try:
+            for batch in result.partitions():
+                yield ''.join(
+                    json.dumps({
+                        'id': file_uuid,
+                        'parent_id': parent_uuid,
+                        'name': file_name,
+                        'size': file_size or 0,
+                        'mtime': updated_at.isoformat() if updated_at else None,
+                        'is_folder': bool(is_folder)
+                    }, separators=(',', ':')) + '\n'
+                    for file_uuid, parent_uuid, file_name, file_size, updated_at, is_folder
+                    in batch
+                )
+        finally:
+            result.close()
+
     @staticmethod
     def get_file_by_uuid(user, file_uuid):
         """
@@ -199,7 +958,141 @@ class FileService:
         if not file:
             return False, {'error': 'File not found'}, 404
 
-        return True, file, 200
+        return True, file, 200
+
+    @staticmethod
+    def get_file_info(user, file_uuid, fields=None):
+        """
+        Get a file or folder with its breadcrumb.
+
+        Args:
+            user (User): User object
+            file_uuid (str): File UUID
+            fields (set, optional): Fields to return (see FILE_INFO_FIELDS);
+                by default every File.to_dict field plus the breadcrumb, which
+                is otherwise only built when 'breadcrumb' is requested
+
+        Returns:
+            tuple: (success: bool, data: dict, status_code: int)
+        """
+        if fields is None:
+            fields = set(FILE_FIELDS) | {'breadcrumb'}
+        file_fields = fields - {'breadcrumb'}
+
+        try:
+            query_fields = file_fields | {'id'} if 'breadcrumb' in fields else file_fields
+            row = db.session.execute(
+                select(*FileService._file_columns(query_fields or {'id'})).where(
+                    File.uuid == file_uuid,
+                    File.user_uuid == user.uuid
+                )
+            ).first()
+            if not row:
+                return False, {'error': 'File not found'}, 404
+
+            data = {'file': FileService._file_rows(user, [row], file_fields)[0]}
+            if 'breadcrumb' in fields:
+                data['breadcrumb'] = FileService._breadcrumbs(user, [row.id])[row.id]
+            return True, data, 200
+
+        except Exception as e:
+            current_app.logger.error(f"Get file info error: {str(e)}")
+            return False, {'error': 'Failed to retrieve file', 'details': str(e)}, 500
+
+    @staticmethod
+    def lookup_files(user, file_uuids, fields=None, include_breadcrumbs=False):
+        """
+        Get several files and folders at once.
+
+        The rows come from one ``IN`` query; breadcrumbs, when requested,
+        are assembled from one recursive query fetching the ancestors of
+        every item together, so shared parents are read once.
+
+        Args:
+            user (User): User object
+            file_uuids (list): UUIDs to resolve
+            fields (set, optional): Fields of each entry (default: LISTING_FIELDS)
+            include_breadcrumbs (bool): Add a ``breadcrumb`` to each entry
+
+        Returns:
+            tuple: (success: bool, data: dict, status_code: int)
+        """
+        fields = set(fields or LISTING_FIELDS)
+        requested = list(dict.fromkeys(file_uuids))
+
+        try:
+            rows = db.session.execute(
+                select(*FileService._file_columns(fields | {'id'})).where(
+                    File.user_uuid == user.uuid,
+                    File.uuid.in_(requested)
+                )
+            ).all()
+            by_uuid = {row.id: row for row in rows}
+
+            breadcrumbs = {}
+            if include_breadcrumbs and rows:
+                breadcrumbs = FileService._breadcrumbs(user, [row.id for row in rows])
+
+            found = [by_uuid[file_uuid] for file_uuid in requested if file_uuid in by_uuid]
+            files = FileService._file_rows(user, found, fields)
+            if include_breadcrumbs:
+                for row, file_data in zip(found, files):
+                    file_data['breadcrumb'] = breadcrumbs[row.id]
+
+            return True, {
+                'files': files,
+                'missing': [file_uuid for file_uuid in requested if file_uuid not in by_uuid]
+            }, 200
+
+        except Exception as e:
+            current_app.logger.error(f"Lookup error: {str(e)}")
+            return False, {'error': 'Lookup failed', 'details': str(e)}, 500
+
+    @staticmethod
+    def _breadcrumbs(user, file_uuids):
+        """
+        Breadcrumbs (as File.get_breadcrumb builds them) of several items.
+
+        Args:
+            user (User): Owner of the items
+            file_uuids (list): UUIDs of the items; those the user doesn't
+                own get an empty breadcrumb
+
+        Returns:
+            dict: uuid -> breadcrumb list, from the root to the item itself
+        """
+        columns = (File.uuid, File.file_name, File.is_folder, File.parent_folder_uuid)
+        ancestors = select(*columns).where(
+            File.user_uuid == user.uuid,
+            File.uuid.in_(set(file_uuids))
+        ).cte('ancestors', recursive=True)
+        ancestors = ancestors.union(
+            select(*columns).join(ancestors, File.uuid == ancestors.c.parent_folder_uuid)
+        )
+        nodes = {
+            node.uuid: node for node in db.session.execute(select(ancestors)).all()
+        }
+
+        # Walked iteratively, as trees can be deeper than the recursion limit.
+        # Only the breadcrumbs of requested rows are kept: memoising every
+        # ancestor's would cost memory quadratic in the depth. A walk stops
+        # at the first ancestor already resolved, reusing its breadcrumb.
+        breadcrumbs = {}
+        for item_uuid in file_uuids:
+            if item_uuid in breadcrumbs:
+                continue
+            chain = []
+            seen = set()
+            file_uuid = item_uuid
+            while file_uuid in nodes and file_uuid not in breadcrumbs and file_uuid not in seen:
+                seen.add(file_uuid)
+                node = nodes[file_uuid]
+                chain.append({'id': node.uuid, 'name': node.file_name, 'is_folder': node.is_folder})
+                file_uuid = node.parent_folder_uuid
+            chain.reverse()
+            breadcrumbs[item_uuid] = breadcrumbs.get(file_uuid, []) + chain
+
+        return {item_uuid: breadcrumbs[item_uuid] for item_uuid in file_uuids}
 
     @staticmethod
     def delete_file(user, file_uuid):
@@ -215,7 +1108,7 @@ class FileService:
             if file.is_deleted:
                 return FileService.permanently_delete(user, file_uuid)
 
-            FileService._soft_delete_recursive(file)
+            FileService._soft_delete_many(user, [file])
             db.session.commit()
             return True, {'message': 'File moved to Recycle Bin'}, 200
 
@@ -224,36 +1117,6 @@ class FileService:
             current_app.logger.error(f"File delete error: {str(e)}")
             return False, {'error': 'Delete failed', 'details': str(e)}, 500
 
-    @staticmethod
-    def _soft_delete_recursive(file):
-        """Mark a file/folder and all its descendants as deleted."""
-        now = datetime.utcnow()
-        file.is_deleted = True
-        file.deleted_at = now
-        file.original_parent_folder_uuid = file.parent_folder_uuid
-        file.parent_folder_uuid = None
-        if file.is_folder:
-            for child in File.query.filter_by(
-                    parent_folder_uuid=file.uuid, user_uuid=file.user_uuid,
-                    is_deleted=False).all():
-                child.is_deleted = True
-                child.deleted_at = now
-                child.original_parent_folder_uuid = child.parent_folder_uuid
-                if child.is_folder:
-                    FileService._soft_delete_children(child, now)
-
-    @staticmethod
-    def _soft_delete_children(folder, now):
-        """Recursively mark children as deleted."""
-        for child in File.query.filter_by(
-                parent_folder_uuid=folder.uuid, user_uuid=folder.user_uuid,
-                is_deleted=False).all():
-            child.is_deleted = True
-            child.deleted_at = now
-            child.original_parent_folder_uuid = child.parent_folder_uuid
-            if child.is_folder:
-                FileService._soft_delete_children(child, now)
-
     @staticmethod
     def permanently_delete(user, file_uuid):
         """Permanently delete a file from storage and database."""
@@ -261,11 +1124,10 @@ class FileService:
         if not file:
             return False, {'error': 'File not found'}, 404
         try:
-            total_size = FileService._calculate_size_recursive(file)
-            StorageService.delete_file(user.uuid, file.file_path)
-            db.session.delete(file)
-            user.storage_used = max(0, user.storage_used - total_size)
+            paths = FileService._purge_many(user, [file])
             db.session.commit()
+            for path in paths:
+                StorageService.delete_file(user.uuid, path)
             return True, {'message': 'File permanently deleted'}, 200
         except Exception as e:
             db.session.rollback()
@@ -273,33 +1135,29 @@ class FileService:
             return False, {'error': 'Delete failed', 'details': str(e)}, 500
 
     @staticmethod
-    def get_trash(user, page=1, per_page=50):
+    def get_trash(user, page=1, per_page=50, fields=None):
         """Get files in the Recycle Bin (top-level deleted items only)."""
+        fields = fields or LISTING_FIELDS
         try:
-            query = File.query.filter_by(
-                user_uuid=user.uuid, is_deleted=True
-            ).filter(
+            conditions = (
+                File.user_uuid == user.uuid,
+                File.is_deleted == True,
                 File.parent_folder_uuid.is_(None)
-            ).order_by(File.deleted_at.desc())
-
-            pagination = query.paginate(page=page, per_page=per_page, error_out=False)
-            files = []
-            for file in pagination.items:
-                file_data = {
-                    **file.to_dict(),
-                    'icon': get_file_icon(file.mime_type, file.is_folder)
-                }
-                if file.is_folder:
-                    file_data['item_count'] = file.children.count()
-                files.append(file_data)
+            )
+            total = db.session.execute(
+                select(func.count()).select_from(File).where(*conditions)).scalar()
+            rows = db.session.execute(
+                select(*FileService._file_columns(fields)).where(*conditions).order_by(
+                    File.deleted_at.desc()).offset((page - 1) * per_page).limit(per_page)
+            ).all()
 
             return True, {
-                'files': files,
+                'files': FileService._file_rows(user, rows, fields, live_children=False),
                 'pagination': {
-                    'page': pagination.page,
-                    'per_page': pagination.per_page,
-                    'total': pagination.total,
-                    'pages': pagination.pages
+                    'page': page,
+                    'per_page': per_page,
+                    'total': total,
+                    'pages': -(-total // per_page)
                 }
             }, 200
         except Exception as e:
@@ -313,7 +1171,7 @@ class FileService:
         if not file:
             return False, {'error': 'File not found in Recycle Bin'}, 404
         try:
-            FileService._restore_recursive(file)
+            FileService._restore_many(user, [file])
             db.session.commit()
             return True, {'message': 'File restored successfully'}, 200
         except Exception as e:
@@ -321,35 +1179,6 @@ class FileService:
             current_app.logger.error(f"File restore error: {str(e)}")
             return False, {'error': 'Restore failed', 'details': str(e)}, 500
 
-    @staticmethod
-    def _restore_recursive(file):
-        """Restore a file/folder and its deleted descendants."""
-        if file.original_parent_folder_uuid:
-            parent_exists = File.query.filter_by(
-                uuid=file.original_parent_folder_uuid,
-                user_uuid=file.user_uuid,
-                is_deleted=False
-            ).first()
-            file.parent_folder_uuid = file.original_parent_folder_uuid if parent_exists else None
-        else:
-            file.parent_folder_uuid = None
-        file.is_deleted = False
-        file.deleted_at = None
-        file.original_parent_folder_uuid = None
-        if file.is_folder:
-            children = File.query.filter_by(
-                original_parent_folder_uuid=file.uuid,
-                user_uuid=file.user_uuid,
-                is_deleted=True
-            ).all()
-            for child in children:
-                child.parent_folder_uuid = file.uuid
-                child.is_deleted = False
-                child.deleted_at = None
-                child.original_parent_folder_uuid = None
-                if child.is_folder:
-                    FileService._restore_recursive(child)
-
     @staticmethod
     def empty_trash(user):
         """Permanently delete all files in the Recycle Bin."""
@@ -357,6 +1186,10 @@ class FileService:
             deleted_files = File.query.filter_by(
                 user_uuid=user.uuid, is_deleted=True
             ).all()
+            ChangeService.record(
+                user.uuid, ChangeAction.PURGE, FileService._outermost(deleted_files))
+            SearchService.remove(and_(File.user_uuid == user.uuid, File.is_deleted == True))
+            ContentIndexService.remove(and_(File.user_uuid == user.uuid, File.is_deleted == True))
             total_size = 0
             for file in deleted_files:
                 if not file.is_folder:
@@ -379,6 +1212,13 @@ class FileService:
             File.is_deleted == True,
             File.deleted_at <= cutoff
         ).all()
+        for user_uuid, files in groupby(
+                sorted(old_files, key=lambda file: file.user_uuid),
+                key=lambda file: file.user_uuid):
+            ChangeService.record(
+                user_uuid, ChangeAction.PURGE, FileService._outermost(list(files)))
+        SearchService.remove(and_(File.is_deleted == True, File.deleted_at <= cutoff))
+        ContentIndexService.remove(and_(File.is_deleted == True, File.deleted_at <= cutoff))
         users_affected = {}
         for file in old_files:
             if not file.is_folder:
@@ -456,6 +1296,8 @@ class FileService:
             )
 
             db.session.add(folder)
+            ChangeService.record(user.uuid, ChangeAction.CREATE, [folder])
+            SearchService.index_files(user.uuid, [folder])
             db.session.commit()
 
             return True, {
@@ -487,118 +1329,982 @@ class FileService:
         if not file:
             return False, {'error': 'File not found'}, 404
 
+        moved = None
+        try:
+            error, status_code, moved = FileService._rename(user, file, new_name)
+
+            if error:
+                return False, error, status_code
+
+            db.session.commit()
+
+            return True, {
+                'message': 'File renamed successfully',
+                'file': file.to_dict()
+            }, 200
+
+        except Exception as e:
+            db.session.rollback()
+            if moved:
+                StorageService.move_file(user.uuid, moved[1], moved[0])
+            current_app.logger.error(f"File rename error: {str(e)}")
+            return False, {'error': 'Rename failed', 'details': str(e)}, 500
+
+    @staticmethod
+    def _rename(user, file, new_name):
+        """
+        Rename ``file`` on disk and in the session, without committing.
+
+        Returns:
+            tuple: (error: dict|None, status_code: int, moved: tuple|None) where
+            ``moved`` is the (old_path, new_path) pair to undo on rollback
+        """
         # Validate new name
         is_valid, sanitized_name, error_msg = validate_filename(new_name)
 
         if not is_valid:
-            return False, {'error': error_msg}, 400
+            return {'error': error_msg}, 400, None
+
+        # Generate new path
+        parent_path = os.path.dirname(file.file_path)
+        new_relative_path = os.path.join(parent_path, sanitized_name)
+
+        # Check if name already exists
+        existing = File.query.filter_by(
+            user_uuid=user.uuid,
+            file_path=new_relative_path
+        ).first()
+
+        if existing and existing.uuid != file.uuid:
+            return {'error': 'Name already exists'}, 409, None
+
+        # Move in storage
+        success, message = StorageService.move_file(
+            user.uuid,
+            file.file_path,
+            new_relative_path
+        )
+
+        if not success:
+            return {'error': message}, 500, None
+
+        # Update database
+        old_path = file.file_path
+        file.file_name = sanitized_name
+        file.file_path = new_relative_path
+
+        # Update descendant paths if folder
+        if file.is_folder:
+            FileService._rewrite_descendant_paths(user.uuid, old_path, new_relative_path)
+
+        ChangeService.record(user.uuid, ChangeAction.RENAME, [file])
+        SearchService.reindex_file(user.uuid, file)
+
+        return None, 200, (old_path, new_relative_path)
+
+    @staticmethod
+    def move_files(user, file_uuids, target_folder_uuid=None):
+        """
+        Move files and folders into another folder.
+
+        Each selected item is reparented and renamed on disk with a single
+        filesystem move; descendant paths are then rewritten with one
+        set-based UPDATE per moved folder.
+
+        Args:
+            user (User): User object
+            file_uuids (list): UUIDs of the items to move
+            target_folder_uuid (str, optional): Destination folder UUID (None for root)
+
+        Returns:
+            tuple: (success: bool, data: dict, status_code: int)
+        """
+        if not file_uuids:
+            return False, {'error': 'No files specified'}, 400
 
+        target, error = FileService._get_target_folder(user, target_folder_uuid)
+        if error:
+            return False, error, 404
+
+        items, failed = FileService._resolve_transfer_items(user, file_uuids, target)
+
+        moved = []
+        relocated = []
+        done = []
         try:
-            # Generate new path
-            parent_path = os.path.dirname(file.file_path)
-            new_relative_path = os.path.join(parent_path, sanitized_name)
+            for file in items:
+                new_path = FileService._join_path(target, file.file_name)
+                if new_path == file.file_path:
+                    moved.append(file)
+                    continue
+
+                success, message = StorageService.move_file(user.uuid, file.file_path, new_path)
+                if not success:
+                    failed.append({'id': file.uuid, 'error': message})
+                    continue
+                done.append((file.file_path, new_path))
+
+                old_path = file.file_path
+                file.file_path = new_path
+                if file.is_folder:
+                    FileService._rewrite_descendant_paths(user.uuid, old_path, new_path)
+                moved.append(file)
+                relocated.append(file)
+
+            # Reparent every moved item at once
+            moved_uuids = [file.uuid for file in moved]
+            if moved_uuids:
+                File.query.filter(
+                    File.user_uuid == user.uuid,
+                    File.uuid.in_(moved_uuids)
+                ).update({'parent_folder_uuid': target.uuid if target else None},
+                         synchronize_session='fetch')
+
+            ChangeService.record(user.uuid, ChangeAction.MOVE, relocated)
+            db.session.commit()
 
-            # Check if name already exists
-            existing = File.query.filter_by(
-                user_uuid=user.uuid,
-                file_path=new_relative_path
-            ).first()
+            return True, {
+                'message': f'{len(moved)} item(s) moved',
+                'moved': [file.to_dict() for file in moved],
+                'failed': failed
+            }, 200
 
-            if existing and existing.uuid != file_uuid:
-                return False, {'error': 'Name already exists'}, 409
+        except Exception as e:
+            db.session.rollback()
+            for old_path, new_path in reversed(done):
+                StorageService.move_file(user.uuid, new_path, old_path)
+            current_app.logger.error(f"File move error: {str(e)}")
+            return False, {'error': 'Move failed', 'details': str(e)}, 500
 
-            # Move in storage
-            success, message = StorageService.move_file(
-                user.uuid,
-                file.file_path,
-                new_relative_path
-            )
+    @staticmethod
+    def copy_files(user, file_uuids, target_folder_uuid=None):
+        """
+        Copy files and folder subtrees into another folder.
 
-            if not success:
-                return False, {'error': message}, 500
+        The quota check uses the sizes already recorded in the database, so
+        no file is read before the copy starts.
+
+        Args:
+            user (User): User object
+            file_uuids (list): UUIDs of the items to copy
+            target_folder_uuid (str, optional): Destination folder UUID (None for root)
+
+        Returns:
+            tuple: (success: bool, data: dict, status_code: int)
+        """
+        if not file_uuids:
+            return False, {'error': 'No files specified'}, 400
+
+        target, error = FileService._get_target_folder(user, target_folder_uuid)
+        if error:
+            return False, error, 404
 
-            # Update database
-            old_path = file.file_path
-            file.file_name = sanitized_name
-            file.file_path = new_relative_path
+        items, failed = FileService._resolve_transfer_items(user, file_uuids, target)
 
-            # Update children paths if folder
+        # Fetch every live descendant of the selected folders up front
+        subtrees = {}
+        total_size = 0
+        for file in items:
+            nodes = [file]
             if file.is_folder:
-                FileService._update_children_paths(file, old_path, new_relative_path)
+                nodes += File.query.filter(
+                    File.user_uuid == user.uuid,
+                    File.is_deleted == False,
+                    FileService._below(file.file_path)
+                ).all()
+            # Parents sort before their children, so new parent UUIDs exist
+            # by the time a child row is built
+            nodes.sort(key=lambda node: len(node.file_path))
+            subtrees[file.uuid] = nodes
+            total_size += sum(node.file_size or 0 for node in nodes if not node.is_folder)
+
+        if user.storage_used + total_size > user.storage_quota:
+            return False, {'error': 'Storage quota exceeded'}, 403
+
+        copied = []
+        created = []
+        created_paths = []
+        try:
+            for file in items:
+                root_path = FileService._join_path(target, file.file_name)
+                new_uuids = {}
+                rows = []
+
+                for node in subtrees[file.uuid]:
+                    new_path = root_path + node.file_path[len(file.file_path):]
 
+                    if node.is_folder:
+                        success, message = StorageService.create_folder(user.uuid, new_path)
+                    else:
+                        success, message = StorageService.copy_file(
+                            user.uuid, node.file_path, new_path)
+                    if not success:
+                        raise RuntimeError(message)
+                    if node is file:
+                        created_paths.append(new_path)
+
+                    new_uuids[node.uuid] = str(uuid_lib.uuid4())
+                    clone = File(
+                        user_uuid=user.uuid,
+                        file_name=node.file_name,
+                        file_path=new_path,
+                        file_size=node.file_size,
+                        mime_type=node.mime_type,
+                        crc32=node.crc32,
+                        is_folder=node.is_folder,
+                        parent_folder_uuid=(target.uuid if target else None) if node is file
+                        else new_uuids[node.parent_folder_uuid]
+                    )
+                    clone.uuid = new_uuids[node.uuid]
+                    rows.append(clone)
+
+                db.session.add_all(rows)
+                created.extend(rows)
+                copied.append(rows[0])
+
+            user.storage_used += total_size
+            ChangeService.record(user.uuid, ChangeAction.CREATE, created)
+            SearchService.index_files(user.uuid, created)
             db.session.commit()
 
+            ContentIndexService.submit(user.uuid, created)
+
             return True, {
-                'message': 'File renamed successfully',
-                'file': file.to_dict()
+                'message': f'{len(copied)} item(s) copied',
+                'copied': [file.to_dict() for file in copied],
+                'failed': failed
             }, 200
 
         except Exception as e:
             db.session.rollback()
-            current_app.logger.error(f"File rename error: {str(e)}")
-            return False, {'error': 'Rename failed', 'details': str(e)}, 500
+            for path in created_paths:
+                StorageService.delete_file(user.uuid, path)
+            current_app.logger.error(f"File copy error: {str(e)}")
+            return False, {'error': 'Copy failed', 'details': str(e)}, 500
 
     @staticmethod
-    def _calculate_size_recursive(file):
-        """Calculate total size including folder contents."""
-        if not file.is_folder:
-            return file.file_size
+    def extract_archive(user, file_uuid, target_folder_uuid=None):
+        """
+        Start a background job extracting a ZIP or tar archive into the drive.
 
-        total = 0
-        for child in file.children.all():
-            total += FileService._calculate_size_recursive(child)
+        Args:
+            user (User): User object
+            file_uuid (str): UUID of the archive
+            target_folder_uuid (str, optional): Destination folder UUID
+                (defaults to the folder holding the archive)
 
-        return total
+        Returns:
+            tuple: (success: bool, data: dict, status_code: int)
+        """
+        archive = File.query.filter_by(
+            uuid=file_uuid, user_uuid=user.uuid, is_folder=False, is_deleted=False
+        ).first()
+
+        if not archive:
+            return False, {'error': 'File not found'}, 404
+
+        if not ArchiveService.detect_format(archive.file_name):
+            return False, {'error': 'Unsupported archive format'}, 400
+
+        if target_folder_uuid is None:
+            target_folder_uuid = archive.parent_folder_uuid
+
+        target, error = FileService._get_target_folder(user, target_folder_uuid)
+        if error:
+            return False, error, 404
+
+        job = JobService.submit(
+            user, 'extract', FileService._extract_archive_job,
+            user_uuid=user.uuid,
+            file_uuid=archive.uuid,
+            target_folder_uuid=target.uuid if target else None
+        )
+
+        return True, {
+            'message': 'Extraction started',
+            'job': job.to_dict()
+        }, 202
 
     @staticmethod
-    def _update_children_paths(folder, old_path, new_path):
-        """Recursively update paths for folder children."""
-        for child in folder.children.all():
-            child.file_path = child.file_path.replace(old_path, new_path, 1)
-            if child.is_folder:
-                FileService._update_children_paths(child, old_path, new_path)
+    def _extract_archive_job(job, user_uuid, file_uuid, target_folder_uuid):
+        """
+        Job body of extract_archive.
+
+        Reads the member list once, checks it against the quota and the
+        decompression-bomb limits, creates the missing folders, streams every
+        member to disk and finally inserts all rows in bulk.
+
+        Returns:
+            dict: Extraction summary stored as the job result
+        """
+        user = User.query.get(user_uuid)
+        archive_row = File.query.filter_by(uuid=file_uuid, user_uuid=user_uuid).first()
+        if not user or not archive_row:
+            raise ArchiveError('Archive no longer exists')
+
+        target, error = FileService._get_target_folder(user, target_folder_uuid)
+        if error:
+            raise ArchiveError(error['error'])
+
+        archive_path = StorageService.get_full_path(user.uuid, archive_row.file_path)
+        archive_format = ArchiveService.detect_format(archive_row.file_name)
+        allowed_extensions = current_app.config['ALLOWED_EXTENSIONS']
+
+        written = []
+        new_folders = []
+        try:
+            with ArchiveService.open_archive(archive_path, archive_format) as archive:
+                members, special = ArchiveService.list_members(archive)
+                ArchiveService.check_limits(members, os.path.getsize(archive_path))
+
+                skipped = [{'path': name, 'error': 'Unsupported entry type'} for name in special]
+                wanted_folders = set()
+                entries = []
+                for member in members:
+                    parts, error_msg = FileService._split_tree_path(
+                        member.name, is_folder=member.is_dir)
+                    if not error_msg and not member.is_dir:
+                        is_valid, name, error_msg = validate_filename(
+                            parts[-1], allowed_extensions)
+                        parts[-1] = name
+                    if error_msg:
+                        skipped.append({'path': member.name, 'error': error_msg})
+                        continue
+
+                    depth = len(parts) if member.is_dir else len(parts) - 1
+                    wanted_folders.update('/'.join(parts[:i]) for i in range(1, depth + 1))
+                    if not member.is_dir:
+                        entries.append((member, parts[-1], '/'.join(parts[:-1])))
+
+                if sum(entry[0].size for entry in entries) > user.storage_quota - user.storage_used:
+                    raise ArchiveError('Storage quota exceeded')
+
+                base = target.file_path if target else ''
+                full_paths = [os.path.join(base, folder, name) for _, name, folder in entries]
+                folder_uuids, blocked, new_folders, existing = FileService._plan_folders(
+                    user, target, wanted_folders, full_paths)
+                FileService._make_folders(user, new_folders)
+
+                rows = []
+                taken = set()
+                for index, ((member, name, folder), full_path) in enumerate(zip(entries, full_paths)):
+                    if folder in blocked or full_path in existing or full_path in taken:
+                        skipped.append({'path': member.name, 'error': 'Name already exists'})
+                        continue
+
+                    destination = StorageService.get_full_path(user.uuid, full_path)
+                    size, crc32 = ArchiveService.extract_member(archive, member, destination)
+                    written.append(full_path)
+                    taken.add(full_path)
+                    rows.append(FileService._new_file_row(
+                        user, name, full_path, size, folder_uuids[folder], crc32))
+
+                    if index % EXTRACT_PROGRESS_INTERVAL == 0:
+                        JobService.set_progress(job, 100 * index / len(entries))
+
+            FileService._insert_tree(user, new_folders, rows)
+
+        except Exception:
+            db.session.rollback()
+            for relative_path in written:
+                StorageService.delete_file(user.uuid, relative_path)
+            for folder in new_folders:
+                StorageService.delete_file(user.uuid, folder.file_path)
+            raise
+
+        return {
+            'target_folder_id': target.uuid if target else None,
+            'files_extracted': len(rows),
+            'folders_created': len(new_folders),
+            'skipped': skipped
+        }
 
     @staticmethod
-    def create_zip(user, file_uuids: list) -> tuple:
+    def batch_operations(user, operations):
+        """
+        Apply a list of delete/restore/rename/permanent_delete operations in
+        one database transaction.
+
+        Consecutive operations of the same kind are applied together with
+        set-based statements. Invalid items are reported individually and do
+        not prevent the others from being applied.
+
+        Args:
+            user (User): User object
+            operations (list): Items such as ``{"op": "rename", "id": "uuid",
+                "new_name": "b.txt"}``
+
+        Returns:
+            tuple: (success: bool, data: dict, status_code: int)
+        """
+        max_operations = current_app.config['BATCH_MAX_OPERATIONS']
+        if not operations:
+            return False, {'error': 'No operations specified'}, 400
+        if len(operations) > max_operations:
+            return False, {'error': f'At most {max_operations} operations per batch'}, 400
+
+        results = [None] * len(operations)
+        valid = []
+        for index, operation in enumerate(operations):
+            if (not isinstance(operation, dict)
+                    or operation.get('op') not in BATCH_OPERATIONS
+                    or not isinstance(operation.get('id'), str)):
+                results[index] = {'index': index, 'success': False, 'status': 400,
+                                  'error': 'Invalid operation'}
+            elif operation['op'] == 'rename' and not operation.get('new_name'):
+                results[index] = {'index': index, 'success': False, 'status': 400,
+                                  'error': 'New name is required'}
+            else:
+                valid.append((index, operation))
+
+        files = {}
+        uuids = list({operation['id'] for _, operation in valid})
+        if uuids:
+            files = {
+                file.uuid: file for file in File.query.filter(
+                    File.user_uuid == user.uuid,
+                    File.uuid.in_(uuids)
+                ).all()
+            }
+
+        renamed = []
+        purged_paths = []
+        try:
+            for op, run in groupby(valid, key=lambda item: item[1]['op']):
+                targets = []
+                for index, operation in run:
+                    result = {'index': index, 'op': op, 'id': operation['id']}
+                    results[index] = result
+                    file = files.get(operation['id'])
+
+                    if (not file or (op == 'restore' and not file.is_deleted)
+                            or any(file.file_path == path or file.file_path.startswith(path + '/')
+                                   for path in purged_paths)):
+                        result.update(success=False, status=404, error='File not found')
+                    elif op == 'rename':
+                        error, status_code, moved = FileService._rename(
+                            user, file, operation['new_name'])
+                        result.update(success=error is None, status=status_code)
+                        if error:
+                            result['error'] = error['error']
+                        else:
+                            renamed.append(moved)
+                    elif file in targets:
+                        result.update(success=False, status=409, error='Duplicate operation')
+                    else:
+                        result.update(success=True, status=200)
+                        targets.append(file)
+
+                if op == 'delete':
+                    # Like DELETE /<uuid>: items already in the bin are purged
+                    trashed = [file for file in targets if file.is_deleted]
+                    FileService._soft_delete_many(
+                        user, [file for file in targets if not file.is_deleted])
+                    purged_paths += FileService._purge_many(user, trashed)
+                elif op == 'restore':
+                    FileService._restore_many(user, targets)
+                elif op == 'permanent_delete':
+                    purged_paths += FileService._purge_many(user, targets)
+
+            db.session.commit()
+
+        except Exception as e:
+            db.session.rollback()
+            for old_path, new_path in reversed(renamed):
+                StorageService.move_file(user.uuid, new_path, old_path)
+            current_app.logger.error(f"Batch operation error: {str(e)}")
+            return False, {'error': 'Batch failed', 'details': str(e)}, 500
+
+        for path in purged_paths:
+            StorageService.delete_file(user.uuid, path)
+
+        succeeded = sum(1 for result in results if result['success'])
+        return True, {
+            'message': f'{succeeded} of {len(results)} operation(s) applied',
+            'results': results
+        }, 200
+
+    @staticmethod
+    def _get_target_folder(user, folder_uuid):
+        """
+        Resolve a destination folder owned by the user.
+
+        Returns:
+            tuple: (folder: File|None, error: dict|None)
+        """
+        if not folder_uuid:
+            return None, None
+
+        folder = File.query.filter_by(
+            uuid=folder_uuid,
+            user_uuid=user.uuid,
+            is_folder=True,
+            is_deleted=False
+        ).first()
+
+        if not folder:
+            return None, {'error': 'Target folder not found'}
+
+        return folder, None
+
+    @staticmethod
+    def _resolve_transfer_items(user, file_uuids, target):
+        """
+        Load the items of a move/copy request with one IN query and weed out
+        the ones that can't be transferred into ``target``.
+
+        Returns:
+            tuple: (items: list[File], failed: list[dict])
+        """
+        found = {
+            file.uuid: file for file in File.query.filter(
+                File.user_uuid == user.uuid,
+                File.is_deleted == False,
+                File.uuid.in_(file_uuids)
+            ).all()
+        }
+
+        failed = []
+        candidates = []
+        seen = set()
+        for file_uuid in file_uuids:
+            if file_uuid in seen:
+                continue
+            seen.add(file_uuid)
+
+            file = found.get(file_uuid)
+            if not file:
+                failed.append({'id': file_uuid, 'error': 'File not found'})
+            elif target and file.is_folder and (
+                    target.file_path == file.file_path
+                    or target.file_path.startswith(file.file_path + '/')):
+                failed.append({'id': file_uuid, 'error': 'Cannot place a folder inside itself'})
+            else:
+                candidates.append(file)
+
+        # Items already covered by another selected folder travel with it
+        folder_paths = [file.file_path for file in candidates if file.is_folder]
+        items = []
+        for file in candidates:
+            if any(file.file_path.startswith(path + '/') for path in folder_paths):
+                failed.append({'id': file.uuid, 'error': 'Item is inside another selected folder'})
+            else:
+                items.append(file)
+
+        # Name clashes in the destination, checked with a single query
+        new_paths = {FileService._join_path(target, file.file_name): file for file in items}
+        clashes = {
+            row.file_path for row in db.session.query(File.file_path).filter(
+                File.user_uuid == user.uuid,
+                File.file_path.in_(list(new_paths))
+            ).all()
+        }
+        accepted = []
+        names = set()
+        for file in items:
+            new_path = FileService._join_path(target, file.file_name)
+            if new_path in names or (new_path in clashes and new_path != file.file_path):
+                failed.append({'id': file.uuid, 'error': 'Name already exists'})
+                continue
+            names.add(new_path)
+            accepted.append(file)
+
+        return accepted, failed
+
+    @staticmethod
+    def _join_path(folder, name):
+        """Relative storage path of ``name`` inside ``folder`` (None for root)."""
+        return os.path.join(folder.file_path if folder else "", name)
+
+    @staticmethod
+    def _below(path):
+        """Filter clause matching every row stored below ``path``."""
+        escaped = path.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return File.file_path.like(escaped + '/%', escape='\\')
+
+    @staticmethod
+    def _rewrite_descendant_paths(user_uuid, old_path, new_path):
+        """
+        Rewrite the stored path of every row below ``old_path`` in a single
+        UPDATE, including trashed descendants whose files still live there.
+        """
+        File.query.filter(
+            File.user_uuid == user_uuid,
+            FileService._below(old_path)
+        ).update({
+            'file_path': literal(new_path) + func.substr(File.file_path, len(old_path) + 1)
+        }, synchronize_session='fetch')
+
+    @staticmethod
+    def _outermost(files):
+        """Drop items that sit below another item of the same selection."""
+        folder_paths = [file.file_path for file in files if file.is_folder]
+        return [
+            file for file in files
+            if not any(file.file_path.startswith(path + '/') for path in folder_paths)
+        ]
+
+    @staticmethod
+    def _subtree_filter(files):
+        """WHERE clause matching the given items and everything below them."""
+        clauses = [File.uuid.in_([file.uuid for file in files])]
+        clauses += [FileService._below(file.file_path) for file in files if file.is_folder]
+        return or_(*clauses)
+
+    @staticmethod
+    def _soft_delete_many(user, files):
+        """Move items and their live descendants to the Recycle Bin."""
+        files = FileService._outermost(files)
+        folders = [file for file in files if file.is_folder]
+        now = datetime.utcnow()
+
+        if folders:
+            File.query.filter(
+                File.user_uuid == user.uuid,
+                File.is_deleted == False,
+                or_(*[FileService._below(folder.file_path) for folder in folders])
+            ).update({
+                'is_deleted': True,
+                'deleted_at': now,
+                'original_parent_folder_uuid': File.parent_folder_uuid
+            }, synchronize_session='fetch')
+
+        for file in files:
+            file.is_deleted = True
+            file.deleted_at = now
+            file.original_parent_folder_uuid = file.parent_folder_uuid
+            file.parent_folder_uuid = None
+
+        ChangeService.record(user.uuid, ChangeAction.DELETE, files)
+
+    @staticmethod
+    def _restore_many(user, files):
+        """Restore items and their trashed descendants from the Recycle Bin."""
+        files = FileService._outermost(files)
+        folders = [file for file in files if file.is_folder]
+
+        originals = {file.original_parent_folder_uuid for file in files
+                     if file.original_parent_folder_uuid}
+        live_parents = set()
+        if originals:
+            live_parents = {
+                row.uuid for row in db.session.query(File.uuid).filter(
+                    File.user_uuid == user.uuid,
+                    File.is_deleted == False,
+                    File.uuid.in_(list(originals))
+                ).all()
+            }
+
+        if folders:
+            # SET order matters: the parent must be read before it is cleared
+            db.session.execute(
+                update(File).where(
+                    File.user_uuid == user.uuid,
+                    File.is_deleted == True,
+                    or_(*[FileService._below(folder.file_path) for folder in folders])
+                ).ordered_values(
+                    (File.parent_folder_uuid, File.original_parent_folder_uuid),
+                    (File.original_parent_folder_uuid, None),
+                    (File.is_deleted, False),
+                    (File.deleted_at, None)
+                ),
+                execution_options={'synchronize_session': 'fetch'}
+            )
+
+        for file in files:
+            original = file.original_parent_folder_uuid
+            file.parent_folder_uuid = original if original in live_parents else None
+            file.is_deleted = False
+            file.deleted_at = None
+            file.original_parent_folder_uuid = None
+
+        ChangeService.record(user.uuid, ChangeAction.RESTORE, files)
+
+    @staticmethod
+    def _purge_many(user, files):
+        """
+        Delete the rows of items and their descendants and release their quota.
+
+        Storage is left untouched so callers can remove it after the commit.
+
+        Returns:
+            list: Relative paths to delete from storage
+        """
+        files = FileService._outermost(files)
+        if not files:
+            return []
+
+        ChangeService.record(user.uuid, ChangeAction.PURGE, files)
+
+        subtree = FileService._subtree_filter(files)
+        total_size = db.session.query(
+            func.coalesce(func.sum(File.file_size), 0)
+        ).filter(
+            File.user_uuid == user.uuid,
+            File.is_folder == False,
+            subtree
+        ).scalar()
+
+        SearchService.remove(and_(File.user_uuid == user.uuid, subtree))
+        ContentIndexService.remove(and_(File.user_uuid == user.uuid, subtree))
+        File.query.filter(
+            File.user_uuid == user.uuid,
+            subtree
+        ).delete(synchronize_session='fetch')
+
+        user.storage_used = max(0, user.storage_used - int(total_size))
+        return [file.file_path for file in files]
+
+    @staticmethod
+    def get_stored_zip(user, file_uuids: list) -> tuple:
         """
-        Create a ZIP archive in memory containing the specified files and folders.
+        Lay out an uncompressed ZIP archive of the specified files and folders.
+
+        The layout comes from metadata alone (names, sizes, stored CRC-32s
+        and modification dates), so the archive's size and ETag are known
+        up front and any byte range can be served on its own. Items are
+        ordered by name and folders walked in path order, so the same
+        selection of an unchanged drive always gives the same bytes. Files
+        uploaded before CRCs were recorded get theirs computed and stored
+        on first use: inline (each committed as soon as computed) up to
+        STORED_ZIP_INLINE_CRC_SIZE bytes, otherwise by a background job
+        while the request is answered 503 with the job and a retry delay.
 
         Args:
             user (User): User object
             file_uuids (list): List of file/folder UUIDs to include
 
         Returns:
-            tuple: (success: bool, data: BytesIO|dict, status_code: int)
+            tuple: (success: bool, data: StoredZip|dict, status_code: int) -
+            the dict of a 503 carries ``job`` and ``retry_after`` (seconds)
         """
         if not file_uuids:
             return False, {'error': 'No files specified'}, 400
 
-        zip_buffer = io.BytesIO()
+        items = File.query.filter(
+            File.user_uuid == user.uuid,
+            File.is_deleted == False,
+            File.uuid.in_(set(file_uuids))
+        ).all()
+        if not items:
+            return False, {'error': 'File not found'}, 404
 
-        try:
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
-                for uuid in file_uuids:
-                    file_obj = File.query.filter_by(
-                        uuid=uuid, user_uuid=user.uuid
-                    ).first()
+        entries = []
+        for item in sorted(items, key=lambda file: (file.file_name, file.uuid)):
+            if not item.is_folder:
+                entries.append((item.file_name, item))
+                continue
+            entries.append((item.file_name + '/', item))
+            nodes = File.query.filter(
+                File.user_uuid == user.uuid,
+                File.is_deleted == False,
+                FileService._below(item.file_path)
+            ).order_by(File.file_path, File.uuid).all()
+            for node in nodes:
+                name = item.file_name + node.file_path[len(item.file_path):]
+                entries.append((name + '/' if node.is_folder else name, node))
+
+        members = []
+        # (index in members, file UUID) of files without a stored CRC
+        legacy = []
+        for name, file in entries:
+            if file.is_folder:
+                members.append(ZipMember(name, None, 0, 0, file.updated_at))
+                continue
+            full_path = StorageService.get_full_path(user.uuid, file.file_path)
+            try:
+                size = os.stat(full_path).st_size
+            except FileNotFoundError:
+                continue
+            if size != (file.file_size or 0):
+                return False, {'error': f'{name} changed on storage'}, 409
+            if file.crc32 is None:
+                legacy.append((len(members), file.uuid))
+            members.append(ZipMember(name, full_path, size, file.crc32, file.updated_at))
+
+        legacy_size = sum(members[index].size for index, _ in legacy)
+        if legacy_size > current_app.config['STORED_ZIP_INLINE_CRC_SIZE']:
+            job = FileService._submit_crc32_backfill(user, [file_uuid for _, file_uuid in legacy])
+            return False, {
+                'error': 'Archive is being prepared, retry later',
+                'job': job.to_dict(),
+                'retry_after': max(1, legacy_size // CRC32_BACKFILL_RATE)
+            }, 503
+
+        for index, file_uuid in legacy:
+            crc32 = FileService._record_crc32(file_uuid, members[index].full_path)
+            members[index] = members[index]._replace(crc32=crc32)
+
+        return True, StoredZip(members), 200
 
-                    if not file_obj:
-                        continue
+    @staticmethod
+    def _record_crc32(file_uuid, full_path):
+        """Compute the CRC-32 of a file missing one, store it and commit."""
+        crc32 = StorageService.compute_crc32(full_path)
+        # Recording a checksum doesn't modify the file: keep updated_at
+        File.query.filter_by(uuid=file_uuid).update(
+            {'crc32': crc32, 'updated_at': File.updated_at}, synchronize_session=False)
+        db.session.commit()
+        return crc32
 
-                    if file_obj.is_folder:
-                        FileService._add_folder_to_zip(zf, user, file_obj, file_obj.file_name)
-                    else:
-                        full_path = StorageService.get_full_path(user.uuid, file_obj.file_path)
-                        if os.path.exists(full_path):
-                            zf.write(full_path, file_obj.file_name)
+    @staticmethod
+    def _submit_crc32_backfill(user, file_uuids):
+        """
+        Start a CRC-32 backfill job for the files no live job covers.
+
+        Queued or running jobs not updated for JOB_STALE_SECONDS died with
+        their worker and are ignored, so their files are submitted again.
+
+        Returns:
+            Job: The new job, or the latest live job when all files are covered
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=current_app.config['JOB_STALE_SECONDS'])
+        jobs = Job.query.filter(
+            Job.user_uuid == user.uuid,
+            Job.kind == 'crc32',
+            Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING]),
+            Job.updated_at >= cutoff
+        ).order_by(Job.created_at.desc()).all()
+
+        covered = set()
+        for job in jobs:
+            covered.update(json.loads(job.params or '{}').get('file_uuids', []))
+        missing = [file_uuid for file_uuid in file_uuids if file_uuid not in covered]
+        if not missing:
+            return jobs[0]
+        return JobService.submit(user, 'crc32', FileService._crc32_backfill_job,
+                                 user_uuid=user.uuid, file_uuids=missing)
+
+    @staticmethod
+    def _crc32_backfill_job(job, user_uuid, file_uuids):
+        """Job body of _submit_crc32_backfill; every CRC is committed on its own."""
+        recorded = 0
+        for position, file_uuid in enumerate(file_uuids, 1):
+            file = File.query.filter_by(uuid=file_uuid, user_uuid=user_uuid).first()
+            if file and not file.is_folder and file.crc32 is None:
+                full_path = StorageService.get_full_path(user_uuid, file.file_path)
+                if os.path.exists(full_path):
+                    FileService._record_crc32(file_uuid, full_path)
+                    recorded += 1
+            JobService.set_progress(job, 100 * position / len(file_uuids))
+        return {'files_checksummed': recorded}
+
+    @staticmethod
+    def create_zip(user, file_uuids: list) -> tuple:
+        """
+        Build, or reuse, a ZIP archive of the specified files and folders.
+
+        Archives are cached on disk per user, named after the selection and
+        the user's journal head: any change to the drive leads to a new
+        name. Building an archive removes the older generations unused for
+        ZIP_CACHE_GRACE_SECONDS, then evicts the least recently used
+        archives beyond ZIP_CACHE_MAX_BYTES. Selections larger than
+        ZIP_CACHE_MAX_ARCHIVE_SIZE are built into an anonymous temporary
+        file instead, which is never cached nor offloaded.
+
+        Args:
+            user (User): User object
+            file_uuids (list): List of file/folder UUIDs to include
+
+        Returns:
+            tuple: (success: bool, data: str|file|dict, status_code: int) -
+            the cached archive path, or an open temporary file holding the
+            archive, on success
+        """
+        if not file_uuids:
+            return False, {'error': 'No files specified'}, 400
+
+        config = current_app.config
+        cache_dir = StorageService.get_zip_cache_path(user.uuid)
+        generation = user.change_seq or 0
+        digest = hashlib.sha1('\x1f'.join(sorted(set(file_uuids))).encode('utf-8')).hexdigest()
+        zip_path = os.path.join(cache_dir, f'{generation}-{digest[:16]}.zip')
+        try:
+            # Refresh the archive's last use for LRU eviction
+            os.utime(zip_path)
+            return True, zip_path, 200
+        except FileNotFoundError:
+            pass
 
-            zip_buffer.seek(0)
-            return True, zip_buffer, 200
+        try:
+            ensure_directory_exists(cache_dir)
+            cacheable = (FileService._selection_size(user, file_uuids)
+                         <= min(config['ZIP_CACHE_MAX_ARCHIVE_SIZE'], config['ZIP_CACHE_MAX_BYTES']))
+            if not cacheable:
+                # Same disk as the cache, but unlinked: gone once sent
+                archive = tempfile.TemporaryFile(dir=cache_dir)
+                try:
+                    FileService._write_zip(archive, user, file_uuids)
+                except BaseException:
+                    archive.close()
+                    raise
+                archive.seek(0)
+                return True, archive, 200
+
+            temp_path = f'{zip_path}.{uuid_lib.uuid4().hex}.tmp'
+            try:
+                FileService._write_zip(temp_path, user, file_uuids)
+                os.replace(temp_path, zip_path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+
+            # Archives of older generations can never be served again, but
+            # offloaded responses may still be reading recently used ones
+            cutoff = time.time() - config['ZIP_CACHE_GRACE_SECONDS']
+            for name in os.listdir(cache_dir):
+                if name.endswith('.zip') and not name.startswith(f'{generation}-'):
+                    try:
+                        path = os.path.join(cache_dir, name)
+                        if os.stat(path).st_mtime < cutoff:
+                            os.remove(path)
+                    except OSError:
+                        pass
+            StorageService.evict_zip_cache(config['ZIP_CACHE_MAX_BYTES'],
+                                           config['ZIP_CACHE_GRACE_SECONDS'])
+
+            return True, zip_path, 200
 
         except Exception as e:
             current_app.logger.error(f"ZIP creation error: {str(e)}")
             return False, {'error': 'Failed to create ZIP', 'details': str(e)}, 500
 
+    @staticmethod
+    def _selection_size(user, file_uuids):
+        """Total size of the files selected directly or through a folder."""
+        items = File.query.filter(
+            File.user_uuid == user.uuid,
+            File.uuid.in_(set(file_uuids))
+        ).all()
+        total = sum(item.file_size or 0 for item in items if not item.is_folder)
+        for folder in (item for item in items if item.is_folder):
+            total += db.session.query(func.coalesce(func.sum(File.file_size), 0)).filter(
+                File.user_uuid == user.uuid,
+                File.is_folder == False,
+                FileService._below(folder.file_path)
+            ).scalar()
+        return total
+
+    @staticmethod
+    def _write_zip(target, user, file_uuids):
+        """Write the ZIP archive of a selection to a path or file object."""
+        with zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED) as zf:
+            for uuid in file_uuids:
+                file_obj = File.query.filter_by(
+                    uuid=uuid, user_uuid=user.uuid
+                ).first()
+
+                if not file_obj:
+                    continue
+
+                if file_obj.is_folder:
+                    FileService._add_folder_to_zip(zf, user, file_obj, file_obj.file_name)
+                else:
+                    full_path = StorageService.get_full_path(user.uuid, file_obj.file_path)
+                    if os.path.exists(full_path):
+                        zf.write(full_path, file_obj.file_name)
+                        StorageService.release_cached_file(full_path, file_obj.file_size)
+
     @staticmethod
     def _add_folder_to_zip(zf: zipfile.ZipFile, user, folder, zip_path: str):
         """Recursively add a folder and its contents to a ZipFile."""
@@ -621,3 +2327,4 @@ class FileService:
                 full_path = StorageService.get_full_path(user.uuid, child.file_path)
                 if os.path.exists(full_path):
                     zf.write(full_path, child_zip_path)
+                    StorageService.release_cached_file(full_path, child.file_size)
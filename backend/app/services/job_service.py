@@ -0,0 +1,140 @@
+"""
+Job service module.
+Runs long operations in background threads and tracks them as Job rows.
+"""
+import json
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from app import db
+from app.models.job import Job, JobStatus
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(workers):
+    """Return the process-wide job executor, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='mdrive-job')
+        return _executor
+
+
+class JobService:
+    """Service class for background jobs."""
+
+    @staticmethod
+    def submit(user, kind, func, **kwargs):
+        """
+        Record a job and schedule ``func(job, **kwargs)`` to run it.
+
+        ``func`` returns a JSON-serialisable result, or raises to fail the
+        job. With JOB_WORKERS = 0 the job runs inline before returning.
+
+        Args:
+            user (User): User the job runs for
+            kind (str): Job type identifier
+            func (callable): Job body
+            **kwargs: Arguments passed to ``func``
+
+        Returns:
+            Job: The newly created job
+        """
+        job = Job(user_uuid=user.uuid, kind=kind, params=kwargs)
+        db.session.add(job)
+        db.session.commit()
+
+        workers = current_app.config['JOB_WORKERS']
+        if workers <= 0:
+            JobService._run(job.uuid, func, kwargs)
+            db.session.refresh(job)
+            return job
+
+        app = current_app._get_current_object()
+
+        def run():
+            with app.app_context():
+                JobService._run(job.uuid, func, kwargs)
+
+        _get_executor(workers).submit(run)
+        return job
+
+    @staticmethod
+    def _run(job_uuid, func, kwargs):
+        """Execute a job body and record its outcome."""
+        job = Job.query.get(job_uuid)
+        job.status = JobStatus.RUNNING
+        db.session.commit()
+
+        try:
+            result = func(job, **kwargs)
+            job.status = JobStatus.COMPLETED
+            job.progress = 100
+            job.result = json.dumps(result)
+            db.session.commit()
+
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Job {job_uuid} ({job.kind}) failed: {str(e)}")
+            job = Job.query.get(job_uuid)
+            job.status = JobStatus.FAILED
+            job.error = str(e)
+            db.session.commit()
+
+    @staticmethod
+    def set_progress(job, progress):
+        """
+        Persist the progress of a running job.
+
+        Commits the session, so call it only when no other change is pending.
+        """
+        job.progress = max(0, min(99, int(progress)))
+        db.session.commit()
+
+    @staticmethod
+    def fail_stale_jobs(user_uuid=None):
+        """
+        Fail the jobs left queued or running by a worker that died.
+
+        Jobs only run in the thread pool of the worker that submitted them,
+        so nothing resumes them after a restart. Those not updated for
+        JOB_STALE_SECONDS are marked FAILED with an 'interrupted' error.
+
+        Args:
+            user_uuid (str, optional): Only check this user's jobs
+
+        Returns:
+            int: Number of jobs failed
+        """
+        now = datetime.utcnow()
+        query = Job.query.filter(
+            Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING]),
+            Job.updated_at < now - timedelta(seconds=current_app.config['JOB_STALE_SECONDS'])
+        )
+        if user_uuid:
+            query = query.filter(Job.user_uuid == user_uuid)
+        count = query.update({
+            'status': JobStatus.FAILED, 'error': 'interrupted', 'updated_at': now
+        }, synchronize_session=False)
+        if count:
+            db.session.commit()
+        return count
+
+    @staticmethod
+    def get_job(user, job_uuid):
+        """
+        Get a job owned by the user, failing it first if it was interrupted.
+
+        Returns:
+            tuple: (success: bool, data: dict, status_code: int)
+        """
+        JobService.fail_stale_jobs(user.uuid)
+        job = Job.query.filter_by(uuid=job_uuid, user_uuid=user.uuid).first()
+
+        if not job:
+            return False, {'error': 'Job not found'}, 404
+
+        return True, {'job': job.to_dict()}, 200
@@ -0,0 +1,222 @@
+"""
+Search service module.
+Maintains the filename n-gram index and answers filename searches.
+"""
+import base64
+import json
+import re
+from sqlalchemy import case, func, or_, select, true, tuple_
+from app import db
+from app.models.file import File
+from app.models.search_term import SearchTerm
+from app.utils.helpers import get_file_icon
+
+# Characters starting a new word inside a file name
+WORD_SEPARATORS = ' _-.()[]'
+
+# Longest accepted query
+MAX_QUERY_LENGTH = 100
+
+# Files indexed per round trip by rebuild()
+REINDEX_BATCH_SIZE = 1000
+
+_WORD_RE = re.compile('[^' + re.escape(WORD_SEPARATORS) + ']+')
+
+
+def _like_escape(text):
+    """Escape LIKE wildcards (with backslash as the escape character)."""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+class SearchService:
+    """Service class for filename search."""
+
+    @staticmethod
+    def terms_for(file_name):
+        """
+        Index terms of a file name.
+
+        Returns:
+            set: Every trigram of the lowercased name, plus the one- and
+            two-character prefixes of each of its words
+        """
+        name = file_name.lower()
+        terms = {name[i:i + 3] for i in range(len(name) - 2)}
+        for word in _WORD_RE.findall(name):
+            terms.add(word[:1])
+            terms.add(word[:2])
+        return terms
+
+    @staticmethod
+    def query_terms(query):
+        """
+        Terms that every match of ``query`` (already lowercased) must carry.
+
+        Queries shorter than a trigram match word prefixes only. Longer ones
+        use non-overlapping trigrams plus the last one: every match is still
+        verified against the full query, so covering it is enough and keeps
+        the posting lists to intersect few.
+        """
+        if len(query) < 3:
+            return {query}
+        return {query[i:i + 3] for i in range(0, len(query) - 2, 3)} | {query[-3:]}
+
+    @staticmethod
+    def index_files(user_uuid, files):
+        """
+        Add files to the index, without committing.
+
+        Args:
+            user_uuid (str): Owner of the files
+            files (list[File]): Rows whose names should be indexed
+        """
+        db.session.flush()
+        mappings = [
+            {'user_uuid': user_uuid, 'term': term, 'file_uuid': file.uuid}
+            for file in files
+            for term in SearchService.terms_for(file.file_name)
+        ]
+        if mappings:
+            db.session.bulk_insert_mappings(SearchTerm, mappings)
+
+    @staticmethod
+    def reindex_file(user_uuid, file):
+        """Replace the indexed terms of a renamed file, without committing."""
+        SearchTerm.query.filter_by(
+            user_uuid=user_uuid, file_uuid=file.uuid
+        ).delete(synchronize_session=False)
+        SearchService.index_files(user_uuid, [file])
+
+    @staticmethod
+    def remove(condition):
+        """
+        Drop the terms of every file matching ``condition``, without committing.
+
+        Call it before the rows themselves are deleted.
+
+        Args:
+            condition: WHERE clause on ``File`` selecting the files
+        """
+        SearchTerm.query.filter(
+            SearchTerm.file_uuid.in_(select(File.uuid).where(condition))
+        ).delete(synchronize_session=False)
+
+    @staticmethod
+    def rebuild(user_uuid=None):
+        """
+        Rebuild the index from ``files``, for all users or one of them.
+
+        Files are read in keyset-paginated batches so memory stays bounded.
+
+        Returns:
+            int: Number of files indexed
+        """
+        term_filter = SearchTerm.user_uuid == user_uuid if user_uuid else true()
+        file_filter = File.user_uuid == user_uuid if user_uuid else true()
+
+        SearchTerm.query.filter(term_filter).delete(synchronize_session=False)
+        db.session.commit()
+
+        count = 0
+        last_uuid = ''
+        while True:
+            rows = db.session.execute(
+                select(File.uuid, File.user_uuid, File.file_name).where(
+                    file_filter, File.uuid > last_uuid
+                ).order_by(File.uuid).limit(REINDEX_BATCH_SIZE)
+            ).all()
+            if not rows:
+                return count
+
+            db.session.bulk_insert_mappings(SearchTerm, [
+                {'user_uuid': owner, 'term': term, 'file_uuid': file_uuid}
+                for file_uuid, owner, file_name in rows
+                for term in SearchService.terms_for(file_name)
+            ])
+            db.session.commit()
+            count += len(rows)
+            last_uuid = rows[-1][0]
+
+    @staticmethod
+    def search(user, query, limit=50, cursor=None):
+        """
+        Search the user's live files and folders by name.
+
+        Candidates come from the term index; each must contain the query as
+        a substring. Results are ranked exact name, then name prefix, then
+        word prefix, then any other substring, with shorter names first.
+
+        Args:
+            user (User): User object
+            query (str): Text to look for (case-insensitive)
+            limit (int): Page size
+            cursor (str, optional): ``next_cursor`` of the previous page
+
+        Returns:
+            tuple: (success: bool, data: dict, status_code: int)
+        """
+        query = (query or '').strip().lower()
+        if not query:
+            return False, {'error': 'Search query is required'}, 400
+        if len(query) > MAX_QUERY_LENGTH:
+            return False, {'error': f'Search query is limited to {MAX_QUERY_LENGTH} characters'}, 400
+
+        after = None
+        if cursor:
+            try:
+                after = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+                rank_after, length_after, name_after, uuid_after = after
+            except (ValueError, TypeError):
+                return False, {'error': 'Invalid cursor'}, 400
+
+        terms = SearchService.query_terms(query)
+        candidates = select(SearchTerm.file_uuid).where(
+            SearchTerm.user_uuid == user.uuid,
+            SearchTerm.term.in_(terms)
+        ).group_by(SearchTerm.file_uuid).having(func.count() == len(terms)).subquery()
+
+        escaped = _like_escape(query)
+        name = func.lower(File.file_name)
+        rank = case(
+            (name == query, 0),
+            (name.like(escaped + '%', escape='\\'), 1),
+            (or_(*[name.like('%' + _like_escape(separator) + escaped + '%', escape='\\')
+                   for separator in WORD_SEPARATORS]), 2),
+            else_=3
+        )
+        length = func.length(File.file_name)
+
+        # Join from the candidates so planners drive the query from the
+        # index instead of scanning the user's files and probing an IN list
+        statement = select(File, rank, length).select_from(candidates).join(
+            File, File.uuid == candidates.c.file_uuid
+        ).where(
+            File.user_uuid == user.uuid,
+            File.is_deleted == False,
+            name.like('%' + escaped + '%', escape='\\')
+        )
+        if after:
+            statement = statement.where(
+                tuple_(rank, length, File.file_name, File.uuid)
+                > tuple_(rank_after, length_after, name_after, uuid_after)
+            )
+        statement = statement.order_by(rank, length, File.file_name, File.uuid).limit(limit + 1)
+
+        rows = db.session.execute(statement).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        next_cursor = None
+        if has_more:
+            file, last_rank, last_length = rows[-1]
+            next_cursor = base64.urlsafe_b64encode(json.dumps(
+                [last_rank, last_length, file.file_name, file.uuid]
+            ).encode('utf-8')).decode('ascii')
+
+        return True, {
+            'files': [
+                {**file.to_dict(), 'icon': get_file_icon(file.mime_type, file.is_folder)}
+                for file, _, _ in rows
+            ],
+            'next_cursor': next_cursor
+        }, 200
@@ -4,10 +4,41 @@ Handles physical file storage operations on the filesystem.
 """
 import os
 import shutil
+import time
+import uuid as uuid_lib
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from flask import current_app
 from werkzeug.utils import secure_filename
 from app.utils.validators import sanitize_path
 from app.utils.helpers import ensure_directory_exists
+from app.utils.file_stream import drop_cached_pages, preallocate
+
+try:
+    import brotli
+except ImportError:  # optional, variants are then gzip only
+    brotli = None
+
+# linux/fs.h FICLONE ioctl: share extents between two files (btrfs, xfs, ...)
+FICLONE = 0x40049409
+
+# Buffer size for the userspace copy fallback
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Directory of UPLOAD_FOLDER holding generated ZIP archives (never a user UUID)
+ZIP_CACHE_DIR = '.zip-cache'
+
+# Directory of UPLOAD_FOLDER holding compressed variants of stored files
+VARIANT_CACHE_DIR = '.variants'
+
+# Encodings of compressed variants, in order of preference
+VARIANT_ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+VARIANT_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+# Variants are compressed inside the first download: higher levels cost
+# several times the CPU for under 1% smaller text
+VARIANT_GZIP_LEVEL = 6
+VARIANT_BROTLI_QUALITY = 5
 
 
 class StorageService:
@@ -53,7 +84,7 @@ class StorageService:
             relative_path (str): Relative path where file should be saved
 
         Returns:
-            tuple: (success: bool, message: str, file_size: int)
+            tuple: (success: bool, message: str, file_size: int, crc32: int)
         """
         try:
             full_path = StorageService.get_full_path(user_uuid, relative_path)
@@ -61,19 +92,84 @@ class StorageService:
             # Ensure directory exists
             directory = os.path.dirname(full_path)
             if not ensure_directory_exists(directory):
-                return False, "Failed to create storage directory", 0
+                return False, "Failed to create storage directory", 0, None
 
             # Save file
-            file_object.save(full_path)
-
-            # Get file size
-            file_size = os.path.getsize(full_path)
-
-            return True, "File saved successfully", file_size
+            source = file_object.stream
+            expected_size = StorageService._remaining_size(source)
+            with open(full_path, 'wb') as target:
+                if expected_size and current_app.config['IO_PREALLOCATE']:
+                    preallocate(target, expected_size)
+                # The CRC lets ZIP downloads be laid out from metadata alone
+                crc32 = 0
+                for block in iter(lambda: source.read(COPY_BUFFER_SIZE), b''):
+                    crc32 = zlib.crc32(block, crc32)
+                    target.write(block)
+                file_size = target.tell()
+                target.truncate()
+
+                # Keep a large upload (and its spooled copy) from evicting hot pages
+                threshold = current_app.config['IO_DROP_CACHE_THRESHOLD']
+                if threshold and file_size >= threshold:
+                    drop_cached_pages(target, sync=True)
+                    if hasattr(source, 'fileno'):
+                        drop_cached_pages(source)
+
+            return True, "File saved successfully", file_size, crc32
 
         except Exception as e:
             current_app.logger.error(f"File save error: {str(e)}")
-            return False, f"Failed to save file: {str(e)}", 0
+            return False, f"Failed to save file: {str(e)}", 0, None
+
+    @staticmethod
+    def _remaining_size(stream):
+        """Bytes left in a seekable stream, or None if it can't tell."""
+        try:
+            position = stream.tell()
+            end = stream.seek(0, os.SEEK_END)
+            stream.seek(position)
+            return end - position
+        except (AttributeError, OSError, ValueError):
+            return None
+
+    @staticmethod
+    def release_cached_file(full_path, file_size):
+        """
+        Drop a file just streamed from the page cache if it is large.
+
+        Args:
+            full_path (str): Absolute path of the file
+            file_size (int): Its size; files below IO_DROP_CACHE_THRESHOLD are kept
+        """
+        threshold = current_app.config['IO_DROP_CACHE_THRESHOLD']
+        if threshold and (file_size or 0) >= threshold:
+            drop_cached_pages(full_path)
+
+    @staticmethod
+    def save_files(user_uuid, items):
+        """
+        Save several uploaded files concurrently.
+
+        Args:
+            user_uuid (str): User's UUID
+            items (list): (file_object, relative_path) pairs
+
+        Returns:
+            list: One (success, message, file_size, crc32) tuple per item, in order
+        """
+        workers = min(current_app.config['UPLOAD_WORKERS'], len(items))
+        if workers <= 1:
+            return [StorageService.save_file(user_uuid, file_object, relative_path)
+                    for file_object, relative_path in items]
+
+        app = current_app._get_current_object()
+
+        def save(item):
+            with app.app_context():
+                return StorageService.save_file(user_uuid, *item)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(save, items))
 
     @staticmethod
     def delete_file(user_uuid, relative_path):
@@ -93,11 +189,25 @@ class StorageService:
             if not os.path.exists(full_path):
                 return False, "File not found"
 
+            # Compressed variants are keyed by inode: collect them first
+            variant_keys = set()
+            if os.path.isdir(StorageService.get_variant_cache_path(user_uuid)):
+                if os.path.isdir(full_path):
+                    for root, _, names in os.walk(full_path):
+                        for name in names:
+                            variant_keys.add(
+                                StorageService._variant_key(os.stat(os.path.join(root, name))))
+                else:
+                    variant_keys.add(StorageService._variant_key(os.stat(full_path)))
+
             if os.path.isfile(full_path):
                 os.remove(full_path)
             elif os.path.isdir(full_path):
                 shutil.rmtree(full_path)
 
+            if variant_keys:
+                StorageService._delete_variants(user_uuid, variant_keys)
+
             return True, "File deleted successfully"
 
         except Exception as e:
@@ -168,6 +278,97 @@ class StorageService:
             current_app.logger.error(f"File move error: {str(e)}")
             return False, f"Failed to move file: {str(e)}"
 
+    @staticmethod
+    def copy_file(user_uuid, source_relative_path, destination_relative_path):
+        """
+        Copy a single file within a user's storage.
+
+        The cheapest mechanism the filesystem supports is used, in order:
+        a reflink clone, an in-kernel ``copy_file_range`` and finally a
+        buffered stream copy. The copy is always a file of its own (never a
+        hard link), so writing either file or deleting its variants (keyed
+        by inode) leaves the other alone.
+
+        Args:
+            user_uuid (str): User's UUID
+            source_relative_path (str): Relative path of the file to copy
+            destination_relative_path (str): Relative path of the new copy
+
+        Returns:
+            tuple: (success: bool, message: str)
+        """
+        try:
+            source = StorageService.get_full_path(user_uuid, source_relative_path)
+            destination = StorageService.get_full_path(user_uuid, destination_relative_path)
+
+            if not os.path.isfile(source):
+                return False, "Source file not found"
+
+            if os.path.exists(destination):
+                return False, "Destination already exists"
+
+            if not ensure_directory_exists(os.path.dirname(destination)):
+                return False, "Failed to create destination directory"
+
+            if StorageService._reflink(source, destination):
+                return True, "File copied successfully"
+
+            with open(source, 'rb') as src, open(destination, 'wb') as dst:
+                if not StorageService._copy_file_range(src, dst):
+                    shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+
+            return True, "File copied successfully"
+
+        except Exception as e:
+            current_app.logger.error(f"File copy error: {str(e)}")
+            return False, f"Failed to copy file: {str(e)}"
+
+    @staticmethod
+    def _reflink(source, destination):
+        """Clone ``source`` into ``destination`` with FICLONE; True on success."""
+        try:
+            import fcntl
+        except ImportError:
+            return False
+
+        try:
+            with open(source, 'rb') as src, open(destination, 'xb') as dst:
+                try:
+                    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                    return True
+                except OSError:
+                    pass
+        except OSError:
+            return False
+
+        # Clone unsupported: drop the empty placeholder so the fallback
+        # copy starts from a clean slate.
+        os.remove(destination)
+        return False
+
+    @staticmethod
+    def _copy_file_range(src, dst):
+        """Copy with os.copy_file_range; False if the kernel can't do it."""
+        if not hasattr(os, 'copy_file_range'):
+            return False
+
+        remaining = os.fstat(src.fileno()).st_size
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        except OSError:
+            # Unsupported (or failed part-way): rewind so the stream copy
+            # starts from scratch
+            src.seek(0)
+            dst.seek(0)
+            dst.truncate()
+            return False
+
+        return True
+
     @staticmethod
     def file_exists(user_uuid, relative_path):
         """
@@ -199,3 +400,180 @@ class StorageService:
         if os.path.exists(full_path) and os.path.isfile(full_path):
             return os.path.getsize(full_path)
         return 0
+
+    @staticmethod
+    def compute_crc32(full_path):
+        """
+        Compute the CRC-32 of a stored file.
+
+        Args:
+            full_path (str): Absolute path of the file
+
+        Returns:
+            int: CRC-32 of its contents
+        """
+        crc32 = 0
+        with open(full_path, 'rb') as file:
+            for block in iter(lambda: file.read(COPY_BUFFER_SIZE), b''):
+                crc32 = zlib.crc32(block, crc32)
+        return crc32
+
+    @staticmethod
+    def get_zip_cache_path(user_uuid):
+        """
+        Get the directory holding a user's generated ZIP archives.
+
+        It lives under UPLOAD_FOLDER so offloaded downloads can reach it
+        through the same internal location as stored files.
+
+        Args:
+            user_uuid (str): User's UUID
+
+        Returns:
+            str: Absolute path of the directory
+        """
+        return os.path.join(current_app.config['UPLOAD_FOLDER'], ZIP_CACHE_DIR, user_uuid)
+
+    @staticmethod
+    def evict_zip_cache(max_bytes, grace_seconds):
+        """
+        Remove the least recently used ZIP archives of all users until the
+        cache holds at most ``max_bytes``.
+
+        Hits refresh an archive's mtime, so it orders the archives by last
+        use. Archives used within the last ``grace_seconds`` are kept even
+        over budget: an offloaded response may still be reading them.
+
+        Args:
+            max_bytes (int): Size budget of the whole ZIP cache
+            grace_seconds (int): Minimum age of an evicted archive
+
+        Returns:
+            int: Number of archives removed
+        """
+        root = os.path.join(current_app.config['UPLOAD_FOLDER'], ZIP_CACHE_DIR)
+        archives = []
+        try:
+            user_dirs = os.listdir(root)
+        except FileNotFoundError:
+            return 0
+        for user_dir in user_dirs:
+            try:
+                scan = os.scandir(os.path.join(root, user_dir))
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            with scan:
+                for entry in scan:
+                    if not entry.name.endswith('.zip'):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    archives.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in archives)
+        cutoff = time.time() - grace_seconds
+        removed = 0
+        for mtime, size, path in sorted(archives):
+            if total <= max_bytes or mtime > cutoff:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            else:
+                removed += 1
+            total -= size
+        return removed
+
+    @staticmethod
+    def get_variant_cache_path(user_uuid):
+        """
+        Get the directory holding compressed variants of a user's files.
+
+        Args:
+            user_uuid (str): User's UUID
+
+        Returns:
+            str: Absolute path of the directory
+        """
+        return os.path.join(current_app.config['UPLOAD_FOLDER'], VARIANT_CACHE_DIR, user_uuid)
+
+    @staticmethod
+    def _variant_key(stat):
+        """Identity of a stored file that survives renames and moves."""
+        return f'{stat.st_dev:x}-{stat.st_ino:x}'
+
+    @staticmethod
+    def _delete_variants(user_uuid, variant_keys, keep=None):
+        """Remove the variants of the given files, except those of version ``keep``."""
+        directory = StorageService.get_variant_cache_path(user_uuid)
+        try:
+            names = os.listdir(directory)
+        except FileNotFoundError:
+            return
+        for name in names:
+            if name.endswith('.tmp') or (keep and name.startswith(keep + '.')):
+                continue
+            if name.rsplit('-', 2)[0] in variant_keys:
+                try:
+                    os.remove(os.path.join(directory, name))
+                except FileNotFoundError:
+                    pass
+
+    @staticmethod
+    def get_compressed_variant(full_path, stat, encoding):
+        """
+        Get the gzip or br encoding of a stored file, compressing it on first use.
+
+        Variants are named after the file's inode and content validator
+        (mtime and size), so they follow the file through renames and moves,
+        and a rewritten file gets a new variant while the outdated ones are
+        removed.
+
+        Args:
+            full_path (str): Absolute path of the file
+            stat (os.stat_result): Its stat, taken by the caller
+            encoding (str): One of VARIANT_ENCODINGS
+
+        Returns:
+            tuple: (path: str, stat: os.stat_result) of the variant, or
+            (None, None) when the file changed while being compressed
+        """
+        user_uuid = os.path.relpath(full_path, current_app.config['UPLOAD_FOLDER']).split(os.sep, 1)[0]
+        directory = StorageService.get_variant_cache_path(user_uuid)
+        key = StorageService._variant_key(stat)
+        version = f'{key}-{stat.st_mtime_ns}-{stat.st_size}'
+        name = version + VARIANT_SUFFIXES[encoding]
+        variant_path = os.path.join(directory, name)
+        try:
+            return variant_path, os.stat(variant_path)
+        except FileNotFoundError:
+            pass
+
+        ensure_directory_exists(directory)
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=VARIANT_BROTLI_QUALITY)
+            compress, finish = compressor.process, compressor.finish
+        else:
+            compressor = zlib.compressobj(VARIANT_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            compress, finish = compressor.compress, compressor.flush
+
+        temp_path = f'{variant_path}.{uuid_lib.uuid4().hex}.tmp'
+        try:
+            with open(full_path, 'rb') as source, open(temp_path, 'wb') as target:
+                for block in iter(lambda: source.read(COPY_BUFFER_SIZE), b''):
+                    target.write(compress(block))
+                target.write(finish())
+                current = os.fstat(source.fileno())
+            if (current.st_mtime_ns, current.st_size) != (stat.st_mtime_ns, stat.st_size):
+                return None, None
+            os.replace(temp_path, variant_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        # Variants of older versions of the file can never be served again
+        StorageService._delete_variants(user_uuid, {key}, keep=version)
+        return variant_path, os.stat(variant_path)
@@ -0,0 +1,150 @@
+"""
+Transfer service module.
+Issues and verifies signed, short-lived download URLs.
+"""
+import base64
+import hashlib
+import hmac
+import os
+import time
+from flask import current_app, url_for
+from app import db
+from app.models.file import File
+from app.services.storage_service import StorageService
+
+DISPOSITIONS = ('attachment', 'inline')
+
+# Query parameters covered by the signature, in signing order
+SIGNED_PARAMS = ('u', 'p', 's', 'i', 't', 'e', 'd', 'n', 'm')
+
+
+class TransferService:
+    """
+    Service class for signed transfer URLs.
+
+    A signed URL carries everything needed to serve the file: owner (u),
+    storage path (p), size (s), inode (i) and mtime in nanoseconds (t) of
+    the stored file, expiry as a Unix time (e), disposition (d), download
+    name (n) and MIME type (m), plus ``sig``, the unpadded base64url
+    HMAC-SHA256 of::
+
+        GET\\n<file uuid>\\n<u>\\n<p>\\n<s>\\n<i>\\n<t>\\n<e>\\n<d>\\n<n>\\n<m>
+
+    keyed with TRANSFER_URL_SECRET. A front proxy sharing the secret can
+    verify it and serve ``<UPLOAD_FOLDER>/<u>/<p>`` itself. Links cannot be
+    revoked, so keep TRANSFER_URL_TTL short; the app still refuses a file
+    that was trashed, or replaced or rewritten on disk (another inode or
+    mtime), since the URL was issued.
+    """
+
+    @staticmethod
+    def _signature(file_uuid, params):
+        """Compute the signature of a transfer URL."""
+        secret = current_app.config['TRANSFER_URL_SECRET'] or current_app.config['SECRET_KEY']
+        message = '\n'.join(['GET', file_uuid] + [str(params[name]) for name in SIGNED_PARAMS])
+        digest = hmac.new(secret.encode('utf-8'), message.encode('utf-8'), hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b'=').decode('ascii')
+
+    @staticmethod
+    def create_download_url(user, file_uuid, disposition='attachment', expires_in=None):
+        """
+        Sign a download URL for one of the user's files.
+
+        Args:
+            user (User): User object
+            file_uuid (str): File UUID
+            disposition (str): 'attachment' or 'inline'
+            expires_in (int, optional): Lifetime in seconds (default:
+                TRANSFER_URL_TTL, capped at TRANSFER_URL_MAX_TTL)
+
+        Returns:
+            tuple: (success: bool, data: dict, status_code: int)
+        """
+        if disposition not in DISPOSITIONS:
+            return False, {'error': 'disposition must be attachment or inline'}, 400
+
+        max_ttl = current_app.config['TRANSFER_URL_MAX_TTL']
+        expires_in = expires_in or current_app.config['TRANSFER_URL_TTL']
+        if expires_in < 1 or expires_in > max_ttl:
+            return False, {'error': f'expires_in must be between 1 and {max_ttl} seconds'}, 400
+
+        file = File.query.filter_by(uuid=file_uuid, user_uuid=user.uuid, is_deleted=False).first()
+        if not file:
+            return False, {'error': 'File not found'}, 404
+        if file.is_folder:
+            return False, {'error': 'Cannot download a folder'}, 400
+
+        try:
+            stat = os.stat(StorageService.get_full_path(user.uuid, file.file_path))
+        except OSError:
+            return False, {'error': 'File not found on storage'}, 404
+
+        expires_at = int(time.time()) + expires_in
+        params = {
+            'u': user.uuid,
+            'p': file.file_path,
+            's': file.file_size or 0,
+            'i': stat.st_ino,
+            't': stat.st_mtime_ns,
+            'e': expires_at,
+            'd': disposition,
+            'n': file.file_name,
+            'm': file.mime_type or 'application/octet-stream'
+        }
+        params['sig'] = TransferService._signature(file_uuid, params)
+
+        return True, {
+            'url': url_for('files.download_signed', file_uuid=file_uuid, **params),
+            'expires_at': expires_at
+        }, 200
+
+    @staticmethod
+    def verify_download(file_uuid, args):
+        """
+        Check a signed download URL.
+
+        Args:
+            file_uuid (str): File UUID from the path
+            args (MultiDict): Query parameters
+
+        Returns:
+            tuple: (success: bool, data: dict, status_code: int) - on success,
+            data holds the decoded parameters and ``full_path``
+        """
+        params = {name: args.get(name) for name in SIGNED_PARAMS}
+        signature = args.get('sig')
+        if signature is None or None in params.values():
+            return False, {'error': 'Invalid transfer URL'}, 403
+
+        expected = TransferService._signature(file_uuid, params)
+        if not hmac.compare_digest(expected, signature):
+            return False, {'error': 'Invalid transfer URL'}, 403
+
+        try:
+            expires_at = int(params['e'])
+            signed_stat = (int(params['s']), int(params['i']), int(params['t']))
+        except ValueError:
+            return False, {'error': 'Invalid transfer URL'}, 403
+        if expires_at < time.time():
+            return False, {'error': 'Transfer URL expired'}, 410
+
+        live = db.session.query(File.uuid).filter_by(
+            uuid=file_uuid, user_uuid=params['u'], is_deleted=False).first()
+        if not live:
+            return False, {'error': 'File not found'}, 404
+
+        full_path = StorageService.get_full_path(params['u'], params['p'])
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            return False, {'error': 'File not found on storage'}, 404
+        if (stat.st_size, stat.st_ino, stat.st_mtime_ns) != signed_stat:
+            return False, {'error': 'File changed since the URL was issued'}, 410
+
+        return True, {
+            'full_path': full_path,
+            'file_name': params['n'],
+            'mime_type': params['m'],
+            'as_attachment': params['d'] == 'attachment',
+            'expires_at': expires_at
+        }, 200
@@ -0,0 +1,205 @@
+"""
+File stream module.
+Builds file responses that keep the number of copies and Python-level
+iterations per byte low, and gives the kernel page-cache hints for large
+transfers.
+"""
+import errno
+import io
+import os
+import zlib
+from werkzeug.utils import send_file
+
+
+class BlockFileWrapper:
+    """
+    File iterator used when the WSGI server has no ``wsgi.file_wrapper``.
+
+    Reads large blocks (one Python iteration per block instead of per 8 KB)
+    and can seek, so werkzeug's Range handling starts reading mid-file
+    instead of skipping through it.
+    """
+
+    def __init__(self, file, block_size):
+        self.file = file
+        self.block_size = block_size
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        self.file.seek(offset, whence)
+
+    def tell(self):
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        data = self.file.read(self.block_size)
+        if data:
+            return data
+        raise StopIteration()
+
+
+class _DropCacheOnClose:
+    """
+    File proxy that evicts the file's pages once the server closes it.
+
+    File responses are direct passthrough, so the server closes the body
+    but never runs the response's ``call_on_close`` callbacks.
+    """
+
+    def __init__(self, file):
+        self.file = file
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+    def close(self):
+        try:
+            drop_cached_pages(self.file)
+        finally:
+            self.file.close()
+
+
+def advise_sequential(file):
+    """Ask the kernel for aggressive readahead on ``file`` (no-op off Linux)."""
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(file.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+
+
+def drop_cached_pages(file, sync=False):
+    """
+    Evict a file's pages from the OS page cache (no-op off Linux).
+
+    Dirty pages cannot be dropped, so written files need ``sync``, which
+    first flushes them to disk.
+
+    Args:
+        file: Open file object, or a path
+        sync (bool): fdatasync before dropping
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        if isinstance(file, (str, bytes, os.PathLike)):
+            fd = os.open(file, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+            return
+        if sync:
+            file.flush()
+            os.fdatasync(file.fileno())
+        os.posix_fadvise(file.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError:
+        pass
+
+
+def preallocate(file, size):
+    """
+    Reserve ``size`` bytes for a file about to be written (no-op off Linux).
+
+    Gives the filesystem one chance to lay the file out contiguously and
+    fails early, with ENOSPC, when the disk is full.
+
+    Raises:
+        OSError: Not enough space
+    """
+    if size <= 0 or not hasattr(os, 'posix_fallocate'):
+        return
+    try:
+        os.posix_fallocate(file.fileno(), 0, size)
+    except OSError as e:
+        if e.errno == errno.ENOSPC:
+            raise
+
+
+def send_cached_file(full_path, content, stat, environ, response_class, **kwargs):
+    """
+    Send file contents already in memory.
+
+    The response carries the same ETag and Last-Modified that
+    send_stored_file derives from the file, so client caches and
+    conditional or Range requests behave the same on both paths.
+
+    Args:
+        full_path (str): Absolute path of the file
+        content (bytes): Its contents
+        stat (os.stat_result): Its stat, matching ``content``
+        environ (dict): WSGI environment of the request
+        response_class (type): Response class to build
+        **kwargs: ``mimetype``, ``as_attachment``, ``download_name``
+
+    Returns:
+        Response: File response
+    """
+    check = zlib.adler32(full_path.encode('utf-8')) & 0xFFFFFFFF
+
+    def file_wrapper(file, buffer_size=None):
+        return BlockFileWrapper(file, max(len(content), 1))
+
+    return send_file(
+        io.BytesIO(content), dict(environ, **{'wsgi.file_wrapper': file_wrapper}),
+        response_class=response_class, etag=f'{stat.st_mtime}-{stat.st_size}-{check}',
+        last_modified=stat.st_mtime, **kwargs
+    )
+
+
+def send_stored_file(full_path, environ, block_size, response_class, drop_cache_threshold=0,
+                     **kwargs):
+    """
+    Send a file, zero-copy when the WSGI server supports it.
+
+    Headers, conditional requests and ranges are handled by werkzeug's
+    ``send_file``. The body is then the server's ``wsgi.file_wrapper``
+    when it provides one, for the whole file and for single ranges alike
+    (the file is positioned at the range start and Content-Length bounds
+    it, which is what servers such as gunicorn hand to ``sendfile(2)``);
+    otherwise a BlockFileWrapper. The file gets a sequential-access hint
+    either way, and files of at least ``drop_cache_threshold`` bytes leave
+    the page cache once sent so they don't evict hotter data.
+
+    Args:
+        full_path (str): Absolute path of the file
+        environ (dict): WSGI environment of the request
+        block_size (int): Read size of the fallback iterator
+        response_class (type): Response class to build
+        drop_cache_threshold (int): Size from which the file's pages are
+            dropped after the response (0 never drops them)
+        **kwargs: ``mimetype``, ``as_attachment``, ``download_name``
+
+    Returns:
+        Response: File response
+    """
+    server_wrapper = environ.get('wsgi.file_wrapper')
+    opened = []
+
+    def file_wrapper(file, buffer_size=None):
+        advise_sequential(file)
+        if drop_cache_threshold and os.fstat(file.fileno()).st_size >= drop_cache_threshold:
+            file = _DropCacheOnClose(file)
+        opened.append(file)
+        return BlockFileWrapper(file, block_size)
+
+    response = send_file(
+        full_path, dict(environ, **{'wsgi.file_wrapper': file_wrapper}),
+        response_class=response_class, **kwargs
+    )
+
+    if server_wrapper is not None and opened and response.status_code in (200, 206):
+        file = opened[0]
+        if response.status_code == 206:
+            file.seek(response.content_range.start)
+        response.response = server_wrapper(file, block_size)
+
+    return response
@@ -5,6 +5,9 @@ Provides miscellaneous helper functions.
 import os
 import mimetypes
 
+# Log files are plain text; mimetypes has no entry for them
+mimetypes.add_type('text/plain', '.log')
+
 
 def format_file_size(size_bytes):
     """
@@ -44,6 +47,23 @@ def get_mime_type(filename):
     return mime_type or 'application/octet-stream'
 
 
+# MIME type prefix -> icon, checked in order. Icon names double as the file
+# families accepted by listing filters.
+ICON_MAPPING = (
+    ('image/', 'image'),
+    ('video/', 'video'),
+    ('audio/', 'audio'),
+    ('application/pdf', 'pdf'),
+    ('application/msword', 'document'),
+    ('application/vnd.openxmlformats-officedocument.wordprocessingml.document', 'document'),
+    ('application/vnd.ms-excel', 'spreadsheet'),
+    ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'spreadsheet'),
+    ('application/zip', 'archive'),
+    ('application/x-rar-compressed', 'archive'),
+    ('text/', 'text'),
+)
+
+
 def get_file_icon(mime_type, is_folder=False):
     """
     Get appropriate icon name for file type.
@@ -61,27 +81,42 @@ def get_file_icon(mime_type, is_folder=False):
     if not mime_type:
         return 'file'
 
-    icon_mapping = {
-        'image/': 'image',
-        'video/': 'video',
-        'audio/': 'audio',
-        'application/pdf': 'pdf',
-        'application/msword': 'document',
-        'application/vnd.openxmlformats-officedocument.wordprocessingml.document': 'document',
-        'application/vnd.ms-excel': 'spreadsheet',
-        'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': 'spreadsheet',
-        'application/zip': 'archive',
-        'application/x-rar-compressed': 'archive',
-        'text/': 'text',
-    }
-
-    for pattern, icon in icon_mapping.items():
+    icon = ICONS_BY_MIME_TYPE.get(mime_type)
+    if icon is None:
+        icon = ICONS_BY_MIME_TYPE[mime_type] = _match_icon(mime_type)
+    return icon
+
+
+def _match_icon(mime_type):
+    """Find the icon of a MIME type by scanning ICON_MAPPING."""
+    for pattern, icon in ICON_MAPPING:
         if mime_type.startswith(pattern):
             return icon
 
     return 'file'
 
 
+# Icon of every MIME type get_mime_type can return, so listings pay a dict
+# lookup per row; any other stored type is added on first use
+ICONS_BY_MIME_TYPE = {
+    mime_type: _match_icon(mime_type)
+    for mime_type in {*mimetypes.types_map.values(), 'application/octet-stream'}
+}
+
+
+def get_mime_patterns(family):
+    """
+    Get the MIME type prefixes of a file family (an icon name such as 'image').
+
+    Args:
+        family (str): File family
+
+    Returns:
+        list: MIME type prefixes (empty if the family is unknown)
+    """
+    return [pattern for pattern, icon in ICON_MAPPING if icon == family]
+
+
 def ensure_directory_exists(directory_path):
     """
     Ensure a directory exists, create if it doesn't.
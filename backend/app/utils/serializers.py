@@ -0,0 +1,61 @@
+"""
+Serializers module.
+Selects the JSON encoder used by ``jsonify``.
+"""
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional, speeds up large listings
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider that encodes with orjson.
+
+    Output matches the default provider: dates still go through its
+    ``default`` (HTTP dates), keys are sorted when ``sort_keys`` is set,
+    and indented debug output and decoding stay on the standard library.
+    """
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self._encode(obj).decode('utf-8')
+
+    def response(self, *args, **kwargs):
+        if self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._encode(obj) + b'\n', mimetype=self.mimetype)
+
+    def _encode(self, obj):
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option)
+
+
+def create_json_provider(app):
+    """
+    Build the JSON provider described by JSON_SERIALIZER.
+
+    Args:
+        app (Flask): Application
+
+    Returns:
+        DefaultJSONProvider: ``orjson``, ``json`` (standard library), or
+        ``auto`` for orjson when it is installed
+    """
+    name = app.config['JSON_SERIALIZER']
+    if name == 'auto':
+        name = 'orjson' if orjson is not None else 'json'
+
+    if name == 'orjson':
+        if orjson is None:
+            raise RuntimeError('The orjson package is required for JSON_SERIALIZER=orjson')
+        return OrjsonProvider(app)
+    if name == 'json':
+        return DefaultJSONProvider(app)
+    raise ValueError(f'Unsupported JSON_SERIALIZER: {name}')
@@ -127,3 +127,29 @@ def sanitize_path(path):
     path = path.lstrip('/\\')
 
     return path
+
+
+def parse_fields(value, allowed):
+    """
+    Parse a sparse fieldset parameter such as ``fields=id,file_name``.
+
+    Args:
+        value (str|None): Comma-separated field names
+        allowed (iterable): Field names the resource can return
+
+    Returns:
+        tuple: (fields, error_message) - fields is a set, or None when the
+        parameter is absent (return every field)
+    """
+    if value is None:
+        return None, ""
+
+    fields = {name.strip() for name in value.split(',') if name.strip()}
+    if not fields:
+        return None, "fields must name at least one field"
+
+    unknown = fields.difference(allowed)
+    if unknown:
+        return None, f"Unknown fields: {', '.join(sorted(unknown))}"
+
+    return fields, ""
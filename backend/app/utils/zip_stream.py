@@ -0,0 +1,210 @@
+"""
+ZIP stream module.
+Lays out uncompressed ("stored") ZIP archives from file metadata alone, so
+their size, validator and any byte range are known before a byte of the
+member files is read.
+"""
+import bisect
+import hashlib
+import os
+import struct
+from collections import namedtuple
+
+# One archive entry. Directory names end with '/' and have no full_path;
+# crc32 is the CRC-32 of the file contents, which must be ``size`` bytes.
+ZipMember = namedtuple('ZipMember', ['name', 'full_path', 'size', 'crc32', 'modified'])
+
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP64_COUNT_LIMIT = 0xFFFF
+
+# General purpose flag: names are UTF-8
+UTF8_FLAG = 0x800
+
+# Version 4.5 (ZIP64), made on Unix so external attributes carry modes
+VERSION_ZIP64 = 45
+VERSION_DEFAULT = 20
+VERSION_MADE_BY = (3 << 8) | VERSION_ZIP64
+
+FILE_ATTRIBUTES = 0o100644 << 16
+DIRECTORY_ATTRIBUTES = (0o40755 << 16) | 0x10
+
+
+def _dos_datetime(modified):
+    """(time, date) fields of a datetime in MS-DOS format."""
+    if modified is None or modified.year < 1980:
+        return 0, (1 << 5) | 1
+    time = (modified.hour << 11) | (modified.minute << 5) | (modified.second // 2)
+    date = ((modified.year - 1980) << 9) | (modified.month << 5) | modified.day
+    return time, date
+
+
+def _local_header(member, name):
+    """Local file header of a member, ZIP64 when its size needs it."""
+    time, date = _dos_datetime(member.modified)
+    extra = b''
+    size = member.size
+    version = VERSION_DEFAULT
+    if size >= ZIP64_LIMIT:
+        extra = struct.pack('<HHQQ', 1, 16, size, size)
+        size = ZIP64_LIMIT
+        version = VERSION_ZIP64
+    return struct.pack(
+        '<IHHHHHIIIHH', 0x04034b50, version, UTF8_FLAG, 0, time, date,
+        member.crc32, size, size, len(name), len(extra)
+    ) + name + extra
+
+
+def _central_header(member, name, offset):
+    """Central directory record of a member, ZIP64 when sizes or offset need it."""
+    time, date = _dos_datetime(member.modified)
+    size = member.size
+    fields = []
+    if size >= ZIP64_LIMIT:
+        fields += [size, size]
+        size = ZIP64_LIMIT
+    if offset >= ZIP64_LIMIT:
+        fields.append(offset)
+        offset = ZIP64_LIMIT
+    extra = b''
+    version = VERSION_DEFAULT
+    if fields:
+        extra = struct.pack(f'<HH{len(fields)}Q', 1, 8 * len(fields), *fields)
+        version = VERSION_ZIP64
+    attributes = DIRECTORY_ATTRIBUTES if member.full_path is None else FILE_ATTRIBUTES
+    return struct.pack(
+        '<IHHHHHHIIIHHHHHII', 0x02014b50, VERSION_MADE_BY, version, UTF8_FLAG, 0, time, date,
+        member.crc32, size, size, len(name), len(extra), 0, 0, 0, attributes, offset
+    ) + name + extra
+
+
+def _end_records(count, directory_size, directory_offset):
+    """End of central directory, preceded by the ZIP64 records when needed."""
+    records = b''
+    if (count >= ZIP64_COUNT_LIMIT or directory_size >= ZIP64_LIMIT
+            or directory_offset >= ZIP64_LIMIT):
+        zip64_offset = directory_offset + directory_size
+        records = struct.pack(
+            '<IQHHIIQQQQ', 0x06064b50, 44, VERSION_MADE_BY, VERSION_ZIP64, 0, 0,
+            count, count, directory_size, directory_offset
+        ) + struct.pack('<IIQI', 0x07064b50, 0, zip64_offset, 1)
+    return records + struct.pack(
+        '<IHHHHIIH', 0x06054b50, 0, 0, min(count, ZIP64_COUNT_LIMIT),
+        min(count, ZIP64_COUNT_LIMIT), min(directory_size, ZIP64_LIMIT),
+        min(directory_offset, ZIP64_LIMIT), 0
+    )
+
+
+class StoredZip:
+    """
+    Byte layout of an uncompressed ZIP archive.
+
+    The archive is a sequence of parts: headers (bytes built here) and
+    member contents (read from disk when streamed). The same members always
+    give the same bytes, so ``etag`` - a hash of the central directory,
+    which records every name, size, CRC, date and offset - identifies the
+    archive and ranges of it can be served independently.
+
+    Attributes:
+        size (int): Exact archive size in bytes
+        etag (str): Strong validator of the archive
+    """
+
+    def __init__(self, members):
+        self._offsets = []
+        self._parts = []
+        central = []
+        offset = 0
+
+        for member in members:
+            name = member.name.encode('utf-8')
+            central.append(_central_header(member, name, offset))
+            offset = self._add(offset, _local_header(member, name))
+            if member.full_path is not None and member.size:
+                offset = self._add(offset, (member.full_path, member.size))
+
+        directory = b''.join(central)
+        trailer = directory + _end_records(len(central), len(directory), offset)
+        self._add(offset, trailer)
+        self.size = offset + len(trailer)
+        self.etag = hashlib.sha1(trailer).hexdigest()
+
+    def _add(self, offset, part):
+        """Append a part at ``offset``; return the offset after it."""
+        self._offsets.append(offset)
+        self._parts.append(part)
+        return offset + (len(part) if isinstance(part, bytes) else part[1])
+
+    def open(self, block_size):
+        """
+        Stream the archive.
+
+        Args:
+            block_size (int): Largest chunk read from a member file
+
+        Returns:
+            StoredZipReader: Seekable iterator over the archive bytes
+        """
+        return StoredZipReader(self, block_size)
+
+
+class StoredZipReader:
+    """
+    Seekable iterator over a StoredZip.
+
+    Seeking maps an archive offset onto the part holding it, so werkzeug's
+    Range handling starts reading mid-archive without reading what comes
+    before.
+    """
+
+    def __init__(self, archive, block_size):
+        self._archive = archive
+        self._block_size = block_size
+        self._position = 0
+        self._path = None
+        self._fd = None
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self._archive.size
+        self._position = offset
+
+    def tell(self):
+        return self._position
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = self._path = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        archive = self._archive
+        if self._position >= archive.size:
+            raise StopIteration()
+
+        index = bisect.bisect_right(archive._offsets, self._position) - 1
+        part = archive._parts[index]
+        skip = self._position - archive._offsets[index]
+
+        if isinstance(part, bytes):
+            data = part[skip:skip + self._block_size]
+        else:
+            full_path, size = part
+            if full_path != self._path:
+                self.close()
+                self._fd = os.open(full_path, os.O_RDONLY)
+                self._path = full_path
+            length = min(self._block_size, size - skip)
+            data = os.pread(self._fd, length, skip)
+            if len(data) != length:
+                raise OSError(f'{full_path} is shorter than recorded')
+
+        self._position += len(data)
+        return data
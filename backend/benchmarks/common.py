@@ -0,0 +1,54 @@
+"""
+Shared helpers for the benchmark scripts.
+"""
+import statistics
+import time
+from app import create_app, db
+from app.config import config, DevelopmentConfig
+from app.models.user import User
+
+
+def create_benchmark_app(database_url, **overrides):
+    """
+    Create an application bound to ``database_url`` with fresh tables.
+
+    Args:
+        database_url (str): SQLAlchemy URL of a scratch database
+        **overrides: Extra configuration values
+
+    Returns:
+        Flask: Application (call ``app.app_context()`` to use it)
+    """
+    settings = {'SQLALCHEMY_DATABASE_URI': database_url, 'SQLALCHEMY_ECHO': False, **overrides}
+    config['benchmark'] = type('BenchmarkConfig', (DevelopmentConfig,), settings)
+    app = create_app('benchmark')
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
+    return app
+
+
+def create_user(email='bench@example.com'):
+    """Insert and return a benchmark user."""
+    user = User(email=email, password='Bench123456', full_name='Benchmark')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def measure(func, repeat=5):
+    """
+    Time ``func`` ``repeat`` times.
+
+    Returns:
+        tuple: (median_seconds: float, result) with the last result of ``func``
+    """
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
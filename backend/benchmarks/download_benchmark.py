@@ -0,0 +1,135 @@
+"""
+Download throughput benchmark.
+
+Sends a large file through a local socket three ways and reports wall
+throughput and worker CPU time:
+
+- ``send_file``: Flask's send_file, iterated by the server in 8 KB blocks
+  (the download path before send_stored_file)
+- ``blocks``: send_stored_file without a server file_wrapper (large reads)
+- ``sendfile``: send_stored_file handing the file to a server
+  file_wrapper that uses os.sendfile, as gunicorn does
+
+Usage (from the backend directory):
+    python -m benchmarks.download_benchmark --size-mb 2048
+"""
+import argparse
+import os
+import socket
+import tempfile
+import threading
+import time
+from flask import send_file
+from app.utils.file_stream import send_stored_file
+from benchmarks.common import create_benchmark_app
+
+WRITE_BLOCK = 1024 * 1024
+
+
+class SendfileWrapper:
+    """Minimal stand-in for a server's sendfile-capable wsgi.file_wrapper."""
+
+    def __init__(self, file, block_size):
+        self.file = file
+
+    def close(self):
+        self.file.close()
+
+
+def create_file(path, size):
+    """Write ``size`` bytes of incompressible data."""
+    block = os.urandom(WRITE_BLOCK)
+    with open(path, 'wb') as target:
+        for _ in range(size // WRITE_BLOCK):
+            target.write(block)
+
+
+def serve(response, sock):
+    """Write a response body to ``sock`` the way a WSGI server would."""
+    body = response.response
+    try:
+        if isinstance(body, SendfileWrapper):
+            fd = body.file.fileno()
+            offset = body.file.tell()
+            remaining = response.content_length
+            while remaining > 0:
+                sent = os.sendfile(sock.fileno(), fd, offset, remaining)
+                offset += sent
+                remaining -= sent
+        else:
+            for chunk in body:
+                sock.sendall(chunk)
+    finally:
+        response.close()
+
+
+def drain(sock, total):
+    """Read and discard ``total`` bytes."""
+    buffer = bytearray(WRITE_BLOCK)
+    received = 0
+    while received < total:
+        count = sock.recv_into(buffer)
+        if not count:
+            break
+        received += count
+
+
+def run(app, make_response, path, size):
+    """Send the file once; return (wall seconds, CPU seconds of the sender)."""
+    sender, receiver = socket.socketpair()
+    sender.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4 * WRITE_BLOCK)
+    reader = threading.Thread(target=drain, args=(receiver, size))
+    reader.start()
+
+    with app.test_request_context('/'):
+        start, cpu_start = time.perf_counter(), time.thread_time()
+        serve(make_response(path), sender)
+        elapsed, cpu = time.perf_counter() - start, time.thread_time() - cpu_start
+
+    sender.close()
+    reader.join()
+    receiver.close()
+    return elapsed, cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--size-mb', type=int, default=2048)
+    parser.add_argument('--directory', default=tempfile.gettempdir())
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    app = create_benchmark_app('sqlite://')
+    block_size = app.config['DOWNLOAD_BLOCK_SIZE']
+    size = args.size_mb * WRITE_BLOCK
+    path = os.path.join(args.directory, 'mdrive_download_bench.bin')
+    create_file(path, size)
+
+    def with_environ(overrides):
+        def make_response(file_path):
+            from flask import request
+            return send_stored_file(file_path, dict(request.environ, **overrides), block_size,
+                                    app.response_class, mimetype='application/octet-stream')
+        return make_response
+
+    paths = (
+        ('send_file', lambda file_path: send_file(file_path)),
+        ('blocks', with_environ({})),
+        ('sendfile', with_environ({'wsgi.file_wrapper': SendfileWrapper})),
+    )
+
+    try:
+        print(f'{args.size_mb} MB file, best of {args.repeat}')
+        print()
+        print(f'{"path":<10} {"MB/s":>10} {"CPU s/GB":>10}')
+        for label, make_response in paths:
+            results = [run(app, make_response, path, size) for _ in range(args.repeat)]
+            elapsed, cpu = min(results)
+            gigabytes = size / 1024 ** 3
+            print(f'{label:<10} {args.size_mb / elapsed:>10,.0f} {cpu / gigabytes:>10.3f}')
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
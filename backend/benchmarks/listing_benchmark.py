@@ -0,0 +1,121 @@
+"""
+Folder listing benchmark.
+
+Compares the listing path of GET /api/files before and after column
+projection: ORM objects + ``to_dict`` + per-folder child counts + the
+standard-library encoder, against projected tuples + one grouped count,
+with each available JSON encoder.
+
+Usage (from the backend directory):
+    python -m benchmarks.listing_benchmark --rows 100 --repeat 200
+"""
+import argparse
+import uuid as uuid_lib
+from datetime import datetime
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import insert
+from app import db
+from app.models.file import File
+from app.services.file_service import FileService
+from app.utils.helpers import ICON_MAPPING
+from app.utils.serializers import OrjsonProvider, orjson
+from benchmarks.common import create_benchmark_app, create_user, measure
+
+MIME_TYPES = ('application/pdf', 'image/jpeg', 'text/plain', 'video/mp4',
+              'application/zip', 'application/octet-stream')
+
+
+def populate(user, rows, folder_ratio):
+    """Insert ``rows`` root entries, ``folder_ratio`` of them folders with one child."""
+    now = datetime.utcnow()
+    folders = int(rows * folder_ratio)
+    entries = []
+    for index in range(rows):
+        is_folder = index < folders
+        entries.append({
+            'uuid': str(uuid_lib.uuid4()), 'user_uuid': user.uuid, 'parent_folder_uuid': None,
+            'file_name': f'entry-{index:06d}', 'file_path': f'entry-{index:06d}',
+            'file_size': 0 if is_folder else 1024 * index,
+            'mime_type': None if is_folder else MIME_TYPES[index % len(MIME_TYPES)],
+            'is_folder': is_folder, 'is_deleted': False, 'created_at': now, 'updated_at': now
+        })
+    children = [{
+        'uuid': str(uuid_lib.uuid4()), 'user_uuid': user.uuid,
+        'parent_folder_uuid': entry['uuid'], 'file_name': 'child.txt',
+        'file_path': f"{entry['file_name']}/child.txt", 'file_size': 1,
+        'mime_type': 'text/plain', 'is_folder': False, 'is_deleted': False,
+        'created_at': now, 'updated_at': now
+    } for entry in entries if entry['is_folder']]
+    db.session.execute(insert(File), entries + children)
+    db.session.commit()
+
+
+def legacy_icon(mime_type, is_folder):
+    """get_file_icon before the MIME type table: a prefix scan per row."""
+    if is_folder:
+        return 'folder'
+    for pattern, icon in ICON_MAPPING:
+        if mime_type and mime_type.startswith(pattern):
+            return icon
+    return 'file'
+
+
+def legacy_listing(user, per_page, provider):
+    """The listing path this change replaces."""
+    items = File.query.filter_by(
+        user_uuid=user.uuid, parent_folder_uuid=None, is_deleted=False
+    ).order_by(File.is_folder.desc(), File.file_name).paginate(
+        page=1, per_page=per_page, error_out=False).items
+    files = []
+    for file in items:
+        file_data = {**file.to_dict(), 'icon': legacy_icon(file.mime_type, file.is_folder)}
+        if file.is_folder:
+            file_data['item_count'] = file.children.filter(File.is_deleted == False).count()
+        files.append(file_data)
+    body = provider.dumps({'files': files})
+    db.session.remove()
+    return body
+
+
+def projected_listing(user, per_page, provider):
+    """The current FileService.get_files path."""
+    _, data, _ = FileService.get_files(user, per_page=per_page)
+    body = provider.dumps(data)
+    db.session.remove()
+    return body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=100)
+    parser.add_argument('--folder-ratio', type=float, default=0.1)
+    parser.add_argument('--database-url', default='sqlite:////tmp/mdrive_listing_bench.db')
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    app = create_benchmark_app(args.database_url)
+    providers = [('json', DefaultJSONProvider(app))]
+    if orjson is not None:
+        providers.append(('orjson', OrjsonProvider(app)))
+
+    with app.app_context():
+        user = create_user()
+        user_uuid = user.uuid
+        populate(user, args.rows, args.folder_ratio)
+
+        print(f'{args.rows} entries per page, {args.folder_ratio:.0%} folders')
+        print()
+        print(f'{"path":<24} {"per page":>10} {"rows/sec":>12}')
+        for label, listing, (encoder, provider) in (
+            [('ORM + to_dict', legacy_listing, providers[0])]
+            + [('projected', projected_listing, entry) for entry in providers]
+        ):
+            def run():
+                return listing(db.session.get(type(user), user_uuid), args.rows, provider)
+            elapsed, _ = measure(run, args.repeat)
+            name = f'{label} ({encoder})'
+            print(f'{name:<24} {elapsed * 1000:>8.2f}ms {args.rows / elapsed:>12,.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""
+Mixed-workload page-cache benchmark.
+
+Warms a hot set of small files, then uploads (StorageService.save_file)
+and downloads (send_stored_file) one large file, with the page-cache
+hints off and on. Reports the transfer throughput, how much of the hot
+set is still cached afterwards (mincore) and how long re-reading it takes:
+without hints the large transfer evicts the hot set, which then has to
+come back from disk.
+
+Usage (from the backend directory):
+    python -m benchmarks.mixed_io_benchmark --size-mb 6144
+"""
+import argparse
+import ctypes
+import mmap
+import os
+import shutil
+import tempfile
+import time
+from werkzeug.datastructures import FileStorage
+from app.services.storage_service import StorageService
+from app.utils.file_stream import drop_cached_pages, send_stored_file
+from benchmarks.common import create_benchmark_app
+
+WRITE_BLOCK = 1024 * 1024
+USER = 'bench'
+
+libc = ctypes.CDLL(None, use_errno=True)
+
+
+def memory_mb():
+    """Total RAM in MB, from /proc/meminfo."""
+    with open('/proc/meminfo') as meminfo:
+        for line in meminfo:
+            if line.startswith('MemTotal:'):
+                return int(line.split()[1]) // 1024
+    return 4096
+
+
+def cached_fraction(paths):
+    """Fraction of the pages of ``paths`` resident in the page cache."""
+    page = mmap.PAGESIZE
+    resident = total = 0
+    for path in paths:
+        size = os.path.getsize(path)
+        # A private mapping is writable, so ctypes can take its address;
+        # untouched pages still report the file's page-cache residency
+        with open(path, 'rb') as file, mmap.mmap(file.fileno(), size,
+                                                 access=mmap.ACCESS_COPY) as mapped:
+            pages = (size + page - 1) // page
+            vector = (ctypes.c_ubyte * pages)()
+            view = ctypes.c_char.from_buffer(mapped)
+            failed = libc.mincore(ctypes.c_void_p(ctypes.addressof(view)),
+                                  ctypes.c_size_t(size), vector)
+            del view
+            if failed:
+                raise OSError(ctypes.get_errno(), 'mincore failed')
+            resident += sum(byte & 1 for byte in vector)
+            total += pages
+    return resident / total
+
+
+def read_all(paths):
+    """Read ``paths`` once; return the elapsed seconds."""
+    start = time.perf_counter()
+    for path in paths:
+        with open(path, 'rb') as file:
+            while file.read(WRITE_BLOCK):
+                pass
+    return time.perf_counter() - start
+
+
+def create_file(path, size):
+    """Write ``size`` bytes of incompressible data and drop it from the cache."""
+    block = os.urandom(WRITE_BLOCK)
+    with open(path, 'wb') as target:
+        for _ in range(size // WRITE_BLOCK):
+            target.write(block)
+        remainder = size % WRITE_BLOCK
+        target.write(block[:remainder])
+        drop_cached_pages(target, sync=True)
+
+
+def run(app, hints, source, hot_paths):
+    """Upload and download ``source`` next to a warm hot set."""
+    app.config['IO_DROP_CACHE_THRESHOLD'] = 64 * WRITE_BLOCK if hints else 0
+    app.config['IO_PREALLOCATE'] = hints
+    size = os.path.getsize(source)
+
+    read_all(hot_paths)
+    with app.test_request_context('/'):
+        from flask import request
+        with open(source, 'rb') as stream:
+            start = time.perf_counter()
+            success, message, _, _ = StorageService.save_file(
+                USER, FileStorage(stream, 'big.bin'), 'big.bin')
+            upload = time.perf_counter() - start
+        assert success, message
+
+        full_path = StorageService.get_full_path(USER, 'big.bin')
+        start = time.perf_counter()
+        response = send_stored_file(
+            full_path, request.environ, app.config['DOWNLOAD_BLOCK_SIZE'], app.response_class,
+            drop_cache_threshold=app.config['IO_DROP_CACHE_THRESHOLD'],
+            mimetype='application/octet-stream')
+        for _ in response.response:
+            pass
+        response.response.close()
+        download = time.perf_counter() - start
+
+    residency = cached_fraction(hot_paths)
+    reread = read_all(hot_paths)
+    os.remove(full_path)
+
+    megabytes = size / WRITE_BLOCK
+    return megabytes / upload, megabytes / download, residency, reread
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--size-mb', type=int, default=memory_mb(),
+                        help='size of the large file (default: total RAM)')
+    parser.add_argument('--hot-files', type=int, default=2000)
+    parser.add_argument('--hot-kb', type=int, default=64)
+    parser.add_argument('--directory', default=tempfile.gettempdir())
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix='mdrive_mixed_io_', dir=args.directory)
+    app = create_benchmark_app('sqlite://', UPLOAD_FOLDER=os.path.join(root, 'userdata'))
+
+    try:
+        hot_dir = os.path.join(root, 'hot')
+        os.makedirs(hot_dir)
+        hot_paths = []
+        block = os.urandom(args.hot_kb * 1024)
+        for index in range(args.hot_files):
+            path = os.path.join(hot_dir, f'{index}.bin')
+            with open(path, 'wb') as target:
+                target.write(block)
+            hot_paths.append(path)
+
+        source = os.path.join(root, 'source.bin')
+        create_file(source, args.size_mb * WRITE_BLOCK)
+
+        hot_mb = args.hot_files * args.hot_kb / 1024
+        print(f'{args.size_mb} MB upload + download, hot set {hot_mb:.0f} MB '
+              f'in {args.hot_files} files')
+        print()
+        print(f'{"hints":<6} {"up MB/s":>9} {"down MB/s":>10} {"hot cached":>11} {"re-read s":>10}')
+        for hints in (False, True):
+            upload, download, residency, reread = run(app, hints, source, hot_paths)
+            label = 'on' if hints else 'off'
+            print(f'{label:<6} {upload:>9,.0f} {download:>10,.0f} {residency:>10.0%} {reread:>10.3f}')
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Filename search benchmark.
+
+Fills a scratch database with a synthetic drive and compares the n-gram
+index used by GET /api/files/search with a plain ``LIKE '%q%'`` scan.
+
+Usage (from the backend directory):
+    python -m benchmarks.search_benchmark --rows 1000000 \
+        --database-url sqlite:////tmp/mdrive_search_bench.db
+"""
+import argparse
+import random
+import uuid as uuid_lib
+from datetime import datetime
+from sqlalchemy import func, insert, select
+from app import db
+from app.models.file import File
+from app.models.search_term import SearchTerm
+from app.services.search_service import SearchService
+from benchmarks.common import create_benchmark_app, create_user, measure
+
+WORDS = ('report', 'invoice', 'holiday', 'scan', 'budget', 'photo', 'draft', 'contract',
+         'meeting', 'notes', 'backup', 'summary', 'project', 'family', 'receipt', 'slides')
+EXTENSIONS = ('pdf', 'txt', 'jpg', 'png', 'docx', 'zip', 'mp3')
+QUERIES = ('invoice', 'rep', 'q3', 'budget_2019', 'zzz-no-match', 'photo 17')
+INSERT_BATCH_SIZE = 10000
+
+
+def populate(user, rows, seed):
+    """Insert ``rows`` files and their index terms in batches."""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    for start in range(0, rows, INSERT_BATCH_SIZE):
+        files = []
+        terms = []
+        for index in range(start, min(start + INSERT_BATCH_SIZE, rows)):
+            name = (f'{rng.choice(WORDS)}{rng.choice(("_", "-", " "))}{rng.randint(2000, 2025)}'
+                    f'{rng.choice(("", "_q1", "_q2", "_q3", "_q4", " final"))}'
+                    f'.{rng.choice(EXTENSIONS)}')
+            file_uuid = str(uuid_lib.uuid4())
+            files.append({
+                'uuid': file_uuid, 'user_uuid': user.uuid, 'parent_folder_uuid': None,
+                'file_name': name, 'file_path': f'{index}/{name}', 'file_size': 1024,
+                'mime_type': 'application/octet-stream', 'is_folder': False,
+                'is_deleted': False, 'created_at': now, 'updated_at': now
+            })
+            terms += [{'user_uuid': user.uuid, 'term': term, 'file_uuid': file_uuid}
+                      for term in SearchService.terms_for(name)]
+        db.session.execute(insert(File), files)
+        db.session.execute(insert(SearchTerm), terms)
+        db.session.commit()
+
+
+def naive_search(user, query, limit):
+    """The query this endpoint replaces: a substring scan of every name."""
+    escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return db.session.execute(
+        select(File.uuid).where(
+            File.user_uuid == user.uuid,
+            File.is_deleted == False,
+            func.lower(File.file_name).like('%' + escaped + '%', escape='\\')
+        ).order_by(File.file_name).limit(limit)
+    ).all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--database-url', default='sqlite:////tmp/mdrive_search_bench.db')
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    app = create_benchmark_app(args.database_url)
+    with app.app_context():
+        user = create_user()
+        elapsed, _ = measure(lambda: populate(user, args.rows, args.seed), repeat=1)
+        term_rows = db.session.query(func.count()).select_from(SearchTerm).scalar()
+        print(f'Inserted {args.rows} files and {term_rows} index terms in {elapsed:.1f}s')
+        print()
+        print(f'{"query":<16} {"LIKE scan":>12} {"n-gram index":>14} {"hits":>6}')
+
+        for query in QUERIES:
+            like_time, _ = measure(lambda: naive_search(user, query, args.limit), args.repeat)
+            index_time, result = measure(
+                lambda: SearchService.search(user, query, limit=args.limit), args.repeat)
+            hits = len(result[1]['files'])
+            print(f'{query:<16} {like_time * 1000:>10.2f}ms {index_time * 1000:>12.2f}ms {hits:>6}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""add change journal
+
+Revision ID: a3c9e5f7b1d2
+Revises: f1a7c2d4b8e6
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c9e5f7b1d2'
+down_revision = 'f1a7c2d4b8e6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('users', sa.Column('change_seq', sa.BigInteger(), nullable=False,
+                                     server_default='0'))
+
+    op.create_table(
+        'changes',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('user_uuid', sa.String(length=36), nullable=False),
+        sa.Column('seq', sa.BigInteger(), nullable=False),
+        sa.Column('action', sa.Enum('CREATE', 'RENAME', 'MOVE', 'DELETE', 'RESTORE', 'PURGE',
+                                    name='changeaction'), nullable=False),
+        sa.Column('file_uuid', sa.String(length=36), nullable=False),
+        sa.Column('parent_folder_uuid', sa.String(length=36), nullable=True),
+        sa.Column('file_name', sa.String(length=255), nullable=False),
+        sa.Column('file_path', sa.String(length=500), nullable=False),
+        sa.Column('is_folder', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_uuid'], ['users.uuid'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_uuid', 'seq', name='uq_changes_user_seq'),
+    )
+    op.create_index('idx_changes_created', 'changes', ['created_at'])
+
+
+def downgrade():
+    op.drop_index('idx_changes_created', table_name='changes')
+    op.drop_table('changes')
+    op.drop_column('users', 'change_seq')
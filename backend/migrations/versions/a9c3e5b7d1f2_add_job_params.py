@@ -0,0 +1,22 @@
+"""Add params to jobs table
+
+Revision ID: a9c3e5b7d1f2
+Revises: f3b9d1e7a2c4
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a9c3e5b7d1f2'
+down_revision = 'f3b9d1e7a2c4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('jobs', sa.Column('params', sa.Text(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('jobs', 'params')
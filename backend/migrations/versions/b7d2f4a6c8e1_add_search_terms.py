@@ -0,0 +1,36 @@
+"""add search terms
+
+Revision ID: b7d2f4a6c8e1
+Revises: a3c9e5f7b1d2
+Create Date: 2026-10-19 00:00:00.000000
+
+Existing files are not indexed by this migration; run
+``flask reindex-search`` once after upgrading.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2f4a6c8e1'
+down_revision = 'a3c9e5f7b1d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'search_terms',
+        sa.Column('user_uuid', sa.String(length=36), nullable=False),
+        sa.Column('term', sa.String(length=3), nullable=False),
+        sa.Column('file_uuid', sa.String(length=36), nullable=False),
+        sa.ForeignKeyConstraint(['file_uuid'], ['files.uuid'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_uuid', 'term', 'file_uuid'),
+    )
+    op.create_index('ix_search_terms_file_uuid', 'search_terms', ['file_uuid'])
+
+
+def downgrade():
+    op.drop_index('ix_search_terms_file_uuid', table_name='search_terms')
+    op.drop_table('search_terms')
@@ -0,0 +1,40 @@
+"""add content postings
+
+Revision ID: c4e8a1d3f5b7
+Revises: b7d2f4a6c8e1
+Create Date: 2026-10-19 00:00:00.000000
+
+Existing documents are not indexed by this migration; run
+``flask reindex-content`` once after upgrading.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e8a1d3f5b7'
+down_revision = 'b7d2f4a6c8e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'content_postings',
+        sa.Column('user_uuid', sa.String(length=36), nullable=False),
+        sa.Column('token', sa.String(length=64).with_variant(
+            mysql.VARCHAR(length=64, collation='utf8mb4_bin'), 'mysql'), nullable=False),
+        sa.Column('file_uuid', sa.String(length=36), nullable=False),
+        sa.Column('occurrences', sa.Integer(), nullable=False),
+        sa.Column('offset', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['file_uuid'], ['files.uuid'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_uuid', 'token', 'file_uuid'),
+    )
+    op.create_index('ix_content_postings_file_uuid', 'content_postings', ['file_uuid'])
+
+
+def downgrade():
+    op.drop_index('ix_content_postings_file_uuid', table_name='content_postings')
+    op.drop_table('content_postings')
@@ -0,0 +1,31 @@
+"""add listing sort indexes
+
+Revision ID: d6f1b3a5c7e9
+Revises: c4e8a1d3f5b7
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd6f1b3a5c7e9'
+down_revision = 'c4e8a1d3f5b7'
+branch_labels = None
+depends_on = None
+
+LISTING_PREFIX = ['user_uuid', 'parent_folder_uuid', 'is_deleted', 'is_folder']
+
+
+def upgrade():
+    op.create_index('idx_list_name', 'files', LISTING_PREFIX + ['file_name'])
+    op.create_index('idx_list_size', 'files', LISTING_PREFIX + ['file_size', 'file_name'])
+    op.create_index('idx_list_updated_at', 'files', LISTING_PREFIX + ['updated_at', 'file_name'])
+    op.create_index('idx_list_type', 'files', LISTING_PREFIX + ['mime_type', 'file_name'])
+
+
+def downgrade():
+    op.drop_index('idx_list_type', table_name='files')
+    op.drop_index('idx_list_updated_at', table_name='files')
+    op.drop_index('idx_list_size', table_name='files')
+    op.drop_index('idx_list_name', table_name='files')
@@ -0,0 +1,27 @@
+"""add drive view indexes
+
+Revision ID: e8a2c4f6b1d3
+Revises: d6f1b3a5c7e9
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8a2c4f6b1d3'
+down_revision = 'd6f1b3a5c7e9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('idx_user_deleted_updated_at', 'files',
+                    ['user_uuid', 'is_deleted', 'updated_at', 'uuid'])
+    op.create_index('idx_user_deleted_file_size', 'files',
+                    ['user_uuid', 'is_deleted', 'file_size', 'uuid'])
+
+
+def downgrade():
+    op.drop_index('idx_user_deleted_file_size', table_name='files')
+    op.drop_index('idx_user_deleted_updated_at', table_name='files')
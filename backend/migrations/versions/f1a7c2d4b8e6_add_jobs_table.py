@@ -0,0 +1,40 @@
+"""add jobs table
+
+Revision ID: f1a7c2d4b8e6
+Revises: e4a1b2c3d4e5
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1a7c2d4b8e6'
+down_revision = 'e4a1b2c3d4e5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'jobs',
+        sa.Column('uuid', sa.String(length=36), nullable=False),
+        sa.Column('user_uuid', sa.String(length=36), nullable=False),
+        sa.Column('kind', sa.String(length=50), nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'RUNNING', 'COMPLETED', 'FAILED',
+                                    name='jobstatus'), nullable=False),
+        sa.Column('progress', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_uuid'], ['users.uuid'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('uuid'),
+    )
+    op.create_index('ix_jobs_user_uuid', 'jobs', ['user_uuid'])
+
+
+def downgrade():
+    op.drop_index('ix_jobs_user_uuid', table_name='jobs')
+    op.drop_table('jobs')
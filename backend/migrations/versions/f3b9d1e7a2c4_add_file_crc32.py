@@ -0,0 +1,22 @@
+"""Add crc32 to files table
+
+Revision ID: f3b9d1e7a2c4
+Revises: e8a2c4f6b1d3
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'f3b9d1e7a2c4'
+down_revision = 'e8a2c4f6b1d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('files', sa.Column('crc32', sa.BigInteger(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('files', 'crc32')
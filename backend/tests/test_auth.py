@@ -164,6 +164,23 @@ class TestUserProfile:
         data = response.get_json()
         assert data['user']['email'] == 'test@example.com'
 
+    def test_get_profile_fields(self, client):
+        """Test getting selected profile fields."""
+        register_response = client.post('/api/auth/register', json={
+            'email': 'test@example.com',
+            'password': 'Test123456',
+            'full_name': 'Test User'
+        })
+        token = register_response.get_json()['access_token']
+        headers = {'Authorization': f'Bearer {token}'}
+
+        response = client.get('/api/auth/profile?fields=email,storage_used', headers=headers)
+        assert response.status_code == 200
+        assert response.get_json()['user'] == {'email': 'test@example.com', 'storage_used': 0}
+
+        response = client.get('/api/auth/profile?fields=password_hash', headers=headers)
+        assert response.status_code == 400
+
     def test_get_profile_unauthorized(self, client):
         """Test getting profile without token."""
         response = client.get('/api/auth/profile')
@@ -0,0 +1,1502 @@
+"""
+File management tests
+Tests for file and folder operations.
+"""
+import gzip
+import io
+import json
+import os
+import zipfile
+import zlib
+import pytest
+from app import create_app, db
+from app.models.file import File
+from app.services.archive_service import ArchiveService
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Create and configure a test app instance."""
+    app = create_app('development')
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['UPLOAD_FOLDER'] = str(tmp_path)
+    app.config['JOB_WORKERS'] = 0
+    app.config['CONTENT_INDEX_WORKERS'] = 0
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Create a test client."""
+    return app.test_client()
+
+
+@pytest.fixture
+def headers(client):
+    """Register a user and return its Authorization header."""
+    response = client.post('/api/auth/register', json={
+        'email': 'test@example.com',
+        'password': 'Test123456',
+        'full_name': 'Test User'
+    })
+    token = response.get_json()['access_token']
+    return {'Authorization': f'Bearer {token}'}
+
+
+def create_folder(client, headers, name, parent=None):
+    """Create a folder and return its JSON representation."""
+    response = client.post('/api/files/folder', headers=headers, json={
+        'folder_name': name,
+        'parent_folder_id': parent
+    })
+    assert response.status_code == 201
+    return response.get_json()['folder']
+
+
+def upload(client, headers, name, content=b'hello', parent=None):
+    """Upload a file and return its JSON representation."""
+    data = {'file': (io.BytesIO(content), name)}
+    if parent:
+        data['parent_folder_id'] = parent
+    response = client.post('/api/files/upload', headers=headers, data=data,
+                           content_type='multipart/form-data')
+    assert response.status_code == 201
+    return response.get_json()['file']
+
+
+class TestMoveAndCopy:
+    """Test server-side move and copy."""
+
+    def test_move_folder_rewrites_descendant_paths(self, app, client, headers):
+        """Moving a folder moves its whole subtree on disk and in the DB."""
+        src = create_folder(client, headers, 'src')
+        inner = create_folder(client, headers, 'inner', src['id'])
+        upload(client, headers, 'a.txt', parent=inner['id'])
+        dst = create_folder(client, headers, 'dst')
+
+        response = client.post('/api/files/move', headers=headers, json={
+            'file_ids': [src['id']],
+            'target_folder_id': dst['id']
+        })
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['failed'] == []
+        assert data['moved'][0]['file_path'] == 'dst/src'
+
+        moved = File.query.filter_by(file_name='a.txt').first()
+        assert moved.file_path == 'dst/src/inner/a.txt'
+        user_dir = os.path.join(app.config['UPLOAD_FOLDER'], moved.user_uuid)
+        assert os.path.isfile(os.path.join(user_dir, 'dst/src/inner/a.txt'))
+
+    def test_move_folder_into_itself(self, client, headers):
+        """A folder can't be moved below itself."""
+        src = create_folder(client, headers, 'src')
+        inner = create_folder(client, headers, 'inner', src['id'])
+
+        response = client.post('/api/files/move', headers=headers, json={
+            'file_ids': [src['id']],
+            'target_folder_id': inner['id']
+        })
+
+        data = response.get_json()
+        assert data['moved'] == []
+        assert data['failed'][0]['id'] == src['id']
+
+    def test_move_name_conflict(self, client, headers):
+        """An item isn't moved over an existing name."""
+        dst = create_folder(client, headers, 'dst')
+        upload(client, headers, 'a.txt', parent=dst['id'])
+        file = upload(client, headers, 'a.txt')
+
+        response = client.post('/api/files/move', headers=headers, json={
+            'file_ids': [file['id']],
+            'target_folder_id': dst['id']
+        })
+
+        data = response.get_json()
+        assert data['failed'] == [{'id': file['id'], 'error': 'Name already exists'}]
+
+    def test_copy_folder_updates_quota(self, app, client, headers):
+        """Copying a subtree duplicates rows and files and charges the quota."""
+        src = create_folder(client, headers, 'src')
+        upload(client, headers, 'a.txt', b'12345', parent=src['id'])
+        dst = create_folder(client, headers, 'dst')
+
+        response = client.post('/api/files/copy', headers=headers, json={
+            'file_ids': [src['id']],
+            'target_folder_id': dst['id']
+        })
+
+        assert response.status_code == 200
+        copied = response.get_json()['copied'][0]
+        assert copied['id'] != src['id']
+        assert copied['parent_folder_id'] == dst['id']
+
+        clone = File.query.filter_by(file_path='dst/src/a.txt').first()
+        assert clone.parent_folder_uuid == copied['id']
+        assert clone.owner.storage_used == 10
+
+        user_dir = os.path.join(app.config['UPLOAD_FOLDER'], clone.user_uuid)
+        with open(os.path.join(user_dir, 'dst/src/a.txt'), 'rb') as f:
+            assert f.read() == b'12345'
+        # A copy, not a second name for the same inode
+        assert not os.path.samefile(os.path.join(user_dir, 'dst/src/a.txt'),
+                                    os.path.join(user_dir, 'src/a.txt'))
+
+
+class TestBatchOperations:
+    """Test the transactional batch endpoint."""
+
+    def test_mixed_operations(self, client, headers):
+        """Each operation reports its own result."""
+        folder = create_folder(client, headers, 'docs')
+        inner = upload(client, headers, 'a.txt', b'123', parent=folder['id'])
+        other = upload(client, headers, 'b.txt', b'45')
+
+        response = client.post('/api/files/batch', headers=headers, json={
+            'operations': [
+                {'op': 'rename', 'id': other['id'], 'new_name': 'c.txt'},
+                {'op': 'delete', 'id': folder['id']},
+                {'op': 'delete', 'id': 'missing'},
+                {'op': 'explode', 'id': other['id']},
+            ]
+        })
+
+        assert response.status_code == 200
+        results = response.get_json()['results']
+        assert [r['success'] for r in results] == [True, True, False, False]
+        assert results[2]['status'] == 404
+
+        assert File.query.get(other['id']).file_name == 'c.txt'
+        child = File.query.get(inner['id'])
+        assert child.is_deleted
+        assert child.parent_folder_uuid == folder['id']
+
+    def test_restore_and_purge(self, client, headers):
+        """Restored subtrees are reattached; purges release quota."""
+        folder = create_folder(client, headers, 'docs')
+        inner = upload(client, headers, 'a.txt', b'123', parent=folder['id'])
+        other = upload(client, headers, 'b.txt', b'45')
+        client.post('/api/files/batch', headers=headers, json={
+            'operations': [{'op': 'delete', 'id': folder['id']},
+                           {'op': 'delete', 'id': other['id']}]
+        })
+
+        response = client.post('/api/files/batch', headers=headers, json={
+            'operations': [{'op': 'restore', 'id': folder['id']},
+                           {'op': 'permanent_delete', 'id': other['id']}]
+        })
+
+        assert all(r['success'] for r in response.get_json()['results'])
+        restored = File.query.get(folder['id'])
+        assert not restored.is_deleted
+        assert restored.parent_folder_uuid is None
+        child = File.query.get(inner['id'])
+        assert not child.is_deleted
+        assert child.parent_folder_uuid == folder['id']
+        assert File.query.get(other['id']) is None
+        assert restored.owner.storage_used == 3
+
+
+class TestMultiUpload:
+    """Test multi-file upload."""
+
+    def test_upload_many_files(self, client, headers):
+        """Valid files are stored in one go; invalid ones are reported."""
+        folder = create_folder(client, headers, 'photos')
+        upload(client, headers, 'taken.txt', parent=folder['id'])
+
+        response = client.post('/api/files/upload-multiple', headers=headers, data={
+            'parent_folder_id': folder['id'],
+            'file': [
+                (io.BytesIO(b'one'), 'a.txt'),
+                (io.BytesIO(b'three'), 'b.txt'),
+                (io.BytesIO(b'x'), 'taken.txt'),
+                (io.BytesIO(b'x'), 'evil.exe'),
+            ]
+        }, content_type='multipart/form-data')
+
+        assert response.status_code == 200
+        results = response.get_json()['results']
+        assert [r['status'] for r in results] == [201, 201, 409, 400]
+        assert results[0]['file']['parent_folder_id'] == folder['id']
+
+        names = {f.file_name for f in File.query.filter_by(parent_folder_uuid=folder['id'])}
+        assert names == {'taken.txt', 'a.txt', 'b.txt'}
+        assert File.query.get(results[1]['file']['id']).owner.storage_used == 5 + 3 + 5
+
+
+class TestTreeUpload:
+    """Test folder-tree upload."""
+
+    def test_upload_tree_creates_missing_folders(self, app, client, headers):
+        """Folders are created once and reused; existing ones are kept."""
+        existing = create_folder(client, headers, 'project')
+
+        response = client.post('/api/files/upload-tree', headers=headers, data={
+            'file': [
+                (io.BytesIO(b'a'), 'a.txt'),
+                (io.BytesIO(b'bb'), 'b.txt'),
+                (io.BytesIO(b'c'), 'c.txt'),
+            ],
+            'paths': ['project/src/a.txt', 'project/src/lib/b.txt', 'docs/c.txt'],
+        }, content_type='multipart/form-data')
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['folders_created'] == 3
+        assert all(r['success'] for r in data['results'])
+
+        src = File.query.filter_by(file_path='project/src').first()
+        assert src.parent_folder_uuid == existing['id']
+        b = File.query.filter_by(file_path='project/src/lib/b.txt').first()
+        assert b.parent.parent_folder_uuid == src.uuid
+
+        user_dir = os.path.join(app.config['UPLOAD_FOLDER'], b.user_uuid)
+        assert os.path.isfile(os.path.join(user_dir, 'project/src/lib/b.txt'))
+
+    def test_upload_tree_blocked_by_file(self, client, headers):
+        """A file standing where a folder is needed blocks that subtree."""
+        upload(client, headers, 'notes.txt')
+
+        response = client.post('/api/files/upload-tree', headers=headers, data={
+            'file': [(io.BytesIO(b'a'), 'a.txt')],
+            'manifest': '{"files": ["notes.txt/a.txt"], "folders": ["empty"]}',
+        }, content_type='multipart/form-data')
+
+        data = response.get_json()
+        assert data['results'][0]['status'] == 409
+        assert data['folders_created'] == 1
+
+
+def make_zip(members):
+    """Build an in-memory ZIP archive from a {name: bytes} mapping."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for name, content in members.items():
+            zf.writestr(name, content)
+    return buffer.getvalue()
+
+
+class TestArchiveExtraction:
+    """Test server-side archive extraction."""
+
+    def test_extract_zip(self, app, client, headers):
+        """Members are extracted next to the archive; unsafe ones are skipped."""
+        folder = create_folder(client, headers, 'inbox')
+        archive = upload(client, headers, 'bundle.zip', make_zip({
+            'docs/readme.txt': b'hello',
+            'docs/sub/': b'',
+            'a.png': b'png',
+            '../evil.txt': b'x',
+            'tool.exe': b'x',
+        }), parent=folder['id'])
+
+        response = client.post(f"/api/files/{archive['id']}/extract", headers=headers)
+
+        assert response.status_code == 202
+        job = response.get_json()['job']
+        assert job['status'] == 'COMPLETED'
+
+        response = client.get(f"/api/files/jobs/{job['id']}", headers=headers)
+        result = response.get_json()['job']['result']
+        assert result['files_extracted'] == 2
+        assert result['folders_created'] == 2
+        assert {item['path'] for item in result['skipped']} == {'../evil.txt', 'tool.exe'}
+
+        readme = File.query.filter_by(file_path='inbox/docs/readme.txt').first()
+        assert readme.parent.parent_folder_uuid == folder['id']
+        assert File.query.filter_by(file_path='inbox/docs/sub', is_folder=True).count() == 1
+        user_dir = os.path.join(app.config['UPLOAD_FOLDER'], readme.user_uuid)
+        with open(os.path.join(user_dir, 'inbox/docs/readme.txt'), 'rb') as f:
+            assert f.read() == b'hello'
+
+    def test_interrupted_job_fails(self, app, client, headers):
+        """Jobs left running by a dead worker are failed when read."""
+        from datetime import datetime, timedelta
+        from app.models.job import Job, JobStatus
+        archive = upload(client, headers, 'bundle.zip', make_zip({'a.txt': b'a'}))
+        user_uuid = File.query.filter_by(uuid=archive['id']).one().user_uuid
+        stale_after = timedelta(seconds=app.config['JOB_STALE_SECONDS'] + 1)
+        jobs = [Job(user_uuid, 'extract') for _ in range(2)]
+        jobs[0].status = JobStatus.RUNNING
+        jobs[0].updated_at = datetime.utcnow() - stale_after
+        jobs[1].status = JobStatus.RUNNING
+        db.session.add_all(jobs)
+        db.session.commit()
+        stale_uuid, live_uuid = jobs[0].uuid, jobs[1].uuid
+
+        job = client.get(f'/api/files/jobs/{stale_uuid}', headers=headers).get_json()['job']
+        assert (job['status'], job['error']) == ('FAILED', 'interrupted')
+        job = client.get(f'/api/files/jobs/{live_uuid}', headers=headers).get_json()['job']
+        assert job['status'] == 'RUNNING'
+
+    def test_failed_member_leaves_no_partial_file(self, tmp_path):
+        """A member failing mid-stream is removed, so a retry can write it."""
+        data = os.urandom(3 * 1024 * 1024)
+        path = tmp_path / 'corrupt.zip'
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED) as archive:
+            archive.writestr('big.bin', data)
+        raw = bytearray(path.read_bytes())
+        offset = raw.index(data[-16:])
+        raw[offset] ^= 0xFF
+        path.write_bytes(bytes(raw))
+        destination = str(tmp_path / 'big.bin')
+
+        with ArchiveService.open_archive(str(path), 'zip') as archive:
+            members, _ = ArchiveService.list_members(archive)
+            with pytest.raises(zipfile.BadZipFile):
+                ArchiveService.extract_member(archive, members[0], destination)
+        assert not os.path.exists(destination)
+
+        path.write_bytes(make_zip({'big.bin': data}))
+        with ArchiveService.open_archive(str(path), 'zip') as archive:
+            members, _ = ArchiveService.list_members(archive)
+            written, crc32 = ArchiveService.extract_member(archive, members[0], destination)
+        assert written == len(data)
+        assert crc32 == zlib.crc32(data)
+
+    def test_extract_rejects_bomb(self, client, headers):
+        """Archives with an extreme compression ratio fail without writing."""
+        archive = upload(client, headers, 'bomb.zip', make_zip({
+            'zeros.txt': b'\0' * (8 * 1024 * 1024)
+        }))
+
+        job = client.post(f"/api/files/{archive['id']}/extract",
+                          headers=headers).get_json()['job']
+
+        assert job['status'] == 'FAILED'
+        assert 'ratio' in job['error']
+        assert File.query.filter_by(file_name='zeros.txt').count() == 0
+
+
+class TestChangeJournal:
+    """Test the change journal and delta-sync feed."""
+
+    def test_changes_since_cursor(self, client, headers):
+        """Every mutation is journaled with consecutive sequence numbers."""
+        start = client.get('/api/files/changes', headers=headers).get_json()
+        assert start['changes'] == []
+
+        folder = create_folder(client, headers, 'docs')
+        file = upload(client, headers, 'a.txt', parent=folder['id'])
+        client.put(f"/api/files/{file['id']}/rename", headers=headers,
+                   json={'new_name': 'b.txt'})
+        client.post('/api/files/move', headers=headers, json={'file_ids': [file['id']]})
+        client.delete(f"/api/files/{folder['id']}", headers=headers)
+        client.post(f"/api/files/{folder['id']}/restore", headers=headers)
+        client.delete(f"/api/files/{file['id']}/permanent", headers=headers)
+
+        response = client.get(f"/api/files/changes?cursor={start['cursor']}", headers=headers)
+        data = response.get_json()
+        assert response.status_code == 200
+        assert [change['action'] for change in data['changes']] == [
+            'CREATE', 'CREATE', 'RENAME', 'MOVE', 'DELETE', 'RESTORE', 'PURGE']
+        seqs = [change['seq'] for change in data['changes']]
+        assert seqs == list(range(start['cursor'] + 1, start['cursor'] + 8))
+        assert data['cursor'] == seqs[-1]
+
+        response = client.get(f"/api/files/changes?cursor={data['cursor']}", headers=headers)
+        assert response.get_json()['changes'] == []
+
+    def test_pagination(self, client, headers):
+        """A limited page reports has_more and resumes at its cursor."""
+        for name in ('a.txt', 'b.txt', 'c.txt'):
+            upload(client, headers, name)
+
+        data = client.get('/api/files/changes?cursor=0&limit=2', headers=headers).get_json()
+        assert len(data['changes']) == 2
+        assert data['has_more']
+
+        data = client.get(f"/api/files/changes?cursor={data['cursor']}&limit=2",
+                          headers=headers).get_json()
+        assert [change['file_name'] for change in data['changes']] == ['c.txt']
+        assert not data['has_more']
+
+    def test_compacted_cursor_requires_resync(self, app, client, headers):
+        """A cursor older than the retained journal gets a resync signal."""
+        from app.services.change_service import ChangeService
+
+        upload(client, headers, 'a.txt')
+        upload(client, headers, 'b.txt')
+        assert ChangeService.compact(days=-1) == 2
+
+        response = client.get('/api/files/changes?cursor=0', headers=headers)
+        assert response.status_code == 410
+        data = response.get_json()
+        assert data['resync_required']
+        assert data['cursor'] == 2
+
+        response = client.get('/api/files/changes?cursor=2', headers=headers)
+        assert response.status_code == 200
+
+
+class TestManifest:
+    """Test the streaming drive manifest."""
+
+    def test_manifest_lists_live_entries(self, client, headers):
+        """The manifest holds every live entry and a journal cursor."""
+        folder = create_folder(client, headers, 'docs')
+        file = upload(client, headers, 'a.txt', b'abc', parent=folder['id'])
+        trashed = upload(client, headers, 'old.txt')
+        client.delete(f"/api/files/{trashed['id']}", headers=headers)
+
+        response = client.get('/api/files/manifest', headers=headers)
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        cursor = client.get('/api/files/changes', headers=headers).get_json()['cursor']
+        assert lines[0] == {'cursor': cursor}
+
+        entries = {entry['id']: entry for entry in lines[1:]}
+        assert set(entries) == {folder['id'], file['id']}
+        assert entries[file['id']]['parent_id'] == folder['id']
+        assert entries[file['id']]['size'] == 3
+        assert entries[folder['id']]['is_folder']
+
+
+class TestEventStream:
+    """Test the Server-Sent Events change stream."""
+
+    def test_commit_publishes_notification(self, app, client, headers):
+        """Committing a journaled change wakes the user's subscribers."""
+        user_uuid = client.get('/api/auth/profile', headers=headers).get_json()['user']['id']
+        subscription = app.extensions['event_bus'].subscribe(user_uuid)
+        try:
+            upload(client, headers, 'a.txt')
+            assert subscription.get(timeout=1) == 'changed'
+        finally:
+            subscription.close()
+
+    def test_stream_resumes_from_last_event_id(self, app, client, headers):
+        """Events after Last-Event-ID are replayed from the journal."""
+        app.config['EVENTS_STREAM_TIMEOUT'] = 0
+        upload(client, headers, 'a.txt')
+        upload(client, headers, 'b.txt')
+
+        response = client.get('/api/files/events',
+                              headers={**headers, 'Last-Event-ID': '1'})
+        assert response.mimetype == 'text/event-stream'
+        body = response.get_data(as_text=True)
+        assert 'id: 2\nevent: change\n' in body
+        assert 'id: 1\n' not in body
+        assert '"file_name": "b.txt"' in body
+        # Sync workers: the client polls instead of holding the connection
+        assert body.startswith(f"retry: {app.config['EVENTS_POLL_SECONDS'] * 1000}\n")
+
+
+class TestListingETag:
+    """Test conditional requests on folder listings."""
+
+    def test_not_modified_until_drive_changes(self, client, headers):
+        """A matching If-None-Match gets 304 until the next mutation."""
+        upload(client, headers, 'a.txt')
+
+        response = client.get('/api/files', headers=headers)
+        etag = response.headers['ETag']
+        assert etag.startswith('W/')
+
+        response = client.get('/api/files', headers={**headers, 'If-None-Match': etag})
+        assert response.status_code == 304
+
+        response = client.get('/api/files?page=2', headers={**headers, 'If-None-Match': etag})
+        assert response.status_code == 200
+
+        upload(client, headers, 'b.txt')
+        response = client.get('/api/files', headers={**headers, 'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+
+
+class TestListingCache:
+    """Test the folder-listing cache."""
+
+    def test_hits_until_write(self, app, client, headers):
+        """Repeated listings are served from cache until the drive changes."""
+        from app.services.cache_service import CacheService
+
+        upload(client, headers, 'a.txt')
+        first = client.get('/api/files', headers=headers)
+        second = client.get('/api/files', headers=headers)
+        assert second.get_json() == first.get_json()
+
+        stats = CacheService.get_stats()[1]['cache']
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+
+        upload(client, headers, 'b.txt')
+        files = client.get('/api/files', headers=headers).get_json()['files']
+        assert len(files) == 2
+        assert CacheService.get_stats()[1]['cache']['misses'] == 2
+
+    def test_lru_eviction(self):
+        """The in-process cache drops the least recently used page."""
+        from app.services.cache_service import LocalListingCache
+
+        cache = LocalListingCache(max_entries=2)
+        cache.set('a', b'1')
+        cache.set('b', b'2')
+        cache.get('a')
+        cache.set('c', b'3')
+
+        assert cache.get('b') is None
+        assert cache.get('a') == b'1'
+        assert cache.stats()['evictions'] == 1
+
+
+class TestListingSortFilter:
+    """Test server-side sorting and filtering of listings."""
+
+    def test_sort_keeps_folders_first_across_pages(self, client, headers):
+        """Folders lead every sort order and pages split the two groups."""
+        create_folder(client, headers, 'b-folder')
+        create_folder(client, headers, 'a-folder')
+        upload(client, headers, 'small.txt', b'x')
+        upload(client, headers, 'large.txt', b'x' * 100)
+        upload(client, headers, 'medium.txt', b'x' * 10)
+
+        data = client.get('/api/files?sort=size&order=desc', headers=headers).get_json()
+        names = [file['file_name'] for file in data['files']]
+        assert names == ['b-folder', 'a-folder', 'large.txt', 'medium.txt', 'small.txt']
+
+        pages = [
+            client.get(f'/api/files?sort=name&per_page=2&page={page}',
+                       headers=headers).get_json()
+            for page in (1, 2, 3)
+        ]
+        assert [[f['file_name'] for f in page['files']] for page in pages] == [
+            ['a-folder', 'b-folder'], ['large.txt', 'medium.txt'], ['small.txt']]
+        assert pages[0]['pagination']['total'] == 5
+        assert pages[0]['pagination']['pages'] == 3
+
+    def test_filters(self, client, headers):
+        """Type and size filters keep matching files only."""
+        create_folder(client, headers, 'photos')
+        upload(client, headers, 'a.png', b'x' * 50)
+        upload(client, headers, 'b.jpg', b'x' * 5)
+        upload(client, headers, 'c.txt', b'x' * 50)
+
+        data = client.get('/api/files?type=image&min_size=10', headers=headers).get_json()
+        assert [file['file_name'] for file in data['files']] == ['a.png']
+
+        data = client.get('/api/files?modified_after=2000-01-01', headers=headers).get_json()
+        assert data['pagination']['total'] == 4
+        data = client.get('/api/files?modified_before=2000-01-01', headers=headers).get_json()
+        assert data['files'] == []
+
+    def test_date_filters(self, client, headers):
+        """Bare dates cover their whole day; offsets are converted to UTC."""
+        from datetime import datetime, timedelta, timezone
+        upload(client, headers, 'a.txt')
+        now = datetime.now(timezone.utc)
+        earlier = (now - timedelta(minutes=1)).astimezone(timezone(timedelta(hours=5)))
+
+        def total(**query):
+            return client.get('/api/files', headers=headers,
+                              query_string=query).get_json()['pagination']['total']
+
+        assert total(modified_before=now.date().isoformat()) == 1
+        assert total(modified_before=(now.date() - timedelta(days=1)).isoformat()) == 0
+        assert total(modified_after=earlier.isoformat()) == 1
+        assert total(modified_before=earlier.isoformat()) == 0
+
+    def test_invalid_parameters(self, client, headers):
+        """Unknown sorts, families and dates are rejected."""
+        for query in ('sort=owner', 'order=up', 'type=spaceship', 'modified_after=yesterday'):
+            response = client.get(f'/api/files?{query}', headers=headers)
+            assert response.status_code == 400
+
+
+class TestListingSerialization:
+    """Test projected listing rows and the JSON encoders."""
+
+    def test_rows_match_to_dict(self, app, client, headers):
+        """Listing rows keep the to_dict shape and count live children."""
+        folder = create_folder(client, headers, 'docs')
+        upload(client, headers, 'a.txt', parent=folder['id'])
+        trashed = upload(client, headers, 'b.txt', parent=folder['id'])
+        client.delete(f"/api/files/{trashed['id']}", headers=headers)
+        file = upload(client, headers, 'photo.png')
+
+        files = client.get('/api/files', headers=headers).get_json()['files']
+        assert [(f['file_name'], f.get('item_count')) for f in files] == [
+            ('docs', 1), ('photo.png', None)]
+        with app.app_context():
+            expected = File.query.get(file['id']).to_dict()
+        assert files[1] == {**expected, 'icon': 'image'}
+
+    def test_orjson_matches_standard_encoder(self, app):
+        """Both encoders produce the same document."""
+        from datetime import datetime
+        from flask.json.provider import DefaultJSONProvider
+        from app.utils.serializers import OrjsonProvider
+
+        pytest.importorskip('orjson')
+        data = {'b': [1, 2.5, None, True], 'a': 'é', 'when': datetime(2024, 1, 2, 3, 4, 5)}
+        assert (json.loads(OrjsonProvider(app).dumps(data))
+                == json.loads(DefaultJSONProvider(app).dumps(data)))
+
+
+class TestSparseFields:
+    """Test fields= selection on file resources."""
+
+    def test_listing_and_trash(self, client, headers):
+        """Listings return exactly the requested fields."""
+        create_folder(client, headers, 'docs')
+        file = upload(client, headers, 'a.txt')
+
+        data = client.get('/api/files?fields=id,file_name,item_count',
+                          headers=headers).get_json()
+        assert data['files'] == [
+            {'id': data['files'][0]['id'], 'file_name': 'docs', 'item_count': 0},
+            {'id': file['id'], 'file_name': 'a.txt'}
+        ]
+
+        client.delete(f"/api/files/{file['id']}", headers=headers)
+        data = client.get('/api/files/trash?fields=file_name,icon', headers=headers).get_json()
+        assert data['files'] == [{'file_name': 'a.txt', 'icon': 'text'}]
+
+    def test_file_info(self, client, headers):
+        """The breadcrumb is only built on request once fields are given."""
+        folder = create_folder(client, headers, 'docs')
+        file = upload(client, headers, 'a.txt', parent=folder['id'])
+
+        data = client.get(f"/api/files/{file['id']}?fields=file_size",
+                          headers=headers).get_json()
+        assert data == {'file': {'file_size': 5}}
+
+        data = client.get(f"/api/files/{file['id']}?fields=breadcrumb",
+                          headers=headers).get_json()
+        assert data['file'] == {}
+        assert [crumb['name'] for crumb in data['breadcrumb']] == ['docs', 'a.txt']
+
+        data = client.get(f"/api/files/{file['id']}", headers=headers).get_json()
+        assert data['file']['file_name'] == 'a.txt'
+        assert data['breadcrumb'] == [
+            {'id': folder['id'], 'name': 'docs', 'is_folder': True},
+            {'id': file['id'], 'name': 'a.txt', 'is_folder': False}
+        ]
+
+        response = client.get(f"/api/files/{file['id']}?fields=owner", headers=headers)
+        assert response.status_code == 400
+
+
+    def test_listing_breadcrumb(self, client, headers):
+        """Folder listings carry the folder's breadcrumb, scoped to its owner."""
+        docs = create_folder(client, headers, 'docs')
+        inner = create_folder(client, headers, 'inner', parent=docs['id'])
+
+        data = client.get(f"/api/files?folder_id={inner['id']}", headers=headers).get_json()
+        assert data['breadcrumb'] == [
+            {'id': docs['id'], 'name': 'docs', 'is_folder': True},
+            {'id': inner['id'], 'name': 'inner', 'is_folder': True}
+        ]
+
+        token = client.post('/api/auth/register', json={
+            'email': 'other@example.com', 'password': 'Test123456', 'full_name': 'Other'
+        }).get_json()['access_token']
+        data = client.get(f"/api/files?folder_id={inner['id']}",
+                          headers={'Authorization': f'Bearer {token}'}).get_json()
+        assert data['breadcrumb'] == []
+
+    def test_deep_breadcrumb(self, client, headers):
+        """Breadcrumbs are built for trees deeper than the recursion limit."""
+        import sys
+        import uuid
+        top = create_folder(client, headers, 'd')
+        user_uuid = File.query.filter_by(uuid=top['id']).one().user_uuid
+        parent_uuid, path = top['id'], 'd'
+        for _ in range(sys.getrecursionlimit() + 100):
+            path += '/d'
+            folder = File(user_uuid, 'd', path, is_folder=True, parent_folder_uuid=parent_uuid)
+            folder.uuid = parent_uuid = str(uuid.uuid4())
+            db.session.add(folder)
+        db.session.commit()
+
+        response = client.get(f'/api/files/{parent_uuid}?fields=breadcrumb', headers=headers)
+        assert response.status_code == 200
+        breadcrumb = response.get_json()['breadcrumb']
+        assert len(breadcrumb) == sys.getrecursionlimit() + 101
+        assert breadcrumb[0]['id'] == top['id']
+        assert breadcrumb[-1]['id'] == parent_uuid
+
+class TestLookup:
+    """Test batch metadata lookup."""
+
+    def test_lookup_with_breadcrumbs(self, client, headers):
+        """Items come back in request order with shared-ancestor breadcrumbs."""
+        docs = create_folder(client, headers, 'docs')
+        inner = create_folder(client, headers, 'inner', docs['id'])
+        deep = upload(client, headers, 'deep.txt', parent=inner['id'])
+        top = upload(client, headers, 'top.txt')
+
+        response = client.post('/api/files/lookup', headers=headers, json={
+            'file_ids': [deep['id'], 'missing-uuid', top['id'], inner['id']],
+            'breadcrumbs': True,
+            'fields': ['file_name']
+        })
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['missing'] == ['missing-uuid']
+        assert [f['file_name'] for f in data['files']] == ['deep.txt', 'top.txt', 'inner']
+        assert [c['name'] for c in data['files'][0]['breadcrumb']] == ['docs', 'inner', 'deep.txt']
+        assert [c['name'] for c in data['files'][1]['breadcrumb']] == ['top.txt']
+        assert set(data['files'][1]) == {'file_name', 'breadcrumb'}
+
+    def test_limits(self, app, client, headers):
+        """Requests above LOOKUP_MAX_IDS are rejected."""
+        app.config['LOOKUP_MAX_IDS'] = 2
+        response = client.post('/api/files/lookup', headers=headers,
+                               json={'file_ids': ['a', 'b', 'c']})
+        assert response.status_code == 400
+        response = client.post('/api/files/lookup', headers=headers, json={'file_ids': []})
+        assert response.status_code == 400
+
+
+class TestTransferUrls:
+    """Test signed transfer URLs."""
+
+    def test_signed_download_without_auth(self, client, headers):
+        """A signed URL serves the file, with ranges, and rejects tampering."""
+        file = upload(client, headers, 'movie.txt', b'0123456789')
+
+        response = client.post(f"/api/files/{file['id']}/transfer-url", headers=headers,
+                               json={'disposition': 'inline'})
+        assert response.status_code == 200
+        url = response.get_json()['url']
+
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.data == b'0123456789'
+        assert response.headers['Content-Disposition'].startswith('inline')
+
+        response = client.get(url, headers={'Range': 'bytes=2-4'})
+        assert response.status_code == 206
+        assert response.data == b'234'
+
+        assert client.get(url.replace('d=inline', 'd=attachment')).status_code == 403
+
+    def test_trashed_or_replaced_file_is_refused(self, app, client, headers):
+        """URLs stop working once the file is trashed or replaced on disk."""
+        trashed = upload(client, headers, 'a.txt', b'aaaaa')
+        replaced = upload(client, headers, 'b.txt', b'bbbbb')
+        urls = {
+            file['id']: client.post(f"/api/files/{file['id']}/transfer-url",
+                                    headers=headers).get_json()['url']
+            for file in (trashed, replaced)
+        }
+
+        client.delete(f"/api/files/{trashed['id']}", headers=headers)
+        assert client.get(urls[trashed['id']]).status_code == 404
+
+        stored = File.query.filter_by(uuid=replaced['id']).one()
+        full_path = os.path.join(app.config['UPLOAD_FOLDER'], stored.user_uuid, 'b.txt')
+        with open(full_path + '.new', 'wb') as f:
+            f.write(b'BBBBB')
+        os.replace(full_path + '.new', full_path)
+        assert client.get(urls[replaced['id']]).status_code == 410
+
+    def test_expired_url(self, client, headers, monkeypatch):
+        """URLs stop working once they expire."""
+        import time
+
+        file = upload(client, headers, 'a.txt')
+        url = client.post(f"/api/files/{file['id']}/transfer-url", headers=headers,
+                          json={'expires_in': 60}).get_json()['url']
+
+        now = time.time()
+        monkeypatch.setattr(time, 'time', lambda: now + 120)
+        assert client.get(url).status_code == 410
+
+
+class TestDownloadOffload:
+    """Test X-Accel-Redirect / X-Sendfile download offload."""
+
+    def test_x_accel_redirect(self, app, client, headers):
+        """The front server gets an internal URI; names and types are kept."""
+        app.config['DOWNLOAD_OFFLOAD'] = 'x-accel-redirect'
+        folder = create_folder(client, headers, 'my docs')
+        file = upload(client, headers, 'report.pdf', parent=folder['id'])
+
+        response = client.get(f"/api/files/download/{file['id']}", headers=headers)
+        assert response.status_code == 200
+        assert response.data == b''
+        assert response.mimetype == 'application/pdf'
+        assert 'report.pdf' in response.headers['Content-Disposition']
+        assert response.headers['X-Accel-Redirect'].startswith('/protected-files/')
+        assert response.headers['X-Accel-Redirect'].endswith('/my_docs/report.pdf')
+
+    def test_unknown_offload_fails_at_startup(self, monkeypatch):
+        """A misspelled DOWNLOAD_OFFLOAD stops the app from starting."""
+        from app.config import config
+        monkeypatch.setattr(config['development'], 'DOWNLOAD_OFFLOAD', 'x-accel')
+        with pytest.raises(ValueError, match='DOWNLOAD_OFFLOAD'):
+            create_app('development')
+
+    def test_cached_zip_with_x_sendfile(self, app, client, headers):
+        """ZIP archives are cached per drive generation and offloaded too."""
+        app.config['DOWNLOAD_OFFLOAD'] = 'x-sendfile'
+        file = upload(client, headers, 'a.txt')
+
+        def download():
+            response = client.post('/api/files/download-zip', headers=headers,
+                                   json={'file_ids': [file['id']]})
+            assert response.status_code == 200
+            return response.headers['X-Sendfile']
+
+        first = download()
+        assert download() == first
+        with zipfile.ZipFile(first) as archive:
+            assert archive.namelist() == ['a.txt']
+
+        upload(client, headers, 'b.txt')
+        second = download()
+        assert second != first
+        # Older generations outlive a new build by ZIP_CACHE_GRACE_SECONDS
+        assert os.path.exists(first)
+
+        app.config['ZIP_CACHE_GRACE_SECONDS'] = 0
+        upload(client, headers, 'c.txt')
+        download()
+        assert not os.path.exists(first)
+        assert not os.path.exists(second)
+
+    def test_zip_cache_evicts_least_recently_used(self, app, client, headers):
+        """Beyond ZIP_CACHE_MAX_BYTES, the archives used longest ago go first."""
+        app.config['DOWNLOAD_OFFLOAD'] = 'x-sendfile'
+        app.config['ZIP_CACHE_GRACE_SECONDS'] = 0
+        files = [upload(client, headers, f'{name}.txt', os.urandom(10000)) for name in 'abc']
+
+        def download(file):
+            response = client.post('/api/files/download-zip', headers=headers,
+                                   json={'file_ids': [file['id']]})
+            assert response.status_code == 200
+            return response.headers['X-Sendfile']
+
+        first = download(files[0])
+        second = download(files[1])
+        os.utime(first, (1000, 1000))
+        os.utime(second, (2000, 2000))
+        app.config['ZIP_CACHE_MAX_BYTES'] = 25000
+        assert download(files[0]) == first
+
+        third = download(files[2])
+        assert os.path.exists(first)
+        assert not os.path.exists(second)
+        assert os.path.exists(third)
+
+    def test_large_selection_is_not_cached(self, app, client, headers):
+        """Selections above ZIP_CACHE_MAX_ARCHIVE_SIZE are streamed, not cached."""
+        app.config['DOWNLOAD_OFFLOAD'] = 'x-accel-redirect'
+        app.config['ZIP_CACHE_MAX_ARCHIVE_SIZE'] = 1000
+        folder = create_folder(client, headers, 'big')
+        upload(client, headers, 'a.txt', b'a' * 600, parent=folder['id'])
+        upload(client, headers, 'b.txt', b'b' * 600, parent=folder['id'])
+
+        response = client.post('/api/files/download-zip', headers=headers,
+                               json={'file_ids': [folder['id']]})
+        assert response.status_code == 200
+        assert 'X-Accel-Redirect' not in response.headers
+        with zipfile.ZipFile(io.BytesIO(response.data)) as archive:
+            assert archive.read('big/a.txt') == b'a' * 600
+        response.close()
+
+        cache_root = os.path.join(app.config['UPLOAD_FOLDER'], '.zip-cache')
+        assert [name for _, _, names in os.walk(cache_root) for name in names] == []
+
+
+class TestDownloadStreaming:
+    """Test the zero-copy download path."""
+
+    def test_server_file_wrapper_gets_ranges(self, app, client, headers):
+        """The server's file_wrapper receives the file positioned at the range."""
+        app.config['FILE_CACHE_MAX_FILE_SIZE'] = 0
+        calls = []
+
+        class ServerWrapper:
+            def __init__(self, file, block_size):
+                calls.append(file.tell())
+                self.file = file
+
+            def __iter__(self):
+                return iter([self.file.read()])
+
+            def close(self):
+                self.file.close()
+
+        file = upload(client, headers, 'data.txt', b'0123456789')
+        url = f"/api/files/download/{file['id']}"
+        overrides = {'wsgi.file_wrapper': ServerWrapper}
+
+        response = client.get(url, headers=headers, environ_overrides=overrides)
+        assert response.data == b'0123456789'
+
+        response = client.get(url, headers={**headers, 'Range': 'bytes=4-6'},
+                              environ_overrides=overrides)
+        assert response.status_code == 206
+        assert response.headers['Content-Length'] == '3'
+        assert response.headers['Content-Range'] == 'bytes 4-6/10'
+        assert calls == [0, 4]
+
+    def test_block_wrapper_ranges(self, client, headers):
+        """Without a server wrapper, ranges are served by seeking."""
+        file = upload(client, headers, 'data.txt', b'0123456789')
+        response = client.get(f"/api/files/download/{file['id']}",
+                              headers={**headers, 'Range': 'bytes=7-'})
+        assert response.status_code == 206
+        assert response.data == b'789'
+
+
+class TestPageCacheHints:
+    """Test page-cache hints on large uploads, downloads and archives."""
+
+    def test_hints_keep_content_intact(self, app, client, headers, monkeypatch):
+        """Preallocated uploads are exact and dropped files still download."""
+        from app.utils.file_stream import drop_cached_pages
+        dropped = []
+
+        def record(file, sync=False):
+            dropped.append(sync)
+            drop_cached_pages(file, sync)
+
+        monkeypatch.setattr('app.utils.file_stream.drop_cached_pages', record)
+        monkeypatch.setattr('app.services.storage_service.drop_cached_pages', record)
+        app.config['IO_DROP_CACHE_THRESHOLD'] = 1
+        app.config['FILE_CACHE_MAX_FILE_SIZE'] = 0
+        content = os.urandom(256 * 1024)
+
+        file = upload(client, headers, 'data.txt', content)
+        assert file['file_size'] == len(content)
+        assert True in dropped
+
+        response = client.get(f"/api/files/download/{file['id']}", headers=headers)
+        assert response.data == content
+        response.close()
+
+        response = client.post('/api/files/download-zip', headers=headers,
+                               json={'file_ids': [file['id']]})
+        with zipfile.ZipFile(io.BytesIO(response.data)) as archive:
+            assert archive.read('data.txt') == content
+        assert len(dropped) >= 4
+
+    def test_threshold_zero_disables_hints(self, app, client, headers, monkeypatch):
+        """No page is dropped when IO_DROP_CACHE_THRESHOLD is 0."""
+        dropped = []
+        monkeypatch.setattr('app.services.storage_service.drop_cached_pages',
+                            lambda file, sync=False: dropped.append(file))
+        monkeypatch.setattr('app.utils.file_stream.drop_cached_pages',
+                            lambda file, sync=False: dropped.append(file))
+        app.config['IO_DROP_CACHE_THRESHOLD'] = 0
+        app.config['IO_PREALLOCATE'] = False
+
+        file = upload(client, headers, 'data.txt', b'x' * 1000)
+        assert file['file_size'] == 1000
+        response = client.get(f"/api/files/download/{file['id']}", headers=headers)
+        assert response.data == b'x' * 1000
+        response.close()
+        assert dropped == []
+
+
+class TestFileCache:
+    """Test the small-file content cache."""
+
+    def test_hits_and_invalidation(self, app, client, headers):
+        """Repeat downloads hit the cache; a rewritten file is a new entry."""
+        file = upload(client, headers, 'avatar.txt', b'first')
+        url = f"/api/files/download/{file['id']}"
+
+        responses = [client.get(url, headers=headers) for _ in range(3)]
+        assert [r.data for r in responses] == [b'first'] * 3
+        assert responses[0].headers['ETag'] == responses[2].headers['ETag']
+        stats = app.extensions['file_cache'].stats()
+        assert (stats['hits'], stats['misses'], stats['entries']) == (2, 1, 1)
+
+        response = client.get(url, headers={**headers,
+                                            'If-None-Match': responses[0].headers['ETag']})
+        assert response.status_code == 304
+        response = client.get(url, headers={**headers, 'Range': 'bytes=1-2'})
+        assert (response.status_code, response.data) == (206, b'ir')
+
+        from app.services.storage_service import StorageService
+        stored = File.query.filter_by(uuid=file['id']).one()
+        full_path = StorageService.get_full_path(stored.user_uuid, stored.file_path)
+        with open(full_path, 'wb') as target:
+            target.write(b'second!')
+        assert client.get(url, headers=headers).data == b'second!'
+
+    def test_same_headers_as_streamed_path(self, app, client, headers):
+        """Cached and streamed downloads carry the same validators."""
+        file = upload(client, headers, 'doc.txt', b'content')
+        url = f"/api/files/download/{file['id']}"
+        cached = client.get(url, headers=headers)
+        app.config['FILE_CACHE_MAX_FILE_SIZE'] = 0
+        streamed = client.get(url, headers=headers)
+        for header in ('ETag', 'Last-Modified', 'Content-Length', 'Content-Type',
+                       'Content-Disposition'):
+            assert cached.headers[header] == streamed.headers[header]
+        streamed.close()
+
+    def test_lru_is_bounded_by_bytes(self):
+        """The in-process LRU evicts by total size."""
+        from app.services.file_cache_service import LocalFileCache
+        cache = LocalFileCache(10)
+        cache.set('a', b'12345')
+        cache.set('b', b'12345')
+        cache.get('a')
+        cache.set('c', b'123')
+        assert cache.get('b') is None
+        assert cache.get('a') == b'12345'
+        cache.set('huge', b'x' * 11)
+        assert cache.get('huge') is None
+        assert cache.stats()['bytes'] <= 10
+
+    def test_shared_backend(self, tmp_path):
+        """Entries in shm:// are visible to every cache on the directory."""
+        from app.services.file_cache_service import create_file_cache
+        first = create_file_cache(f'shm://{tmp_path}/cache', 10)
+        first.set('a', b'12345')
+        second = create_file_cache(f'shm://{tmp_path}/cache', 10)
+        assert second.get('a') == b'12345'
+        os.utime(os.path.join(tmp_path, 'cache', os.listdir(tmp_path / 'cache')[0]),
+                 ns=(0, 0))
+        second.set('b', b'123456')
+        assert first.get('a') is None
+        assert first.stats()['entries'] == 1
+
+
+    def test_shared_cache_scans_only_when_full(self, tmp_path, monkeypatch):
+        """Inserts under budget never scan; a full cache drops to the low-water mark."""
+        from app.services.file_cache_service import SharedFileCache
+        cache = SharedFileCache(str(tmp_path / 'cache'), 100)
+        scans = []
+        entries = cache._entries
+        monkeypatch.setattr(cache, '_entries',
+                            lambda **kwargs: scans.append(1) or entries(**kwargs))
+
+        for index in range(10):
+            cache.set(f'key-{index}', b'x' * 10)
+            os.utime(cache._path(f'key-{index}'), ns=(index, index))
+        assert scans == []
+
+        cache.set('key-10', b'x' * 10)
+        assert len(scans) == 1
+        assert cache.get('key-0') is None and cache.get('key-1') is None
+        assert cache.get('key-2') == b'x' * 10
+        assert cache.stats()['bytes'] == 90
+
+    def test_shared_cache_counts_replaced_entries_once(self, tmp_path, monkeypatch):
+        """Re-setting a key doesn't inflate the size; stale temp files are removed."""
+        from app.services.file_cache_service import SharedFileCache
+        directory = tmp_path / 'cache'
+        cache = SharedFileCache(str(directory), 100)
+        scans = []
+        entries = cache._entries
+        monkeypatch.setattr(cache, '_entries',
+                            lambda **kwargs: scans.append(1) or entries(**kwargs))
+
+        for _ in range(20):
+            cache.set('key', b'x' * 10)
+        assert scans == []
+
+        abandoned = directory / 'crashed.tmp'
+        abandoned.write_bytes(b'x')
+        os.utime(abandoned, (0, 0))
+        fresh = directory / 'writing.tmp'
+        fresh.write_bytes(b'x')
+        cache.set('big', b'x' * 95)
+        assert len(scans) == 1
+        assert not abandoned.exists()
+        assert fresh.exists()
+
+class TestCompressedVariants:
+    """Test precompressed gzip/br download variants."""
+
+    CONTENT = b'timestamp,level,message\n' + b'2026-01-01,INFO,request served\n' * 500
+
+    def variants(self, app, file):
+        from app.services.storage_service import StorageService
+        stored = File.query.filter_by(uuid=file['id']).one()
+        directory = StorageService.get_variant_cache_path(stored.user_uuid)
+        full_path = StorageService.get_full_path(stored.user_uuid, stored.file_path)
+        return full_path, sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+
+    def test_gzip_variant(self, app, client, headers):
+        """Compressible files are sent gzip-encoded, with their own validator."""
+        file = upload(client, headers, 'access.txt', self.CONTENT)
+        url = f"/api/files/download/{file['id']}"
+
+        identity = client.get(url, headers=headers)
+        assert identity.data == self.CONTENT
+        assert 'Content-Encoding' not in identity.headers
+        assert 'Accept-Encoding' in identity.headers['Vary']
+
+        gzipped = client.get(url, headers={**headers, 'Accept-Encoding': 'gzip'})
+        assert gzipped.headers['Content-Encoding'] == 'gzip'
+        assert gzipped.headers['Accept-Ranges'] == 'none'
+        assert 'Accept-Encoding' in gzipped.headers['Vary']
+        assert gzip.decompress(gzipped.data) == self.CONTENT
+        assert int(gzipped.headers['Content-Length']) < len(self.CONTENT)
+        assert gzipped.headers['ETag'] != identity.headers['ETag']
+
+        response = client.get(url, headers={**headers, 'Accept-Encoding': 'gzip',
+                                            'If-None-Match': gzipped.headers['ETag']})
+        assert response.status_code == 304
+        assert len(self.variants(app, file)[1]) == 1
+
+    def test_ranges_use_identity(self, client, headers):
+        """Range requests are answered from the uncompressed file."""
+        file = upload(client, headers, 'access.txt', self.CONTENT)
+        response = client.get(f"/api/files/download/{file['id']}",
+                              headers={**headers, 'Accept-Encoding': 'gzip',
+                                       'Range': 'bytes=0-8'})
+        assert response.status_code == 206
+        assert 'Content-Encoding' not in response.headers
+        assert response.data == self.CONTENT[:9]
+
+    def test_brotli_variant(self, client, headers):
+        """br is preferred when the brotli package is installed."""
+        brotli = pytest.importorskip('brotli')
+        file = upload(client, headers, 'access.txt', self.CONTENT)
+        response = client.get(f"/api/files/download/{file['id']}",
+                              headers={**headers, 'Accept-Encoding': 'gzip, br'})
+        assert response.headers['Content-Encoding'] == 'br'
+        assert brotli.decompress(response.data) == self.CONTENT
+
+    def test_outdated_variants_are_removed(self, app, client, headers):
+        """Rewriting a file replaces its variant; deleting it drops them."""
+        from app.services.storage_service import StorageService
+        file = upload(client, headers, 'access.txt', self.CONTENT)
+        url = f"/api/files/download/{file['id']}"
+        client.get(url, headers={**headers, 'Accept-Encoding': 'gzip'})
+        full_path, before = self.variants(app, file)
+
+        with open(full_path, 'ab') as target:
+            target.write(b'2026-01-02,WARN,disk almost full\n')
+        response = client.get(url, headers={**headers, 'Accept-Encoding': 'gzip'})
+        assert gzip.decompress(response.data).endswith(b'disk almost full\n')
+        _, after = self.variants(app, file)
+        assert len(after) == 1 and after != before
+
+        stored = File.query.filter_by(uuid=file['id']).one()
+        StorageService.delete_file(stored.user_uuid, stored.file_path)
+        assert self.variants(app, file)[1] == []
+
+    def test_incompressible_types(self, client, headers):
+        """Other MIME types are never encoded."""
+        file = upload(client, headers, 'photo.png', self.CONTENT)
+        response = client.get(f"/api/files/download/{file['id']}",
+                              headers={**headers, 'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in response.headers
+        assert response.data == self.CONTENT
+
+
+class TestStoredZip:
+    """Test deterministic, range-resumable ZIP downloads."""
+
+    def make_drive(self, client, headers):
+        folder = create_folder(client, headers, 'photos')
+        sub = create_folder(client, headers, 'trip', parent=folder['id'])
+        create_folder(client, headers, 'empty', parent=folder['id'])
+        upload(client, headers, 'b.txt', b'beta' * 1000, parent=sub['id'])
+        upload(client, headers, 'a.txt', b'alpha', parent=folder['id'])
+        top = upload(client, headers, 'notes.txt', os.urandom(5000))
+        return folder, top
+
+    def url(self, *files):
+        return '/api/files/download-zip?file_ids=' + ','.join(file['id'] for file in files)
+
+    def test_full_archive(self, client, headers):
+        """The archive is valid, exactly sized and identical on every request."""
+        folder, top = self.make_drive(client, headers)
+        first = client.get(self.url(top, folder), headers=headers)
+        assert first.status_code == 200
+        assert first.headers['Accept-Ranges'] == 'bytes'
+        assert int(first.headers['Content-Length']) == len(first.data)
+
+        with zipfile.ZipFile(io.BytesIO(first.data)) as archive:
+            assert archive.testzip() is None
+            assert archive.namelist() == [
+                'notes.txt', 'photos/', 'photos/a.txt', 'photos/empty/',
+                'photos/trip/', 'photos/trip/b.txt']
+            assert archive.read('photos/trip/b.txt') == b'beta' * 1000
+            assert all(info.compress_type == zipfile.ZIP_STORED for info in archive.infolist())
+
+        second = client.get(self.url(folder, top), headers=headers)
+        assert second.data == first.data
+        assert second.headers['ETag'] == first.headers['ETag']
+
+        head = client.head(self.url(top, folder), headers=headers)
+        assert head.headers['Content-Length'] == first.headers['Content-Length']
+        assert head.data == b''
+
+    def test_ranges_and_validators(self, client, headers):
+        """Ranges stitch back into the archive; a changed drive changes the ETag."""
+        folder, top = self.make_drive(client, headers)
+        url = self.url(top, folder)
+        full = client.get(url, headers=headers)
+        etag = full.headers['ETag']
+        size = len(full.data)
+
+        parts = []
+        for start in range(0, size, 1500):
+            end = min(start + 1499, size - 1)
+            response = client.get(url, headers={**headers, 'Range': f'bytes={start}-{end}',
+                                                'If-Range': etag})
+            assert response.status_code == 206
+            assert response.headers['Content-Range'] == f'bytes {start}-{end}/{size}'
+            parts.append(response.data)
+        assert b''.join(parts) == full.data
+
+        assert client.get(url, headers={**headers, 'If-None-Match': etag}).status_code == 304
+
+        upload(client, headers, 'c.txt', b'gamma', parent=folder['id'])
+        response = client.get(url, headers={**headers, 'Range': 'bytes=0-9', 'If-Range': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+
+    def test_checksums(self, app, client, headers):
+        """Uploads store their CRC; missing ones are computed once, keeping dates."""
+        content = os.urandom(3000)
+        file = upload(client, headers, 'data.txt', content)
+        stored = File.query.filter_by(uuid=file['id']).one()
+        assert stored.crc32 == zlib.crc32(content)
+
+        File.query.filter_by(uuid=file['id']).update(
+            {'crc32': None, 'updated_at': File.updated_at}, synchronize_session=False)
+        db.session.commit()
+        updated_at = File.query.filter_by(uuid=file['id']).one().updated_at
+
+        response = client.get(self.url(file), headers=headers)
+        with zipfile.ZipFile(io.BytesIO(response.data)) as archive:
+            assert archive.read('data.txt') == content
+        db.session.expire_all()
+        stored = File.query.filter_by(uuid=file['id']).one()
+        assert stored.crc32 == zlib.crc32(content)
+        assert stored.updated_at == updated_at
+
+    def test_large_checksums_in_background(self, app, client, headers):
+        """Missing CRCs above the inline limit are computed by a job first."""
+        app.config['STORED_ZIP_INLINE_CRC_SIZE'] = 1000
+        content = os.urandom(3000)
+        file = upload(client, headers, 'data.txt', content)
+        File.query.filter_by(uuid=file['id']).update(
+            {'crc32': None, 'updated_at': File.updated_at}, synchronize_session=False)
+        db.session.commit()
+
+        response = client.get(self.url(file), headers=headers)
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+        job = response.get_json()['job']
+        assert (job['kind'], job['status']) == ('crc32', 'COMPLETED')
+
+        response = client.get(self.url(file), headers=headers)
+        assert response.status_code == 200
+        with zipfile.ZipFile(io.BytesIO(response.data)) as archive:
+            assert archive.read('data.txt') == content
+
+    def test_backfill_ignores_stale_and_unrelated_jobs(self, app, client, headers):
+        """Dead jobs and live jobs for other files don't hold a selection back."""
+        from datetime import datetime, timedelta
+        from app.models.job import Job, JobStatus
+        app.config['STORED_ZIP_INLINE_CRC_SIZE'] = 1000
+        file = upload(client, headers, 'data.txt', os.urandom(3000))
+        stored = File.query.filter_by(uuid=file['id']).one()
+        stale = Job(stored.user_uuid, 'crc32', {'file_uuids': [file['id']]})
+        stale.status = JobStatus.RUNNING
+        stale.updated_at = datetime.utcnow() - timedelta(seconds=app.config['JOB_STALE_SECONDS'] + 1)
+        live = Job(stored.user_uuid, 'crc32', {'file_uuids': ['other']})
+        live.status = JobStatus.RUNNING
+        db.session.add_all([stale, live])
+        File.query.filter_by(uuid=file['id']).update(
+            {'crc32': None, 'updated_at': File.updated_at}, synchronize_session=False)
+        db.session.commit()
+        stale_uuid, live_uuid = stale.uuid, live.uuid
+
+        response = client.get(self.url(file), headers=headers)
+        assert response.status_code == 503
+        job = response.get_json()['job']
+        assert job['id'] not in (stale_uuid, live_uuid)
+        assert job['status'] == 'COMPLETED'
+        assert client.get(self.url(file), headers=headers).status_code == 200
+
+    def test_errors(self, client, headers):
+        """Empty or unknown selections are rejected."""
+        assert client.get('/api/files/download-zip', headers=headers).status_code == 400
+        response = client.get('/api/files/download-zip?file_ids=nope', headers=headers)
+        assert response.status_code == 404
+
+
+class TestNegotiation:
+    """Test response compression and MessagePack negotiation."""
+
+    def test_gzip_threshold(self, client, headers):
+        """Large JSON bodies are gzipped on request; small ones are not."""
+        import gzip
+
+        for index in range(30):
+            upload(client, headers, f'file-{index:02d}.txt')
+
+        response = client.get('/api/files', headers={**headers, 'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert len(json.loads(gzip.decompress(response.data))['files']) == 30
+
+        response = client.get('/api/files/changes', headers={**headers, 'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in response.headers
+
+    def test_streamed_manifest_is_compressed(self, client, headers):
+        """Streamed NDJSON is compressed chunk by chunk."""
+        import gzip
+
+        upload(client, headers, 'a.txt')
+        response = client.get('/api/files/manifest',
+                              headers={**headers, 'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        lines = gzip.decompress(response.data).decode('utf-8').splitlines()
+        assert json.loads(lines[-1])['name'] == 'a.txt'
+
+    def test_msgpack(self, client, headers):
+        """Clients preferring MessagePack get it."""
+        msgpack = pytest.importorskip('msgpack')
+
+        upload(client, headers, 'a.txt')
+        response = client.get('/api/files', headers={**headers, 'Accept': 'application/msgpack'})
+        assert response.mimetype == 'application/msgpack'
+        assert msgpack.unpackb(response.data)['files'][0]['file_name'] == 'a.txt'
+
+
+class TestDriveViews:
+    """Test the drive-wide recent and largest views."""
+
+    def test_largest_pages_across_folders(self, client, headers):
+        """Files of every folder are ranked by size and paged by cursor."""
+        folder = create_folder(client, headers, 'nested')
+        upload(client, headers, 'a.txt', b'x' * 10)
+        upload(client, headers, 'b.txt', b'x' * 30, parent=folder['id'])
+        upload(client, headers, 'c.txt', b'x' * 20)
+        trashed = upload(client, headers, 'd.txt', b'x' * 40)
+        client.delete(f"/api/files/{trashed['id']}", headers=headers)
+
+        first = client.get('/api/files/largest?limit=2', headers=headers).get_json()
+        assert [f['file_name'] for f in first['files']] == ['b.txt', 'c.txt']
+        rest = client.get(f"/api/files/largest?limit=2&cursor={first['next_cursor']}",
+                          headers=headers).get_json()
+        assert [f['file_name'] for f in rest['files']] == ['a.txt']
+        assert rest['next_cursor'] is None
+
+    def test_recent(self, client, headers):
+        """The latest modified files come first, folders excluded."""
+        create_folder(client, headers, 'folder')
+        for name in ('old.txt', 'mid.txt', 'new.txt'):
+            upload(client, headers, name)
+
+        first = client.get('/api/files/recent?limit=1', headers=headers).get_json()
+        assert [f['file_name'] for f in first['files']] == ['new.txt']
+        rest = client.get(f"/api/files/recent?cursor={first['next_cursor']}",
+                          headers=headers).get_json()
+        assert [f['file_name'] for f in rest['files']] == ['mid.txt', 'old.txt']
+
+        response = client.get('/api/files/recent?cursor=bogus', headers=headers)
+        assert response.status_code == 400
+
+
+class TestSearch:
+    """Test filename search."""
+
+    def test_ranked_results(self, client, headers):
+        """Exact names rank before prefixes, word prefixes and substrings."""
+        for name in ('my-report.txt', 'report.txt', 'reports-2024.txt', 'misreported.txt'):
+            upload(client, headers, name)
+        upload(client, headers, 'notes.txt')
+
+        response = client.get('/api/files/search?q=Report', headers=headers)
+        assert response.status_code == 200
+        names = [file['file_name'] for file in response.get_json()['files']]
+        assert names == ['report.txt', 'reports-2024.txt', 'my-report.txt', 'misreported.txt']
+
+    def test_substring_ranks_after_word_prefix(self, client, headers):
+        """A shorter plain substring match still ranks after a word prefix."""
+        for name in ('my_report.txt', 'xreport.txt'):
+            upload(client, headers, name)
+
+        response = client.get('/api/files/search?q=report', headers=headers)
+        names = [file['file_name'] for file in response.get_json()['files']]
+        assert names == ['my_report.txt', 'xreport.txt']
+
+    def test_index_follows_rename_and_trash(self, client, headers):
+        """Renamed items are found by their new name; trashed ones vanish."""
+        file = upload(client, headers, 'draft.txt')
+        other = upload(client, headers, 'drafty.txt')
+        client.put(f"/api/files/{file['id']}/rename", headers=headers,
+                   json={'new_name': 'final.txt'})
+        client.delete(f"/api/files/{other['id']}", headers=headers)
+
+        assert client.get('/api/files/search?q=draft', headers=headers).get_json()['files'] == []
+        found = client.get('/api/files/search?q=fin', headers=headers).get_json()['files']
+        assert [f['id'] for f in found] == [file['id']]
+
+    def test_cursor_pagination(self, client, headers):
+        """Pages follow each other without overlap."""
+        for index in range(5):
+            upload(client, headers, f'log{index}.txt')
+
+        seen = []
+        cursor = None
+        while True:
+            url = '/api/files/search?q=log&limit=2' + (f'&cursor={cursor}' if cursor else '')
+            data = client.get(url, headers=headers).get_json()
+            seen += [file['file_name'] for file in data['files']]
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+
+        assert seen == [f'log{index}.txt' for index in range(5)]
+
+
+class TestContentSearch:
+    """Test full-text search of text documents."""
+
+    def test_search_with_snippet(self, client, headers):
+        """Documents holding every word are ranked and snippeted."""
+        filler = b'lorem ipsum dolor sit amet ' * 20
+        upload(client, headers, 'a.txt', filler + b'the quarterly budget review ' + filler)
+        upload(client, headers, 'b.txt', b'budget budget budget review')
+        upload(client, headers, 'c.txt', b'budget only')
+        upload(client, headers, 'd.png', b'budget review')
+
+        response = client.get('/api/files/search?content=Budget review', headers=headers)
+        assert response.status_code == 200
+        files = response.get_json()['files']
+        assert [file['file_name'] for file in files] == ['b.txt', 'a.txt']
+        assert 'quarterly budget review' in files[1]['snippet']
+        assert len(files[1]['snippet']) < len(filler)
+
+    def test_accents_and_case_share_postings(self, client, headers):
+        """Words differing by accent or case index as one token."""
+        upload(client, headers, 'cv.txt', 'Résumé resume RESUMÉ Straße strasse'.encode('utf-8'))
+
+        for query in ('resume', 'RÉSUMÉ', 'strasse', 'straße'):
+            response = client.get(f'/api/files/search?content={query}', headers=headers)
+            files = response.get_json()['files']
+            assert [file['file_name'] for file in files] == ['cv.txt']
+        assert files[0]['score'] == 2
+
+    def test_purge_drops_postings(self, app, client, headers):
+        """Permanently deleted documents leave no postings behind."""
+        from app.models.content_posting import ContentPosting
+
+        file = upload(client, headers, 'a.txt', b'secret words')
+        assert ContentPosting.query.filter_by(file_uuid=file['id']).count() == 2
+
+        client.delete(f"/api/files/{file['id']}/permanent", headers=headers)
+        assert ContentPosting.query.filter_by(file_uuid=file['id']).count() == 0
+        response = client.get('/api/files/search?content=secret', headers=headers)
+        assert response.get_json()['files'] == []